@@ -2,11 +2,12 @@ from __future__ import absolute_import, division
 
 from arch.compat.python import iteritems, itervalues, add_metaclass, range
 from arch.utility.array import DocStringInheritor
+from arch.utility.rng import (check_random_state, get_state, indexed_generator,
+                              is_seed_sequence, randint, random_sample, reseed, set_state)
 
 import copy
 
 import numpy as np
-from numpy.random import RandomState
 import pandas as pd
 import scipy.stats as stats
 
@@ -95,7 +96,9 @@ class IIDBootstrap(object):
     args
         Positional arguments to bootstrap
     kwargs
-        Keyword arguments to bootstrap
+        Keyword arguments to bootstrap.  The keyword random_state is
+        reserved and can be used to provide a NumPy RandomState,
+        Generator or SeedSequence to use in the bootstrap.
 
     Attributes
     ----------
@@ -108,8 +111,8 @@ class IIDBootstrap(object):
         Tuple containing the positional arguments (in the order entered)
     kw_data : dict
         Dictionary containing the keyword arguments
-    random_state : RandomState
-        RandomState instance used by bootstrap
+    random_state : {RandomState, Generator}
+        RandomState or Generator instance used by bootstrap
 
     Notes
     -----
@@ -119,6 +122,10 @@ class IIDBootstrap(object):
     Data entered using keyword arguments is directly accessibly as an
     attribute.
 
+    When random_state is a SeedSequence, bootstrap replication i uses an
+    independent stream identified by i, so that results do not depend on
+    how replications are shared across workers.
+
     Examples
     --------
     Data can be accessed in a number of ways.  Positional data is retained in
@@ -139,8 +146,14 @@ class IIDBootstrap(object):
     """
 
     def __init__(self, *args, **kwargs):
-        self.random_state = RandomState()
-        self._initial_state = self.random_state.get_state()
+        random_state = kwargs.pop('random_state', None)
+        self._seed_sequence = None
+        if is_seed_sequence(random_state):
+            self._seed_sequence = random_state
+            random_state = indexed_generator(random_state, 0)
+        self.random_state = check_random_state(random_state)
+        self._initial_state = get_state(self.random_state)
+        self._replication = 0
         self._args = args
         self._kwargs = kwargs
         if args:
@@ -206,10 +219,10 @@ class IIDBootstrap(object):
 
         Returns
         -------
-        state : RandomState state vector
-            Array containing the state
+        state : {tuple, dict}
+            RandomState state vector or Generator state dictionary
         """
-        return self.random_state.get_state()
+        return get_state(self.random_state)
 
     def set_state(self, state):
         """
@@ -217,11 +230,11 @@ class IIDBootstrap(object):
 
         Parameters
         ----------
-        state : RandomState state vector
-            Array containing the state
+        state : {tuple, dict}
+            RandomState state vector or Generator state dictionary
         """
 
-        return self.random_state.set_state(state)
+        return set_state(self.random_state, state)
 
     def seed(self, value):
         """
@@ -233,7 +246,8 @@ class IIDBootstrap(object):
             Integer to use as the seed
         """
         self._seed = value
-        self.random_state.seed(value)
+        self._seed_sequence = None
+        self.random_state = reseed(self.random_state, value)
         return None
 
     def reset(self, use_seed=True):
@@ -249,7 +263,8 @@ class IIDBootstrap(object):
         """
         self._index = np.arange(self._num_items)
         self._resample()
-        self.random_state.set_state(self._initial_state)
+        self._replication = 0
+        set_state(self.random_state, self._initial_state)
         if use_seed and self._seed is not None:
             self.seed(self._seed)
         return None
@@ -292,6 +307,10 @@ class IIDBootstrap(object):
         dictionary
         """
         for _ in range(reps):
+            if self._seed_sequence is not None:
+                self.random_state = indexed_generator(self._seed_sequence,
+                                                      self._replication)
+            self._replication += 1
             indices = np.asarray(self.update_indices())
             self._index = indices
             yield self._resample()
@@ -630,7 +649,7 @@ class IIDBootstrap(object):
                 # Need new bootstrap of same type
                 nested_bs = self.clone(*pos_data, **kw_data)
                 # Set the seed to ensure reproducibility
-                seed = self.random_state.randint(2 ** 31 - 1)
+                seed = randint(self.random_state, 2 ** 31 - 1)
                 nested_bs.seed(seed)
                 cov = nested_bs.cov(func, studentize_reps,
                                     extra_kwargs=extra_kwargs)
@@ -795,8 +814,7 @@ class IIDBootstrap(object):
         Update indices for the next iteration of the bootstrap.  This must
         be overridden when creating new bootstraps.
         """
-        return self.random_state.randint(self._num_items,
-                                         size=self._num_items)
+        return randint(self.random_state, self._num_items, size=self._num_items)
 
     def _resample(self):
         """
@@ -834,7 +852,9 @@ class CircularBlockBootstrap(IIDBootstrap):
     args
         Positional arguments to bootstrap
     kwargs
-        Keyword arguments to bootstrap
+        Keyword arguments to bootstrap.  The keyword random_state is
+        reserved and can be used to provide a NumPy RandomState,
+        Generator or SeedSequence to use in the bootstrap.
 
     Attributes
     ----------
@@ -847,8 +867,8 @@ class CircularBlockBootstrap(IIDBootstrap):
         Tuple containing the positional arguments (in the order entered)
     kw_data : dict
         Dictionary containing the keyword arguments
-    random_state : RandomState
-        RandomState instance used by bootstrap
+    random_state : {RandomState, Generator}
+        RandomState or Generator instance used by bootstrap
 
     Notes
     -----
@@ -858,6 +878,10 @@ class CircularBlockBootstrap(IIDBootstrap):
     Data entered using keyword arguments is directly accessibly as an
     attribute.
 
+    When random_state is a SeedSequence, bootstrap replication i uses an
+    independent stream identified by i, so that results do not depend on
+    how replications are shared across workers.
+
     Examples
     --------
     Data can be accessed in a number of ways.  Positional data is retained in
@@ -904,7 +928,7 @@ class CircularBlockBootstrap(IIDBootstrap):
         num_blocks = self._num_items // self.block_size
         if num_blocks * self.block_size < self._num_items:
             num_blocks += 1
-        indices = self.random_state.randint(self._num_items, size=num_blocks)
+        indices = randint(self.random_state, self._num_items, size=num_blocks)
         indices = indices[:, None] + np.arange(self.block_size)
         indices = indices.flatten()
         indices %= self._num_items
@@ -926,7 +950,9 @@ class StationaryBootstrap(CircularBlockBootstrap):
     args
         Positional arguments to bootstrap
     kwargs
-        Keyword arguments to bootstrap
+        Keyword arguments to bootstrap.  The keyword random_state is
+        reserved and can be used to provide a NumPy RandomState,
+        Generator or SeedSequence to use in the bootstrap.
 
     Attributes
     ----------
@@ -939,8 +965,8 @@ class StationaryBootstrap(CircularBlockBootstrap):
         Tuple containing the positional arguments (in the order entered)
     kw_data : dict
         Dictionary containing the keyword arguments
-    random_state : RandomState
-        RandomState instance used by bootstrap
+    random_state : {RandomState, Generator}
+        RandomState or Generator instance used by bootstrap
 
     Notes
     -----
@@ -950,6 +976,10 @@ class StationaryBootstrap(CircularBlockBootstrap):
     Data entered using keyword arguments is directly accessibly as an
     attribute.
 
+    When random_state is a SeedSequence, bootstrap replication i uses an
+    independent stream identified by i, so that results do not depend on
+    how replications are shared across workers.
+
     Examples
     --------
     Data can be accessed in a number of ways.  Positional data is retained in
@@ -976,10 +1006,9 @@ class StationaryBootstrap(CircularBlockBootstrap):
         self._name = 'Stationary Bootstrap'
 
     def update_indices(self):
-        indices = self.random_state.randint(self._num_items,
-                                            size=self._num_items)
+        indices = randint(self.random_state, self._num_items, size=self._num_items)
         indices = indices.astype(np.int64)
-        u = self.random_state.random_sample(self._num_items)
+        u = random_sample(self.random_state, self._num_items)
         return stationary_bootstrap_sample(indices, u, self._p)
 
 
@@ -994,7 +1023,9 @@ class MovingBlockBootstrap(CircularBlockBootstrap):
     args
         Positional arguments to bootstrap
     kwargs
-        Keyword arguments to bootstrap
+        Keyword arguments to bootstrap.  The keyword random_state is
+        reserved and can be used to provide a NumPy RandomState,
+        Generator or SeedSequence to use in the bootstrap.
 
     Attributes
     ----------
@@ -1007,8 +1038,8 @@ class MovingBlockBootstrap(CircularBlockBootstrap):
         Tuple containing the positional arguments (in the order entered)
     kw_data : dict
         Dictionary containing the keyword arguments
-    random_state : RandomState
-        RandomState instance used by bootstrap
+    random_state : {RandomState, Generator}
+        RandomState or Generator instance used by bootstrap
 
     Notes
     -----
@@ -1018,6 +1049,10 @@ class MovingBlockBootstrap(CircularBlockBootstrap):
     Data entered using keyword arguments is directly accessibly as an
     attribute.
 
+    When random_state is a SeedSequence, bootstrap replication i uses an
+    independent stream identified by i, so that results do not depend on
+    how replications are shared across workers.
+
     Examples
     --------
     Data can be accessed in a number of ways.  Positional data is retained in
@@ -1046,7 +1081,7 @@ class MovingBlockBootstrap(CircularBlockBootstrap):
         if num_blocks * self.block_size < self._num_items:
             num_blocks += 1
         max_index = self._num_items - self.block_size + 1
-        indices = self.random_state.randint(max_index, size=num_blocks)
+        indices = randint(self.random_state, max_index, size=num_blocks)
         indices = indices[:, None] + np.arange(self.block_size)
         indices = indices.flatten()
 
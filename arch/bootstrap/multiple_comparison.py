@@ -87,6 +87,9 @@ class MCS(MultipleComparison):
         'stationary' or 'sb': Stationary bootstrap (Default)
         'circular' or 'cbb': Circular block bootstrap
         'moving block' or 'mbb': Moving block bootstrap
+    random_state : {RandomState, Generator, SeedSequence}, optional
+        Source of randomness used in the bootstrap.  If a SeedSequence, each
+        bootstrap replication uses an independent stream.
 
     Methods
     -------
@@ -99,7 +102,7 @@ class MCS(MultipleComparison):
     """
 
     def __init__(self, losses, size, reps=1000, block_size=None, method='R',
-                 bootstrap='stationary'):
+                 bootstrap='stationary', random_state=None):
         super(MCS, self).__init__()
         self.losses = ensure2d(losses, 'losses')
         self._losses_arr = np.asarray(self.losses)
@@ -119,11 +122,14 @@ class MCS(MultipleComparison):
         indices = np.arange(self.t)
         bootstrap = bootstrap.lower().replace(' ', '_')
         if bootstrap in ('stationary', 'sb'):
-            bootstrap = StationaryBootstrap(self.block_size, indices)
+            bootstrap = StationaryBootstrap(self.block_size, indices,
+                                            random_state=random_state)
         elif bootstrap in ('circular', 'cbb'):
-            bootstrap = CircularBlockBootstrap(self.block_size, indices)
+            bootstrap = CircularBlockBootstrap(self.block_size, indices,
+                                               random_state=random_state)
         elif bootstrap in ('moving_block', 'mbb'):
-            bootstrap = MovingBlockBootstrap(self.block_size, indices)
+            bootstrap = MovingBlockBootstrap(self.block_size, indices,
+                                             random_state=random_state)
         else:
             raise ValueError('Unknown bootstrap:' + bootstrap)
         self.bootstrap = bootstrap
@@ -340,6 +346,9 @@ class StepM(MultipleComparison):
         Flag indicating to use a nested bootstrap to compute variances for
         studentization.  Default is False.  Note that this can be slow since
         the procedure requires k extra bootstraps.
+    random_state : {RandomState, Generator, SeedSequence}, optional
+        Source of randomness used in the bootstrap.  If a SeedSequence, each
+        bootstrap replication uses an independent stream.
 
     Methods
     -------
@@ -364,13 +373,14 @@ class StepM(MultipleComparison):
 
     def __init__(self, benchmark, models, size=0.05, block_size=None,
                  reps=1000, bootstrap='stationary', studentize=True,
-                 nested=False):
+                 nested=False, random_state=None):
         super(StepM, self).__init__()
         self.benchmark = ensure2d(benchmark, 'benchmark')
         self.models = ensure2d(models, 'models')
         self.spa = SPA(benchmark, models, block_size=block_size, reps=reps,
                        bootstrap=bootstrap,
-                       studentize=studentize, nested=nested)
+                       studentize=studentize, nested=nested,
+                       random_state=random_state)
         self.block_size = self.spa.block_size
         self.t, self.k = self.models.shape
         self.reps = reps
@@ -463,6 +473,9 @@ class SPA(MultipleComparison):
         Flag indicating to use a nested bootstrap to compute variances for
         studentization.  Default is False.  Note that this can be slow since
         the procedure requires k extra bootstraps.
+    random_state : {RandomState, Generator, SeedSequence}, optional
+        Source of randomness used in the bootstrap.  If a SeedSequence, each
+        bootstrap replication uses an independent stream.
 
     Methods
     -------
@@ -499,7 +512,8 @@ class SPA(MultipleComparison):
     """
 
     def __init__(self, benchmark, models, block_size=None, reps=1000,
-                 bootstrap='stationary', studentize=True, nested=False):
+                 bootstrap='stationary', studentize=True, nested=False,
+                 random_state=None):
         super(SPA, self).__init__()
         self.benchmark = ensure2d(benchmark, 'benchmark')
         self.models = ensure2d(models, 'models')
@@ -515,12 +529,15 @@ class SPA(MultipleComparison):
         self.t, self.k = self._loss_diff.shape
         bootstrap = bootstrap.lower().replace(' ', '_')
         if bootstrap in ('stationary', 'sb'):
-            bootstrap = StationaryBootstrap(self.block_size, self._loss_diff)
+            bootstrap = StationaryBootstrap(self.block_size, self._loss_diff,
+                                            random_state=random_state)
         elif bootstrap in ('circular', 'cbb'):
             bootstrap = CircularBlockBootstrap(self.block_size,
-                                               self._loss_diff)
+                                               self._loss_diff,
+                                               random_state=random_state)
         elif bootstrap in ('moving_block', 'mbb'):
-            bootstrap = MovingBlockBootstrap(self.block_size, self._loss_diff)
+            bootstrap = MovingBlockBootstrap(self.block_size, self._loss_diff,
+                                             random_state=random_state)
         else:
             raise ValueError('Unknown bootstrap:' + bootstrap)
         self.bootstrap = bootstrap
@@ -1,8 +1,8 @@
 from __future__ import absolute_import
 
 try:
-    from pandas.api.types import is_datetime64_dtype
+    from pandas.api.types import is_datetime64_dtype, is_sparse
 except ImportError:
-    from pandas.core.common import is_datetime64_dtype
+    from pandas.core.common import is_datetime64_dtype, is_sparse
 
-__all__ = ['is_datetime64_dtype']
+__all__ = ['is_datetime64_dtype', 'is_sparse']
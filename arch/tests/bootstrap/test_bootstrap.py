@@ -22,6 +22,10 @@ except ImportError:
 from arch.bootstrap._samplers_python import (stationary_bootstrap_sample,
                                              stationary_bootstrap_sample_python)  # noqa
 from arch.bootstrap.base import _loo_jackknife
+from arch.utility.rng import HAS_GENERATOR
+
+if HAS_GENERATOR:
+    from numpy.random import Generator, PCG64, SeedSequence
 
 
 class TestBootstrap(TestCase):
@@ -681,3 +685,34 @@ class TestBootstrap(TestCase):
         cython = stationary_bootstrap_sample_cython(indices, u, p)
         assert_equal(numba, cython)
         assert_equal(numba, python)
+
+
+@pytest.mark.skipif(not HAS_GENERATOR, reason='Requires NumPy Generator')
+def test_generator_random_state():
+    x = RandomState(0).standard_normal((200, 2))
+
+    def func(y):
+        return y.mean(0)
+
+    bs = StationaryBootstrap(10, x, random_state=Generator(PCG64(12345)))
+    bs2 = StationaryBootstrap(10, x, random_state=Generator(PCG64(12345)))
+    first = bs.apply(func, 20)
+    assert_equal(first, bs2.apply(func, 20))
+    bs.reset()
+    assert_equal(bs.apply(func, 20), first)
+    bs.seed(0)
+    bs2.seed(0)
+    assert isinstance(bs.random_state, Generator)
+    assert_equal(bs.apply(func, 20), bs2.apply(func, 20))
+
+    seed = SeedSequence(12345)
+    bs = CircularBlockBootstrap(10, x, random_state=seed)
+    full = bs.apply(func, 20)
+    bs = CircularBlockBootstrap(10, x, random_state=seed)
+    split = np.vstack([bs.apply(func, 10), bs.apply(func, 10)])
+    assert_equal(full, split)
+    bs.reset()
+    assert_equal(bs.apply(func, 20), full)
+
+    with pytest.raises(TypeError):
+        IIDBootstrap(x, random_state=1234)
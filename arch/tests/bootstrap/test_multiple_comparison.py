@@ -12,6 +12,10 @@ import scipy.stats as stats
 from arch.bootstrap import StationaryBootstrap, CircularBlockBootstrap, \
     MovingBlockBootstrap
 from arch.bootstrap.multiple_comparison import SPA, StepM, MCS
+from arch.utility.rng import HAS_GENERATOR
+
+if HAS_GENERATOR:
+    from numpy.random import Generator, PCG64, SeedSequence
 
 
 class TestSPA(object):
@@ -442,3 +446,21 @@ class TestMCS(object):
         mcs.compute()
         assert len(mcs.included) > 0
         assert (len(mcs.included) + len(mcs.excluded)) == 20
+
+
+@pytest.mark.skipif(not HAS_GENERATOR, reason='Requires NumPy Generator')
+def test_seed_sequence_random_state():
+    rs = RandomState(12345)
+    losses = rs.chisquare(10, size=(500, 5))
+    seed = SeedSequence(12345)
+    mcs = MCS(losses, 0.05, reps=100, random_state=seed)
+    mcs.compute()
+    mcs2 = MCS(losses, 0.05, reps=100, random_state=seed)
+    mcs2.compute()
+    assert_frame_equal(mcs.pvalues, mcs2.pvalues)
+
+    spa = SPA(losses[:, 0], losses[:, 1:], reps=100, random_state=Generator(PCG64(0)))
+    spa.compute()
+    spa2 = SPA(losses[:, 0], losses[:, 1:], reps=100, random_state=Generator(PCG64(0)))
+    spa2.compute()
+    assert_series_equal(spa.pvalues, spa2.pvalues)
@@ -5,11 +5,17 @@ from unittest import TestCase
 import numpy as np
 import pytest
 import scipy.stats as stats
+from scipy import integrate
 from numpy.random import RandomState
-from numpy.testing import assert_almost_equal, assert_equal, assert_array_equal
+from numpy.testing import assert_almost_equal, assert_equal, assert_array_equal, \
+    assert_allclose
 from scipy.special import gammaln, gamma
 
 from arch.univariate.distribution import Normal, StudentsT, SkewStudent, GeneralizedError
+from arch.utility.rng import HAS_GENERATOR
+
+if HAS_GENERATOR:
+    from numpy.random import Generator, PCG64
 
 
 class TestDistributions(TestCase):
@@ -166,6 +172,56 @@ def test_roundtrip_cdf_ppf(distribution):
     assert_almost_equal(pits, p)
 
 
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+def test_roundtrip_cdf_ppf_large(distribution):
+    dist, param = distribution
+    dist = dist()
+    pits = np.random.RandomState(0).random_sample(20000)
+    x = dist.ppf(pits, param)
+    assert_allclose(x[:100], dist.ppf(pits[:100], param), rtol=1e-8, atol=1e-10)
+    assert_allclose(dist.cdf(x, param), pits, rtol=1e-8)
+
+
+@pytest.mark.parametrize('distribution', [(SkewStudent, (6.0, -0.3)),
+                                          (SkewStudent, (4.0, 0.9)),
+                                          (GeneralizedError, (1.3,))])
+def test_simulate_distribution(distribution):
+    dist, param = distribution
+    dist = dist(RandomState(0))
+    draws = dist.simulate(param)(20000)
+    assert_allclose(draws.mean(), 0.0, atol=0.05)
+    assert_allclose(draws.var(), 1.0, atol=0.1)
+    pval = stats.kstest(draws, lambda x: dist.cdf(x, param)).pvalue
+    assert pval > 0.01
+
+
+def test_shape_constants_memoized():
+    rs = RandomState(0)
+    resids = rs.standard_normal(100)
+    sigma2 = 1 + rs.random_sample(100)
+    dist = SkewStudent()
+    params = np.array([6.0, -0.3])
+    ll = dist.loglikelihood(params, resids, sigma2)
+    assert len(dist._constants) == 1
+    assert_allclose(dist.loglikelihood(params.copy(), resids, sigma2), ll)
+    assert len(dist._constants) == 1
+    dist.loglikelihood(np.array([7.0, -0.3]), resids, sigma2)
+    assert len(dist._constants) == 2
+    dist.ppf(0.3, params)
+    assert len(dist._constants) == 2
+
+
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+def test_loglikelihood_scalar_sigma2(distribution):
+    dist, param = distribution
+    dist = dist()
+    resids = RandomState(0).standard_normal(10)
+    sigma2 = 1.5 * np.ones(10)
+    expected = dist.loglikelihood(param, resids, sigma2, individual=True)
+    assert_allclose(dist.loglikelihood(param, resids, 1.5, individual=True), expected)
+    assert_allclose(dist.loglikelihood(param, resids, 1.5), expected.sum())
+
+
 def test_invalid_params():
     pits = np.arange(1, 100.0) / 100.0
     dist = Normal()
@@ -174,3 +230,61 @@ def test_invalid_params():
     dist = StudentsT()
     with pytest.raises(ValueError):
         dist.ppf(pits, [1.0])
+
+
+@pytest.mark.skipif(not HAS_GENERATOR, reason='Requires NumPy Generator')
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+def test_generator_simulation(distribution):
+    dist, param = distribution
+    first = dist(random_state=Generator(PCG64(0))).simulate(param)(100)
+    second = dist(random_state=Generator(PCG64(0))).simulate(param)(100)
+    assert_array_equal(first, second)
+    legacy = dist(random_state=RandomState(0)).simulate(param)(100)
+    assert_array_equal(legacy, dist(random_state=RandomState(0)).simulate(param)(100))
+
+
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+def test_tail_mean(distribution):
+    dist, param = distribution
+    dist = dist(random_state=RandomState(0))
+    q = np.array([0.01, 0.05, 0.5, 0.9])
+    tail_mean = dist.tail_mean(q, param)
+    expected = []
+    for p in q:
+        z = dist.ppf(p, param)
+        eps = 1e-6
+
+        def f(x):
+            return x * (dist.cdf(x + eps, param) - dist.cdf(x - eps, param)) / (2 * eps)
+
+        expected.append(integrate.quad(f, -np.inf, z, limit=500)[0] / p)
+    assert_allclose(tail_mean, expected, rtol=1e-4)
+    assert_allclose(dist.tail_mean(0.05, param), tail_mean[1])
+    simulated = super(type(dist), dist).tail_mean(q[:2], param)
+    assert_allclose(simulated, tail_mean[:2], rtol=0.1)
+
+
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+def test_quadrature(distribution):
+    dist, param = distribution
+    dist = dist()
+    nodes, weights = dist.quadrature(param)
+    assert nodes.shape == weights.shape == (64,)
+    assert np.all(weights > 0)
+    assert_almost_equal(weights.sum(), 1.0)
+    assert_allclose(weights.dot(nodes), 0.0, atol=1e-3)
+    assert_allclose(weights.dot(nodes ** 2), 1.0, rtol=1e-3)
+    nodes, weights = dist.quadrature(param, points=8)
+    assert nodes.shape == (16,)
+
+
+def test_quadrature_normal():
+    nodes, weights = Normal().quadrature()
+    # E[exp(a|z| + bz)] has a closed form when z is standard normal
+    a, b = 0.3, -0.2
+    expected = np.exp((a + b) ** 2 / 2) * stats.norm.cdf(a + b) + \
+        np.exp((a - b) ** 2 / 2) * stats.norm.cdf(a - b)
+    assert_allclose(weights.dot(np.exp(a * np.abs(nodes) + b * nodes)), expected)
+    assert_allclose(weights.dot(np.abs(nodes)), np.sqrt(2 / np.pi))
+    with pytest.raises(ValueError):
+        Normal().quadrature([1.0])
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from arch.univariate.filters import bounds_check, fir_filter, garch_filter, prefer_fft
+from arch.univariate.recursions_python import bounds_check_python, garch_recursion_python
+
+
+def _direct_filter(weights, x, initial):
+    out = np.zeros_like(x)
+    for t in range(x.shape[0]):
+        for j in range(weights.shape[0]):
+            out[t] += weights[j] * (x[t - j] if t - j >= 0 else initial)
+    return out
+
+
+@pytest.mark.parametrize('method', ['auto', 'direct', 'fft'])
+def test_fir_filter(method):
+    rs = np.random.RandomState(0)
+    x = rs.standard_normal(250) ** 2
+    weights = rs.random_sample(60)
+    expected = _direct_filter(weights, x, 2.0)
+    assert_allclose(fir_filter(weights, x, 2.0, method), expected)
+
+    x2 = np.column_stack([x, x[::-1]])
+    expected2 = np.column_stack([expected, _direct_filter(weights, x[::-1], 3.0)])
+    assert_allclose(fir_filter(weights, x2, np.array([2.0, 3.0]), method), expected2)
+
+    weights2 = np.column_stack([weights, weights[::-1]])
+    expected2 = np.column_stack([expected, _direct_filter(weights[::-1], x, 2.0)])
+    assert_allclose(fir_filter(weights2, x, 2.0, method), expected2)
+
+
+def test_fir_filter_errors():
+    with pytest.raises(ValueError):
+        fir_filter(np.ones(3), np.ones(10), method='unknown')
+    with pytest.raises(ValueError):
+        fir_filter(np.ones((3, 2)), np.ones((10, 2)))
+
+
+@pytest.mark.parametrize('p,o,q', [(1, 0, 1), (2, 1, 2), (1, 3, 1), (3, 0, 0), (1, 0, 3)])
+def test_garch_filter(p, o, q):
+    rs = np.random.RandomState(1)
+    resids = rs.standard_normal((300, 3))
+    backcast = np.array([1.0, 2.0, 0.5])
+    parameters = np.r_[0.1, np.full(p + o, 0.1 / (p + o)), np.full(q, 0.8 / max(q, 1))]
+    sigma2 = garch_filter(parameters, resids ** 2, np.sign(resids), p, o, q, backcast)
+    var_bounds = np.tile([-1.0, 1e300], (300, 1))
+    for i in range(3):
+        expected = np.zeros(300)
+        garch_recursion_python(parameters, resids[:, i] ** 2, np.sign(resids[:, i]), expected,
+                               p, o, q, 300, backcast[i], var_bounds)
+        assert_allclose(sigma2[:, i], expected)
+
+
+def test_prefer_fft():
+    assert not prefer_fft(22, 10000)
+    assert prefer_fft(1000, 10000)
+
+
+def test_bounds_check():
+    sigma2 = np.array([0.01, 1.0, 20.0, np.inf, np.nan])
+    var_bounds = np.tile([0.1, 10.0], (5, 1))
+    expected = np.array([bounds_check_python(s, vb) for s, vb in zip(sigma2, var_bounds)])
+    expected[3] = 1010.0
+    assert_allclose(bounds_check(sigma2.copy(), var_bounds), expected)
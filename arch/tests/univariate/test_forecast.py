@@ -9,9 +9,14 @@ from numpy.testing import assert_allclose
 from pandas.util.testing import assert_frame_equal
 
 from arch.tests.univariate.test_variance_forecasting import preserved_state
-from arch.univariate import HARX
+from arch.univariate import HARX, GARCH, StudentsT
 from arch.univariate import arch_model
-from arch.univariate.mean import _ar_to_impulse, _ar_forecast
+from arch.univariate.mean import (_ar_to_impulse, _ar_forecast, _ar_forecast_paths,
+                                  _har_forecast, _har_regressors)
+from arch.utility.rng import HAS_GENERATOR
+
+if HAS_GENERATOR:
+    from numpy.random import Generator, PCG64, SeedSequence
 
 
 class TestForecasting(TestCase):
@@ -67,6 +72,45 @@ class TestForecasting(TestCase):
         expected = np.concatenate((fill, expected[:, 3:]))
         assert_allclose(forecasts, expected)
 
+    def test_ar_forecast_paths(self):
+        y = self.ar2.values
+        arp = np.array([0.5, -0.3, 0.2])
+        shocks = self.rng.standard_normal((990, 10, 7))
+        paths = _ar_forecast_paths(y, 10, 0.1, arp, shocks)
+        expected = np.empty((990, 10, 10))
+        for i in range(10, 1000):
+            expected[i - 10, :, :3] = y[i - 2:i + 1]
+            for j in range(7):
+                expected[i - 10, :, 3 + j] = 0.1 + expected[i - 10, :, j:3 + j].dot(arp[::-1]) + \
+                    shocks[i - 10, :, j]
+        assert_allclose(paths, expected[:, :, 3:])
+
+        paths = _ar_forecast_paths(y, 10, 0.1, np.empty(0), shocks)
+        assert_allclose(paths, 0.1 + shocks)
+
+    def test_har_regressors(self):
+        y = self.har3.values
+        lags = np.array([[0, 1, 5], [1, 5, 22]])
+        regressors = _har_regressors(y, lags)
+        padded = np.concatenate((np.zeros(22), y))
+        for i, (start, end) in enumerate(lags.T):
+            expected = [padded[t + 22 - end:t + 22 - start].mean() for t in range(1000)]
+            assert_allclose(regressors[:, i], expected)
+
+    def test_har_forecast_cumsum(self):
+        y = self.har3.values
+        lags = np.array([[0, 1, 5], [1, 5, 22]])
+        params = np.array([0.4, 0.3, 0.2])
+        arp = np.zeros(22)
+        for param, (start, end) in zip(params, lags.T):
+            arp[start:end] += param / (end - start)
+        forecasts = _har_forecast(y, 30, 21, 1.0, params, lags)
+        expected = _ar_forecast(y, 30, 21, 1.0, arp)
+        assert_allclose(forecasts, expected)
+
+        forecasts = _har_forecast(y, 5, 0, 0.5, np.empty(0), np.empty((2, 0), dtype=int))
+        assert_allclose(forecasts, 0.5 * np.ones((1000, 5)))
+
     def test_ar_to_impulse(self):
         arp = np.array([0.9])
         impulses = _ar_to_impulse(20, arp)
@@ -521,3 +565,145 @@ class TestForecasting(TestCase):
         assert fcasts2.mean.shape == (1000, 2)
         assert fcasts2.mean.isnull().all()['h.2']
         assert_frame_equal(fcasts.mean, fcasts2.mean[['h.1']])
+
+    @pytest.mark.skipif(not HAS_GENERATOR, reason='Requires NumPy Generator')
+    def test_seed_sequence_forecast_origins(self):
+        am = arch_model(self.ar1, mean='AR', lags=[1], vol='GARCH', dist='t')
+        res = am.fit(disp='off')
+        seed = SeedSequence(12345)
+        for method in ('simulation', 'bootstrap'):
+            full = res.forecast(horizon=3, start=900, method=method, simulations=50,
+                                random_state=seed)
+            part = res.forecast(horizon=3, start=950, method=method, simulations=50,
+                                random_state=seed)
+            assert_frame_equal(full.variance.iloc[950:], part.variance.iloc[950:])
+            assert_frame_equal(full.mean.iloc[950:], part.mean.iloc[950:])
+
+        gen = res.forecast(horizon=3, start=990, method='simulation', simulations=50,
+                           random_state=Generator(PCG64(0)))
+        gen2 = res.forecast(horizon=3, start=990, method='simulation', simulations=50,
+                            random_state=Generator(PCG64(0)))
+        assert_frame_equal(gen.variance, gen2.variance)
+
+    def test_aggregate_forecast(self):
+        am = arch_model(self.ar1, mean='AR', lags=[1], vol='Constant')
+        res = am.fit(disp='off')
+        fcast = res.forecast(horizon=5, start=900)
+        agg = res.forecast(horizon=5, start=900, aggregate=True)
+        assert_frame_equal(agg.mean, fcast.mean.cumsum(1))
+        assert_frame_equal(agg.residual_variance, fcast.residual_variance)
+
+        phi = res.params['data[1]']
+        sigma2 = res.params['sigma2']
+        cum_impulse = np.cumsum(phi ** np.arange(5))
+        expected = np.array([sigma2 * np.sum(cum_impulse[:h][::-1] ** 2) for h in range(1, 6)])
+        assert_allclose(agg.variance.iloc[-1], expected)
+
+        agg = res.forecast(horizon=5, start=990, aggregate=True, method='simulation',
+                           simulations=100, random_state=RandomState(0))
+        fcast = res.forecast(horizon=5, start=990, method='simulation', simulations=100,
+                             random_state=RandomState(0))
+        assert_allclose(agg.simulations.values[990:],
+                        np.cumsum(fcast.simulations.values[990:], 2))
+        quantiles = agg.simulations.quantiles([0.05, 0.95])
+        assert quantiles.shape == (2, 1000, 5)
+        assert np.all(quantiles[0, 990:] < quantiles[1, 990:])
+        assert_allclose(agg.simulations.quantiles(0.05), quantiles[0])
+        with pytest.raises(ValueError):
+            agg.simulations.quantiles(1.5)
+        with pytest.raises(ValueError):
+            res.forecast(horizon=5).simulations.quantiles(0.05)
+
+    def test_forecast_cache(self):
+        am = arch_model(self.ar2, mean='AR', lags=2, vol='GARCH')
+        res = am.fit(disp='off')
+        fcast = res.forecast(horizon=5, start=500)
+        assert len(res.model._cache) == 2
+        fcast_later = res.forecast(horizon=5, start=800)
+        assert len(res.model._cache) == 2
+        fcast_later.mean.iloc[-1] = 0.0
+        cached = res.forecast(horizon=5, start=800)
+        assert_frame_equal(cached.mean.iloc[800:], fcast.mean.iloc[800:])
+
+        res.model._cache.clear()
+        direct = res.forecast(horizon=5, start=800)
+        assert_frame_equal(cached.variance, direct.variance)
+        assert_frame_equal(cached.mean, direct.mean)
+        assert_frame_equal(fcast.variance.iloc[800:], direct.variance.iloc[800:])
+        assert_frame_equal(fcast.residual_variance.iloc[800:],
+                           direct.residual_variance.iloc[800:])
+        assert np.all(np.isnan(direct.mean.iloc[:800]))
+
+        other = res.forecast(res.params * 0.99, horizon=5, start=800)
+        assert np.all(other.variance.iloc[-1] != direct.variance.iloc[-1])
+        res.model.volatility = res.model.volatility
+        assert len(res.model._cache) == 0
+
+    def test_value_at_risk(self):
+        am = arch_model(self.ar1, mean='AR', lags=[1], vol='GARCH', dist='t')
+        res = am.fit(disp='off')
+        var, es = res.value_at_risk([0.01, 0.05], start=900)
+        assert var.shape == (1000, 2)
+        assert np.all(np.isnan(var[:900]))
+        fcast = res.forecast(start=900)
+        nu = res.params['nu']
+        dist = am.distribution
+        quantiles = dist.ppf(np.array([0.01, 0.05]), [nu])
+        expected = -fcast.mean.values - np.sqrt(fcast.variance.values) * quantiles
+        assert_allclose(var, expected)
+        tail = dist.tail_mean(np.array([0.01, 0.05]), [nu])
+        expected = -fcast.mean.values - np.sqrt(fcast.variance.values) * tail
+        assert_allclose(es, expected)
+        assert np.all(es[900:] > var[900:])
+
+        var_sim, es_sim = res.value_at_risk(0.05, start=995, method='simulation',
+                                            simulations=20000, random_state=RandomState(0))
+        assert var_sim.shape == (1000, 1)
+        assert_allclose(var_sim[995:], var[995:, 1:], rtol=0.05)
+        assert_allclose(es_sim[995:], es[995:, 1:], rtol=0.05)
+
+        var_h, es_h = res.value_at_risk([0.01, 0.05], horizon=5, start=995, simulations=500)
+        assert np.all(es_h[995:] > var_h[995:])
+        with pytest.raises(ValueError):
+            res.value_at_risk(0.05, horizon=5, method='analytic')
+        with pytest.raises(ValueError):
+            res.value_at_risk(1.05)
+
+    def test_evaluate(self):
+        rs = RandomState(0)
+        x = rs.standard_normal((1000, 2))
+        y = pd.Series(self.ar1 + 0.3 * x[:, 0],
+                      index=pd.date_range('2000-01-01', periods=1000))
+        am = HARX(y[:800], x[:800], lags=[1, 5], volatility=GARCH(),
+                  distribution=StudentsT())
+        res = am.fit(disp='off')
+        evaluation = res.evaluate(y[800:], x[800:])
+        assert list(evaluation.columns) == ['loglikelihood', 'pit', 'std_resid']
+        assert evaluation.index.equals(y.index[800:])
+
+        # Matches one-step forecasts from a model containing all of the data
+        full = HARX(y, x, lags=[1, 5], volatility=GARCH(), distribution=StudentsT())
+        full.fit(last_obs=800, disp='off')
+        fcast = full.forecast(res.params.values, start=799)
+        mean = fcast.mean.values[799:999, 0]
+        vol = np.sqrt(fcast.variance.values[799:999, 0])
+        std_resid = (y.values[800:] - mean) / vol
+        assert_allclose(evaluation.std_resid, std_resid)
+        nu = res.params['nu']
+        assert_allclose(evaluation.pit, am.distribution.cdf(std_resid, [nu]))
+        llf = am.distribution.loglikelihood([nu], std_resid * vol, vol ** 2, individual=True)
+        assert_allclose(evaluation.loglikelihood, llf)
+
+        params = res.params.values.copy()
+        params[-1] = 20.0
+        alt = res.evaluate(y[800:], x[800:], params=params)
+        assert np.all(alt.loglikelihood != evaluation.loglikelihood)
+        with pytest.raises(ValueError):
+            res.evaluate(y[800:])
+        with pytest.raises(ValueError):
+            res.evaluate(y[800:], x[800:, :1])
+
+        res = arch_model(self.ar1.values[:900]).fit(disp='off')
+        evaluation = res.evaluate(self.ar1.values[900:])
+        assert evaluation.shape == (100, 3)
+        assert isinstance(evaluation.index, pd.RangeIndex)
@@ -8,8 +8,10 @@ import numpy as np
 import pandas as pd
 import pytest
 from numpy.random import RandomState
-from numpy.testing import assert_almost_equal, assert_equal, assert_array_almost_equal
+from numpy.testing import assert_almost_equal, assert_equal, assert_array_almost_equal, \
+    assert_allclose
 from pandas.util.testing import assert_frame_equal, assert_series_equal
+from scipy.sparse import csc_matrix, issparse
 
 from arch.compat.python import range, iteritems, StringIO
 
@@ -17,12 +19,13 @@ try:
     import arch.univariate.recursions as rec
 except ImportError:
     import arch.univariate.recursions_python as rec  # noqa
+from arch.univariate import mean
 from arch.univariate.base import ARCHModelResult, ARCHModelForecast, \
-    _align_forecast
+    _align_forecast, implicit_constant
 from arch.univariate.mean import HARX, ConstantMean, ARX, ZeroMean, LS, \
-    arch_model
+    arch_model, _RegressorBlocks
 from arch.univariate.volatility import ConstantVariance, GARCH, HARCH, ARCH, \
-    RiskMetrics2006, EWMAVariance, EGARCH, FixedVariance
+    RiskMetrics2006, EWMAVariance, EGARCH, FixedVariance, FIGARCH
 from arch.univariate.distribution import Normal, StudentsT, SkewStudent, GeneralizedError
 
 try:
@@ -151,6 +154,18 @@ class TestMeanModel(TestCase):
         for c in cols:
             assert c in data
 
+        x = self.rng.randn(self.T, 2)
+        sim_params = np.array([1.0, 0.4, 0.3, 0.2, 1.0, -0.5, 1.0])
+        sim = HARX(lags=[1, 5, 22]).simulate(sim_params, self.T, burn=0, x=x,
+                                             initial_value=iv)
+        errors = sim.errors.values
+        expected = np.zeros(self.T)
+        expected[:22] = iv[:, 0]
+        for t in range(22, self.T):
+            expected[t] = 1.0 + 0.4 * expected[t - 1] + 0.3 * expected[t - 5:t].mean() + \
+                0.2 * expected[t - 22:t].mean() + x[t].dot(sim_params[4:6]) + errors[t]
+        assert_allclose(sim.data.values, expected)
+
         bounds = harx.bounds()
         for b in bounds:
             assert_equal(b[0], -np.inf)
@@ -649,7 +664,24 @@ class TestMeanModel(TestCase):
         cm.volatility = EGARCH()
         cm.fit(update_freq=0, disp=DISPLAY)
         cm.distribution = StudentsT()
-        cm.fit(update_freq=0, disp=DISPLAY)
+        res = cm.fit(update_freq=0, disp=DISPLAY)
+        with pytest.raises(ValueError):
+            res.forecast(horizon=5)
+        cm.distribution = GeneralizedError()
+        res = cm.fit(update_freq=0, disp=DISPLAY)
+        analytic = res.forecast(horizon=5, start=0)
+        assert np.all(np.isfinite(analytic.variance))
+        simulated = res.forecast(horizon=5, start=995, method='simulation', simulations=100)
+        assert_allclose(analytic.variance.iloc[995:, 0], simulated.variance.iloc[995:, 0])
+
+    def test_figarch(self):
+        am = arch_model(self.y, vol='figarch')
+        assert isinstance(am.volatility, FIGARCH)
+        res = am.fit(update_freq=0, disp=DISPLAY)
+        assert_equal(list(res.params.index[1:]), ['omega', 'phi', 'd', 'beta'])
+        am = arch_model(self.y, vol='figarch', p=0, power=1.0)
+        assert_equal(am.volatility.power, 1.0)
+        am.fit(update_freq=0, disp=DISPLAY)
 
     def test_multiple_lags(self):
         """Smoke test to ensure models estimate with multiple lags"""
@@ -981,3 +1013,337 @@ def test_backcast_error(simulated_data):
     zm = ZeroMean(simulated_data, volatility=RiskMetrics2006())
     with pytest.raises(ValueError):
         zm.fit(backcast=np.ones(100), disp=DISPLAY)
+
+
+@pytest.mark.parametrize('model', ['harx', 'constant', 'zero'])
+def test_simulate_repetitions(model):
+    x = RandomState(1).standard_normal((150, 1))
+    if model == 'harx':
+        mod = HARX(lags=[1, 5], volatility=GARCH())
+        dist = Normal
+        params = np.array([0.1, 0.3, 0.2, 0.5, 0.05, 0.1, 0.85])
+        kwargs = dict(x=x, initial_value=np.arange(5.0))
+    elif model == 'constant':
+        mod = ConstantMean(volatility=EGARCH())
+        dist = Normal
+        params = np.array([0.1, 0.0, 0.1, 0.95])
+        kwargs = {}
+    else:
+        mod = ZeroMean(volatility=GARCH())
+        dist = StudentsT
+        params = np.array([0.05, 0.1, 0.85, 8.0])
+        kwargs = {}
+
+    mod.distribution = dist(RandomState(0))
+    paths = mod.simulate(params, 100, burn=50, repetitions=5, block_size=2, **kwargs)
+    assert sorted(paths.keys()) == ['data', 'errors', 'volatility']
+    # Each block draws all of its standardized shocks at once, and both the
+    # volatility process and the mean discard burn values
+    dist_params = params[-1:] if dist is StudentsT else []
+    rng = dist(RandomState(0)).simulate(dist_params)
+    shocks = np.vstack([rng((2, 200)), rng((2, 200)), rng((1, 200))])
+    assert_allclose(paths['errors'] / paths['volatility'], shocks[:, 100:])
+    if model != 'harx':
+        assert_allclose(paths['data'] - paths['errors'], params[0] if model == 'constant' else 0)
+
+    mod.distribution = dist(RandomState(0))
+    single = mod.simulate(params, 100, burn=50, repetitions=5, dtype=np.float32, **kwargs)
+    for key in paths:
+        assert single[key].dtype == np.float32
+        assert single[key].shape == (5, 100)
+        assert_allclose(single[key], paths[key], rtol=1e-6)
+    with pytest.raises(ValueError):
+        mod.simulate(params, 100, burn=50, repetitions=0, **kwargs)
+
+
+def test_regressor_blocks(monkeypatch):
+    monkeypatch.setattr(mean, 'REGRESSOR_CHUNK_BYTES', 8 * 3 * 7)
+    rs = RandomState(0)
+    blocks = [np.ones((50, 1)), rs.standard_normal((50, 2)), np.empty((50, 0))]
+    reg = _RegressorBlocks(blocks)
+    x = np.hstack(blocks)
+    assert reg.shape == (50, 3)
+    assert_equal(np.asarray(reg), x)
+    assert_equal(np.asarray(reg[10:20]), x[10:20])
+    assert_equal(np.asarray(reg[10:20][2:5]), x[12:15])
+    params = np.array([0.5, -1.0, 2.0])
+    assert_allclose(reg[5:].dot(params), x[5:].dot(params))
+    w = rs.chisquare(3, 50)
+    assert_allclose(reg.weighted_gram(w), x.T.dot(x * w[:, None]))
+    assert_allclose(reg.tdot(w), x.T.dot(w))
+    r = reg.triangular(w[:, None])
+    assert_allclose(r.T.dot(r), np.column_stack((x, w)).T.dot(np.column_stack((x, w))))
+    assert reg.implicit_constant() == implicit_constant(x)
+    assert not _RegressorBlocks(blocks[1:]).implicit_constant()
+    with pytest.raises(IndexError):
+        reg[::2]
+
+
+@pytest.mark.parametrize('cov_type', ['robust', 'mle'])
+def test_memmap_regressors(tmp_path, monkeypatch, cov_type):
+    rs = RandomState(1)
+    x = rs.standard_normal((500, 4))
+    y = x.dot(np.arange(1.0, 5.0)) + rs.standard_normal(500)
+    filename = str(tmp_path / 'x.dat')
+    x_map = np.memmap(filename, dtype=np.float64, mode='w+', shape=x.shape)
+    x_map[:] = x
+    x_map.flush()
+    x_map = np.memmap(filename, dtype=np.float64, mode='r', shape=x.shape)
+
+    res = ARX(y, x, lags=2).fit(cov_type=cov_type, disp=DISPLAY)
+    monkeypatch.setattr(mean, 'REGRESSOR_CHUNK_BYTES', 8 * 7 * 64)
+    mod = ARX(y, x_map, lags=2)
+    res_map = mod.fit(cov_type=cov_type, disp=DISPLAY)
+    assert_allclose(res_map.params, res.params)
+    assert_allclose(res_map.param_cov, res.param_cov)
+    assert_allclose(res_map.rsquared, res.rsquared)
+    # Memory-mapped data are shared with the model copy held by the results
+    assert np.shares_memory(res_map.model.x, x_map)
+
+    res = LS(y, x, constant=False).fit(disp=DISPLAY)
+    res_map = LS(y, x_map, constant=False).fit(disp=DISPLAY)
+    assert_allclose(res_map.params, res.params)
+    assert_allclose(res_map.rsquared, res.rsquared)
+
+
+def test_sparse_exog():
+    rs = RandomState(2)
+    cats = pd.Series(rs.randint(0, 5, 500), dtype='category')
+    dummies = pd.get_dummies(cats, prefix='day', sparse=True).iloc[:, 1:]
+    dense = np.asarray(dummies.sparse.to_dense(), dtype=np.float64)
+    y = rs.standard_normal(500) + dense.dot(np.arange(4.0))
+
+    res = LS(y, dense).fit(disp=DISPLAY)
+    mod = LS(y, dummies)
+    assert issparse(mod.x)
+    assert list(mod.parameter_names()) == ['Const'] + list(dummies.columns)
+    res_sparse = mod.fit(disp=DISPLAY)
+    assert_allclose(res_sparse.params.values, res.params.values)
+    assert_allclose(res_sparse.param_cov.values, res.param_cov.values)
+
+    x = csc_matrix(dense)
+    mod = ARX(y, x, lags=1, volatility=GARCH())
+    assert issparse(mod.x)
+    res_sparse = mod.fit(disp=DISPLAY)
+    res = ARX(y, dense, lags=1, volatility=GARCH()).fit(disp=DISPLAY)
+    assert_allclose(res_sparse.params, res.params, rtol=1e-4)
+    assert_allclose(res_sparse.forecast(start=100).mean, res.forecast(start=100).mean,
+                    rtol=1e-4)
+
+    sim_mod = ARX(None, lags=1, volatility=GARCH())
+    params = np.r_[0.1, 0.5, np.arange(4.0), 0.1, 0.1, 0.8]
+    sim_mod.distribution = Normal(RandomState(0))
+    sim = sim_mod.simulate(params, 100, burn=20, x=x[:120])
+    sim_mod.distribution = Normal(RandomState(0))
+    expected = sim_mod.simulate(params, 100, burn=20, x=dense[:120])
+    assert_frame_equal(sim, expected)
+
+
+def test_concentrate(simulated_data):
+    rs = RandomState(3)
+    x = rs.standard_normal((simulated_data.shape[0], 5))
+    y = simulated_data + x.dot(np.arange(5.0) / 10)
+    mod = ARX(y, x, lags=1, volatility=GARCH())
+    res = mod.fit(disp=DISPLAY)
+    res_conc = mod.fit(disp=DISPLAY, concentrate=True)
+    assert_allclose(res_conc.params, res.params, rtol=1e-3, atol=1e-4)
+    assert_allclose(res_conc.std_err, res.std_err, rtol=1e-2)
+    assert res_conc.loglikelihood >= res.loglikelihood - 1e-4
+
+    mod = ConstantMean(y, volatility=GARCH())
+    res = mod.fit(disp=DISPLAY)
+    res_conc = mod.fit(disp=DISPLAY, concentrate=True)
+    assert_allclose(res_conc.params, res.params, rtol=1e-3, atol=1e-4)
+    ZeroMean(y, volatility=GARCH()).fit(disp=DISPLAY, concentrate=True)
+
+    mod = ARX(y, x, lags=1, volatility=GARCH(), distribution=StudentsT())
+    with pytest.raises(ValueError):
+        mod.fit(disp=DISPLAY, concentrate=True)
+
+
+def test_concentrate_wide(simulated_data, monkeypatch):
+    import arch.univariate.base as base
+
+    rs = RandomState(5)
+    x = rs.standard_normal((simulated_data.shape[0], 20))
+    y = simulated_data + x.dot(np.linspace(-0.5, 0.5, 20))
+    mod = ARX(y, x, volatility=GARCH())
+    res = mod.fit(disp=DISPLAY)
+    full_calls = base._callback_func_count
+
+    starts = []
+    polish = mod._polish
+
+    def record(params, *args):
+        starts.append(params.copy())
+        return polish(params, *args)
+
+    monkeypatch.setattr(mod, '_polish', record)
+    res_conc = mod.fit(disp=DISPLAY, concentrate=True)
+    # Searching over the volatility parameters requires far fewer evaluations
+    assert base._callback_func_count < full_calls / 2
+    assert res_conc.loglikelihood >= res.loglikelihood - 1e-4
+    assert_allclose(res_conc.params, res.params, rtol=1e-3, atol=1e-4)
+
+    # The refinement starts from the mean parameters that are consistent with
+    # the conditional variances they imply
+    start = starts[0]
+    km = mod.num_params
+    sigma2 = np.empty(mod._fit_y.shape[0])
+    mod.volatility.compute_variance(start[km:], mod.resids(start[:km]), sigma2,
+                                    mod._backcast, mod._var_bounds)
+    assert_allclose(mod._weighted_mean_params(sigma2), start[:km], rtol=1e-6)
+
+    # Collinear regressors use the pseudo-inverse
+    collinear = np.column_stack((x[:, :2], x[:, :1]))
+    mod = LS(y, collinear, constant=False)
+    mod._adjust_sample(None, None)
+    expected = np.linalg.pinv(collinear.T.dot(collinear)).dot(collinear.T.dot(y))
+    assert_allclose(mod._weighted_mean_params(np.ones_like(y)), expected)
+
+
+def test_realized_measures():
+    rs = RandomState(4)
+    nobs = 600
+    realized = pd.DataFrame(np.exp(rs.standard_normal((nobs, 2))), columns=['c', 'j'])
+    y = realized.values.dot([0.2, 0.1]) + rs.standard_normal(nobs)
+    lags = np.array([[0, 0, 0], [1, 5, 22]])
+    manual = np.zeros((nobs, 6))
+    for i, col in enumerate(realized):
+        for j, (start, end) in enumerate(lags.T):
+            for t in range(end, nobs):
+                manual[t, 3 * i + j] = realized[col].values[t - end:t - start].mean()
+
+    mod = HARX(y, realized=realized, realized_lags=[1, 5, 22])
+    assert mod.parameter_names() == ['Const', 'c[0:1]', 'c[0:5]', 'c[0:22]',
+                                     'j[0:1]', 'j[0:5]', 'j[0:22]']
+    res = mod.fit(disp=DISPLAY)
+    expected = HARX(y, manual, hold_back=22).fit(disp=DISPLAY)
+    assert_allclose(res.params.values, expected.params.values)
+    assert_allclose(res.std_err.values, expected.std_err.values)
+
+    fcast = res.forecast(start=500)
+    params = res.params.values
+    next_manual = np.array([[realized.values[nobs - end:, i].mean() for end in (1, 5, 22)]
+                            for i in range(2)]).ravel()
+    assert_allclose(fcast.mean.values[-1, 0], params[0] + next_manual.dot(params[1:-1]))
+    assert_allclose(fcast.mean.values[500:-1, 0],
+                    params[0] + manual[501:].dot(params[1:-1]))
+
+    mod = HARX(y[:500], lags=[1, 5], realized=realized.values[:500],
+               realized_lags=[1, 5, 22], volatility=GARCH())
+    assert mod.parameter_names()[3:6] == ['rv0[0:1]', 'rv0[0:5]', 'rv0[0:22]']
+    res = mod.fit(disp=DISPLAY)
+    evaluation = res.evaluate(y[500:], realized=realized.values[500:])
+    full = HARX(y, lags=[1, 5], realized=realized.values, realized_lags=[1, 5, 22],
+                volatility=GARCH())
+    full.fit(last_obs=500, disp=DISPLAY)
+    full_fcast = full.forecast(res.params.values, start=499)
+    std_resid = ((y[500:] - full_fcast.mean.values[499:-1, 0]) /
+                 np.sqrt(full_fcast.variance.values[499:-1, 0]))
+    assert_allclose(evaluation.std_resid, std_resid)
+    # Simulated paths include the realized terms in the first step
+    sim = res.forecast(start=495, horizon=3, method='simulation', simulations=50)
+    paths = sim.simulations
+    one_step = paths.values[495:, :, 0] - paths.residuals[495:, :, 0]
+    assert_allclose(one_step, np.tile(sim.mean.values[495:, :1], (1, 50)))
+    # Later steps depend on unknown future realized measures
+    path_mean = paths.values[495:].mean(1)
+    analytic = sim.mean.values[495:]
+    assert_equal(np.isnan(path_mean), np.isnan(analytic))
+    assert np.all(np.isnan(path_mean[:, 1:]))
+    assert_allclose(path_mean[:, 0], analytic[:, 0], atol=0.5)
+    agg = res.forecast(start=495, horizon=3, method='simulation', simulations=50,
+                       aggregate=True)
+    assert np.all(np.isnan(agg.simulations.values[495:, :, 1:]))
+    assert np.all(np.isfinite(agg.simulations.values[495:, :, 0]))
+    var = res.value_at_risk(0.05, horizon=3, start=495)
+    assert np.all(np.isnan(np.asarray(var)))
+    res_x = HARX(y[:500], realized.values[:500], lags=[1, 5]).fit(disp=DISPLAY)
+    sim = res_x.forecast(start=495, horizon=3, method='simulation', simulations=50)
+    paths = sim.simulations
+    one_step = paths.values[495:-1, :, 0] - paths.residuals[495:-1, :, 0]
+    assert_allclose(one_step, np.tile(sim.mean.values[495:-1, :1], (1, 50)))
+    assert np.all(np.isnan(paths.values[495:, :, 1:]))
+    with pytest.raises(ValueError):
+        res.evaluate(y[500:])
+    with pytest.raises(NotImplementedError):
+        mod.simulate(res.params, 100)
+    with pytest.raises(ValueError):
+        HARX(y, realized=realized)
+
+
+@pytest.mark.parametrize('spec', ['constant', 'har', 'zero', 'ewma', 'riskmetrics'])
+@pytest.mark.parametrize('cov_type', ['robust', 'mle'])
+def test_fit_many(spec, cov_type):
+    rs = RandomState(5)
+    y = rs.standard_normal((300, 6)) * np.linspace(0.5, 2.0, 6) + 0.1
+
+    def model(data=None):
+        if spec == 'constant':
+            return ConstantMean(data)
+        elif spec == 'har':
+            return HARX(data, lags=[1, 5, 22])
+        elif spec == 'zero':
+            return ZeroMean(data)
+        elif spec == 'ewma':
+            return ZeroMean(data, volatility=EWMAVariance())
+        return ZeroMean(data, volatility=RiskMetrics2006())
+
+    res = model().fit_many(y, cov_type=cov_type)
+    assert res.conditional_volatility.shape == y.shape
+    if spec in ('ewma', 'riskmetrics'):
+        assert res.cov_type is None
+    else:
+        expected_cov = 'White\'s Heteroskedasticity Consistent Estimator'
+        if cov_type == 'mle':
+            expected_cov = 'Homoskedastic (Classic)'
+        assert res.cov_type == expected_cov
+    for i in range(y.shape[1]):
+        expected = model(y[:, i]).fit(cov_type=cov_type, disp=DISPLAY)
+        assert res.names == list(expected.params.index)
+        assert_allclose(res.params[i], expected.params.values, rtol=1e-8)
+        assert_allclose(res.param_cov[i], expected.param_cov.values, rtol=1e-8)
+        assert_allclose(res.std_err[i], expected.std_err.values, rtol=1e-8)
+        assert_allclose(res.resid[:, i], expected.resid, rtol=1e-8, atol=1e-12)
+        assert_allclose(res.conditional_volatility[:, i], expected.conditional_volatility,
+                        rtol=1e-8)
+        assert_allclose(res.loglikelihood[i], expected.loglikelihood)
+
+
+def test_fit_many_realized():
+    rs = RandomState(7)
+    realized = np.exp(rs.standard_normal((300, 4, 2)))
+    y = realized[:, :, 0] * 0.3 + rs.standard_normal((300, 4))
+    res = HARX(lags=[1, 5], realized_lags=[1, 5, 22]).fit_many(y, realized=realized)
+    for i in range(4):
+        mod = HARX(y[:, i], lags=[1, 5], realized=realized[:, i], realized_lags=[1, 5, 22])
+        expected = mod.fit(disp=DISPLAY)
+        assert res.names == list(expected.params.index)
+        assert_allclose(res.params[i], expected.params.values, rtol=1e-8)
+        assert_allclose(res.std_err[i], expected.std_err.values, rtol=1e-8)
+        assert_allclose(res.resid[:, i], expected.resid, rtol=1e-8, atol=1e-12)
+
+    res = HARX(constant=False, realized_lags=[1, 5]).fit_many(y, realized=realized[:, :, 0])
+    expected = HARX(y[:, 0], constant=False, realized=realized[:, 0, 0],
+                    realized_lags=[1, 5]).fit(disp=DISPLAY)
+    assert res.names == ['rv[0:1]', 'rv[0:5]', 'sigma2']
+    assert_allclose(res.params[0], expected.params.values, rtol=1e-8)
+    with pytest.raises(ValueError):
+        ConstantMean().fit_many(y, realized=realized)
+    with pytest.raises(ValueError):
+        HARX(lags=[1]).fit_many(y, realized=realized[:-1])
+
+
+def test_fit_many_errors():
+    y = RandomState(6).standard_normal((100, 3))
+    with pytest.raises(ValueError):
+        ConstantMean(volatility=GARCH()).fit_many(y)
+    with pytest.raises(ValueError):
+        ConstantMean(distribution=StudentsT()).fit_many(y)
+    with pytest.raises(ValueError):
+        ConstantMean().fit_many(y[:, 0])
+    with pytest.raises(ValueError):
+        ConstantMean().fit_many(y, cov_type='unknown')
+    with pytest.raises(ValueError):
+        LS(y[:, 0], y[:, 1:]).fit_many(y)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+import scipy.stats as stats
+from numpy.testing import assert_allclose
+
+from arch.univariate.quantile import (QuantileTable, generalized_error_cdf, generalized_error_ppf,
+                                      students_t_cdf, students_t_ppf)
+
+FUNCTIONS = [(students_t_cdf, students_t_ppf, stats.t, 2.05),
+             (students_t_cdf, students_t_ppf, stats.t, 8.0),
+             (students_t_cdf, students_t_ppf, stats.t, 400.0),
+             (generalized_error_cdf, generalized_error_ppf, stats.gennorm, 1.01),
+             (generalized_error_cdf, generalized_error_ppf, stats.gennorm, 1.5),
+             (generalized_error_cdf, generalized_error_ppf, stats.gennorm, 30.0)]
+
+
+def _probabilities():
+    rs = np.random.RandomState(0)
+    tail = 10 ** rs.uniform(-14, -1, 2000)
+    return np.concatenate([rs.random_sample(10000), tail, 1 - tail])
+
+
+@pytest.mark.parametrize('functions', FUNCTIONS)
+def test_table_accuracy(functions):
+    cdf, ppf, dist, shape = functions
+    q = _probabilities()
+    exact = ppf(q, shape, use_table=False)
+    assert_allclose(exact, dist.ppf(q, shape), rtol=1e-7)
+    approx = ppf(q, shape, use_table=True)
+    assert np.all(np.abs(approx - exact) <= 2e-9 * np.maximum(np.abs(exact), 1))
+
+    x = -np.abs(exact)
+    exact = cdf(x, shape, use_table=False)
+    assert_allclose(exact, dist.cdf(x, shape), rtol=1e-7)
+    approx = cdf(x, shape, use_table=True)
+    assert_allclose(approx, exact, rtol=2e-9)
+    assert_allclose(cdf(-x, shape, use_table=True), 1 - exact, rtol=2e-9, atol=1e-15)
+
+
+@pytest.mark.parametrize('use_table', [True, False])
+def test_special_values(use_table):
+    q = np.array([0.0, 0.5, 1.0, np.nan, -0.1])
+    x = students_t_ppf(q, 5.0, use_table)
+    assert_allclose(x[:3], [-np.inf, 0.0, np.inf], atol=1e-15)
+    assert np.all(np.isnan(x[3:]))
+    x = np.array([-np.inf, 0.0, np.inf, np.nan])
+    p = generalized_error_cdf(x, 1.5, use_table)
+    assert_allclose(p[:3], [0.0, 0.5, 1.0])
+    assert np.isnan(p[3])
+
+
+def test_scalar_and_shape():
+    assert np.isscalar(students_t_ppf(0.05, 5.0))
+    assert_allclose(students_t_ppf(0.05, 5.0), stats.t.ppf(0.05, 5.0))
+    assert np.isscalar(generalized_error_cdf(0.3, 1.5, use_table=True))
+    q = np.random.RandomState(0).random_sample((100, 60))
+    assert students_t_ppf(q, 5.0).shape == (100, 60)
+    assert_allclose(students_t_ppf(q, 5.0), students_t_ppf(q, 5.0, use_table=False))
+
+
+def test_table_errors():
+    with pytest.raises(ValueError):
+        QuantileTable(stats.norm.cdf, stats.norm.ppf, stats.norm.pdf, nodes=100)
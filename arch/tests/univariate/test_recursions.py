@@ -3,7 +3,7 @@ import timeit
 import numpy as np
 import pytest
 from numpy.random import RandomState
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_allclose, assert_almost_equal
 from scipy.special import gamma
 
 import arch.univariate.recursions_python as recpy
@@ -175,6 +175,52 @@ var_bounds = np.ones((nobs, 2)) * var_bounds
         assert np.all(sigma2 >= self.var_bounds[:, 0])
         assert np.all(sigma2 <= 2 * self.var_bounds[:, 1])
 
+    def test_harch_long_lags(self):
+        nobs, resids = self.nobs, self.resids
+        sigma2, backcast = self.sigma2, self.backcast
+        var_bounds = self.var_bounds
+
+        parameters = np.array([.1, .4, .2, .1, .1, .05])
+        lags = np.array([1, 5, 22, 66, 252], dtype=np.int32)
+        arch_params = np.zeros(253)
+        arch_params[0] = parameters[0]
+        for param, lag in zip(parameters[1:], lags):
+            arch_params[1:lag + 1] += param / lag
+        rec.arch_recursion(arch_params, resids, sigma2, 252, nobs, backcast, var_bounds)
+        expected = sigma2.copy()
+
+        recpy.harch_recursion_python(parameters, resids, sigma2, lags, nobs, backcast,
+                                     var_bounds)
+        assert_almost_equal(sigma2, expected)
+        recpy.harch_recursion(parameters, resids, sigma2, lags, nobs, backcast, var_bounds)
+        assert_almost_equal(sigma2, expected)
+        rec.harch_recursion(parameters, resids, sigma2, lags, nobs, backcast, var_bounds)
+        assert_almost_equal(sigma2, expected)
+
+    def test_harch_outlier(self):
+        rs = RandomState(12345)
+        nobs = 500
+        resids = 1e-3 * rs.standard_normal(nobs)
+        resids[50] = 1e6
+        backcast = 1e-6
+        var_bounds = np.array([[0.0, 1e20]] * nobs)
+        parameters = np.array([0.0, .4, .3, .2])
+        lags = np.array([1, 5, 22], dtype=np.int32)
+        resids2 = np.r_[backcast * np.ones(22), resids ** 2.0]
+        expected = np.zeros(nobs)
+        for param, lag in zip(parameters[1:], lags):
+            for t in range(nobs):
+                expected[t] += param * resids2[22 + t - lag:22 + t].mean()
+
+        sigma2 = np.empty(nobs)
+        recpy.harch_recursion_python(parameters, resids, sigma2, lags, nobs, backcast,
+                                     var_bounds)
+        np.testing.assert_allclose(sigma2, expected, rtol=1e-8)
+        recpy.harch_recursion(parameters, resids, sigma2, lags, nobs, backcast, var_bounds)
+        np.testing.assert_allclose(sigma2, expected, rtol=1e-8)
+        rec.harch_recursion(parameters, resids, sigma2, lags, nobs, backcast, var_bounds)
+        np.testing.assert_allclose(sigma2, expected, rtol=1e-8)
+
     def test_arch(self):
         nobs, resids, = self.nobs, self.resids
         sigma2, backcast = self.sigma2, self.backcast
@@ -485,6 +531,149 @@ var_bounds = np.ones((nobs, 2)) * var_bounds
         assert np.all(sigma2 >= self.var_bounds[:, 0])
         assert np.all(sigma2 <= 2 * self.var_bounds[:, 1])
 
+    def test_ewma_components(self):
+        nobs, resids = self.nobs, self.resids
+        mus = np.exp(-1.0 / (4 * np.sqrt(2) ** np.arange(5)))
+        weights = np.arange(1.0, 6.0)
+        weights /= weights.sum()
+        backcast = np.arange(1.0, 6.0) / 3
+        sigma2 = np.zeros(nobs)
+        components = np.zeros(5)
+        recpy.ewma_components_recursion(mus, weights, resids, sigma2, components, nobs,
+                                        backcast)
+        sigma2_numba = sigma2.copy()
+        recpy.ewma_components_recursion_python(mus, weights, resids, sigma2, components, nobs,
+                                               backcast)
+        sigma2_python = sigma2.copy()
+        rec.ewma_components_recursion(mus, weights, resids, sigma2, components, nobs, backcast)
+        assert_almost_equal(sigma2_numba, sigma2)
+        assert_almost_equal(sigma2_python, sigma2)
+
+        expected = np.zeros((nobs, 5))
+        for k in range(5):
+            expected[0, k] = backcast[k]
+            for t in range(1, nobs):
+                expected[t, k] = mus[k] * expected[t - 1, k] + (1 - mus[k]) * resids[t - 1] ** 2
+        assert_almost_equal(components, expected[-1])
+        assert_almost_equal(sigma2, expected.dot(weights))
+
+    def test_garch_simulation(self):
+        nobs = self.nobs
+        paths = self.rng.standard_normal((2, nobs))
+        errors = paths[0]
+        for power, params, p, o, q in ((2.0, [.1, .05, .1, .4, .4], 2, 1, 1),
+                                       (1.0, [.1, .1, .05, .8], 1, 1, 1)):
+            params = np.array(params)
+            results = []
+            for func in (recpy.garch_simulation, recpy.garch_simulation_python,
+                         rec.garch_simulation):
+                data, sigma2, fdata, fsigma = [np.ones((2, nobs)) for _ in range(4)]
+                func(params, paths, data, sigma2, fdata, fsigma, p, o, q, power, 2)
+                results.append(np.column_stack((data[0], sigma2[0], fdata[0], fsigma[0])))
+                # Paths are simulated independently
+                single = [np.ones((1, nobs)) for _ in range(4)]
+                func(params, paths[1:], *(single + [p, o, q, power, 2]))
+                assert_almost_equal(np.vstack(single), np.vstack((data[1], sigma2[1],
+                                                                  fdata[1], fsigma[1])))
+            data, sigma2, fdata, fsigma = results[-1].T
+            fdata[:2] = fsigma[:2] = 1.0
+            for t in range(2, nobs):
+                expected = params[0] + params[1:p + 1].dot(fdata[t - p:t][::-1])
+                expected += params[p + 1] * fdata[t - 1] * (data[t - 1] < 0)
+                expected += params[-1] * fsigma[t - 1]
+                assert_almost_equal(fsigma[t], expected)
+            assert_almost_equal(sigma2, fsigma ** (2.0 / power))
+            assert_almost_equal(data[2:], errors[2:] * np.sqrt(sigma2[2:]))
+            assert_almost_equal(results[0], results[-1])
+            assert_almost_equal(results[1], results[-1])
+
+    def test_simulations(self):
+        nobs = self.nobs
+        errors = self.rng.standard_normal(nobs)
+
+        def compare(name, args, n_out, start=None):
+            results = []
+            for func in (getattr(recpy, name), getattr(recpy, name + '_python'),
+                         getattr(rec, name)):
+                out = [np.ones((1, nobs)) for _ in range(n_out)]
+                extra = () if start is None else (start,)
+                func(*(args[0] + (errors[None, :],) + tuple(out) + args[1] + extra))
+                results.append(np.column_stack([o[0] for o in out]))
+            assert_almost_equal(results[0], results[2])
+            assert_almost_equal(results[1], results[2])
+            return results[2]
+
+        parameters = np.array([.1, .4, .3, .2])
+        lags = np.array([1, 5, 22], dtype=np.int32)
+        out = compare('harch_simulation', ((parameters, lags), ()), 2, 22)
+        data, sigma2 = out.T
+        for t in range(22, nobs):
+            expected = parameters[0] + parameters[1] * data[t - 1] ** 2 + \
+                parameters[2] * np.mean(data[t - 5:t] ** 2) + \
+                parameters[3] * np.mean(data[t - 22:t] ** 2)
+            assert_almost_equal(sigma2[t], expected)
+
+        # Window sums remain exact after a large value leaves the window
+        parameters = np.array([0.0, .4, .3, .2])
+        small = 1e-6 * errors[None, :]
+        for func in (recpy.harch_simulation, recpy.harch_simulation_python,
+                     rec.harch_simulation):
+            data, sigma2 = np.full((1, nobs), 1e-3), np.ones((1, nobs))
+            data[0, 21] = 1e6
+            func(parameters, lags, small, data, sigma2, 22)
+            for t in range(22, nobs):
+                expected = parameters[0] + parameters[1] * data[0, t - 1] ** 2 + \
+                    parameters[2] * np.mean(data[0, t - 5:t] ** 2) + \
+                    parameters[3] * np.mean(data[0, t - 22:t] ** 2)
+                assert_allclose(sigma2[0, t], expected, rtol=1e-10)
+
+        parameters = np.array([0.0, 0.1, -0.1, 0.95])
+        lnsigma2 = compare('egarch_simulation', ((parameters,), (1, 1, 1)), 1, 1)[:, 0]
+        expected = parameters[0] + parameters[1] * (np.abs(errors[:-1]) - np.sqrt(2 / np.pi))
+        expected += parameters[2] * errors[:-1] + parameters[3] * lnsigma2[:-1]
+        assert_almost_equal(lnsigma2[1:], expected)
+
+        j = np.arange(1, 23)
+        weights = gamma(j + 0.6) / (gamma(j + 1) * gamma(0.6))
+        weights = weights / weights.sum()
+        aw, gw = 0.8 * weights, 0.2 * weights
+        data, sigma2 = compare('midas_simulation', ((.1, aw, gw), ()), 2).T
+        for t in range(44, nobs):
+            lagged = data[t - 22:t][::-1]
+            expected = .1 + (aw + gw * (lagged < 0)).dot(lagged ** 2)
+            assert_almost_equal(sigma2[t], expected)
+
+        lam = 0.3 * weights
+        out = compare('figarch_simulation', ((.1, lam), (1.0,)), 4)
+        data, sigma2, fdata, fsigma = out.T
+        assert_almost_equal(fsigma[22:], .1 + fdata[np.arange(22, nobs)[:, None] - j].dot(lam))
+        assert_almost_equal(sigma2[22:], fsigma[22:] ** 2)
+        assert_almost_equal(data[22:], errors[22:] * fsigma[22:])
+
+    def test_ewma_components_simulation(self):
+        nobs = self.nobs
+        errors = self.rng.standard_normal(nobs)
+        mus = np.exp(-1.0 / (4 * np.sqrt(2) ** np.arange(5)))
+        weights = np.arange(1.0, 6.0)
+        weights /= weights.sum()
+        results = []
+        for func in (recpy.ewma_components_simulation,
+                     recpy.ewma_components_simulation_python,
+                     rec.ewma_components_simulation):
+            data, sigma2 = np.ones((1, nobs)), np.ones((1, nobs))
+            components = np.ones((1, 5))
+            func(mus, weights, errors[None, :], data, sigma2, components)
+            results.append(np.column_stack((data[0], sigma2[0])))
+        assert_almost_equal(results[0], results[2])
+        assert_almost_equal(results[1], results[2])
+        data, sigma2 = results[2].T
+        expected = np.ones((nobs, 5))
+        for t in range(1, nobs):
+            expected[t] = mus * expected[t - 1] + (1 - mus) * data[t - 1] ** 2
+        assert_almost_equal(components[0], expected[-1])
+        assert_almost_equal(sigma2[1:], expected[1:].dot(weights))
+        assert_almost_equal(data[1:], errors[1:] * np.sqrt(sigma2[1:]))
+
     @pytest.mark.skipif(missing_numba or missing_extension, reason='numba not installed')
     def test_garch_performance(self):
         garch_setup = """
@@ -12,10 +12,10 @@ from numpy.testing import assert_allclose
 import pandas as pd
 
 from arch.univariate import arch_model
-from arch.univariate.distribution import Normal, StudentsT
+from arch.univariate.distribution import Normal, StudentsT, SkewStudent, GeneralizedError
 from arch.univariate.mean import ConstantMean
 from arch.univariate.volatility import GARCH, ConstantVariance, HARCH, EWMAVariance, \
-    RiskMetrics2006, BootstrapRng, EGARCH, FixedVariance, MIDASHyperbolic
+    RiskMetrics2006, BootstrapRng, EGARCH, FixedVariance, MIDASHyperbolic, FIGARCH
 
 
 def _compare_truncated_forecasts(full, trunc, start):
@@ -426,6 +426,73 @@ class TestVarianceForecasts(TestCase):
         assert forecast.forecast_paths is None
         assert forecast.shocks is None
 
+    def test_harch_long_lags_forecast(self):
+        vol = HARCH(lags=[1, 5, 22, 66])
+        params = np.array([10.0, 0.3, 0.3, 0.2, 0.1])
+        backcast = vol.backcast(self.resid)
+        var_bounds = vol.variance_bounds(self.resid)
+        forecast = vol.forecast(params, self.resid, backcast, var_bounds, horizon=30,
+                                start=40)
+        trans_params = np.zeros(67)
+        trans_params[0] = params[0]
+        for param, lag in zip(params[1:], [1, 5, 22, 66]):
+            trans_params[1:lag + 1] += param / lag
+        expected = _simple_direct_gjrgarch_forecaster(self.resid, trans_params, 66, 0, 0,
+                                                      backcast, var_bounds, 30)
+        expected[:40] = np.nan
+        assert_allclose(forecast.forecasts, expected)
+
+    def test_harch_forecast_outlier(self):
+        vol = HARCH(lags=[1, 5, 22])
+        params = np.array([0.0, 0.4, 0.3, 0.2])
+        rs = np.random.RandomState(12345)
+        resid = 1e-3 * rs.standard_normal(200)
+        resid[50] = 1e6
+        backcast = 1e-6
+        var_bounds = np.array([[0.0, 1e20]] * 200)
+        forecast = vol.forecast(params, resid, backcast, var_bounds, horizon=30, start=40)
+        trans_params = np.zeros(23)
+        for param, lag in zip(params[1:], [1, 5, 22]):
+            trans_params[1:lag + 1] += param / lag
+        expected = _simple_direct_gjrgarch_forecaster(resid, trans_params, 22, 0, 0,
+                                                      backcast, var_bounds, 30)
+        expected[:40] = np.nan
+        assert_allclose(forecast.forecasts, expected, rtol=1e-8)
+
+        resid2 = np.r_[backcast * np.ones(22), resid ** 2.0]
+        direct = np.zeros(200)
+        for param, lag in zip(params[1:], [1, 5, 22]):
+            for t in range(200):
+                direct[t] += param * resid2[22 + t - lag:22 + t].mean()
+        sigma2 = vol.filter_variances(params, resid[:, None], backcast, var_bounds)
+        assert_allclose(sigma2[:, 0], direct, rtol=1e-8)
+
+    def test_figarch_forecast(self):
+        vol = FIGARCH(truncation=200)
+        params = np.array([1.0, 0.2, 0.4, 0.3])
+        backcast = vol.backcast(self.resid)
+        var_bounds = vol.variance_bounds(self.resid)
+        forecast = vol.forecast(params, self.resid, backcast, var_bounds, horizon=10,
+                                start=0)
+        trans_params = np.zeros(201)
+        trans_params[0] = params[0] / (1 - params[-1])
+        trans_params[1:] = vol._weights(params)
+        expected = _simple_direct_gjrgarch_forecaster(self.resid, trans_params, 200, 0, 0,
+                                                      backcast, var_bounds, 10)
+        assert_allclose(forecast.forecasts, expected)
+
+        forecast = vol.forecast(params, self.resid, backcast, var_bounds, horizon=10,
+                                start=self.t - 5, method='simulation', simulations=50,
+                                rng=self.rng.standard_normal)
+        assert np.all(np.isnan(forecast.forecasts[:self.t - 5]))
+        assert_allclose(forecast.forecasts[self.t - 5:, 0], expected[self.t - 5:, 0])
+        assert forecast.forecast_paths.shape == (self.t, 50, 10)
+
+        vol = FIGARCH(power=1.0)
+        with pytest.raises(ValueError):
+            vol.forecast(np.array([1.0, 0.2, 0.4, 0.3]), self.resid, backcast, var_bounds,
+                         horizon=2)
+
     def test_tarch_111_forecast(self):
         t = self.t
         vol = GARCH(p=1, o=1, q=1, power=1.0)
@@ -701,8 +768,15 @@ class TestVarianceForecasts(TestCase):
         assert_allclose(forecast.forecast_paths, paths)
         assert_allclose(forecast.shocks, shocks)
 
-        with pytest.raises(ValueError):
-            vol.forecast(params, resids, backcast, var_bounds, horizon=5)
+        forecast = vol.forecast(params, resids, backcast, var_bounds, horizon=5, start=0)
+        assert_allclose(forecast.forecasts[:, 0], one_step[:, 0])
+        normal = vol.forecast(params, resids, backcast, var_bounds, horizon=5, start=0,
+                              distribution=Normal(), dist_params=[])
+        assert_allclose(normal.forecasts, forecast.forecasts)
+        with preserved_state(self.rng):
+            sim = vol.forecast(params, resids, backcast, var_bounds, horizon=5, start=0,
+                               method='simulation', simulations=20000, rng=rng)
+        assert_allclose(forecast.forecasts, sim.forecasts, rtol=0.02)
 
     def test_egarch_101_forecast(self):
         t = self.t
@@ -1420,8 +1494,25 @@ class TestVarianceForecasts(TestCase):
         backcast = vol.backcast(resids)
         var_bounds = vol.variance_bounds(resids)
         with preserved_state(self.rng):
-            vol.forecast(params, resids, backcast, var_bounds, horizon=10, start=0,
-                         method='simulation', rng=rng)
+            forecasts = vol.forecast(params, resids, backcast, var_bounds, horizon=10,
+                                     start=0, method='simulation', rng=rng)
+        sigma2 = np.empty_like(resids)
+        vol.compute_variance(params, resids, sigma2, backcast, var_bounds)
+        paths = forecasts.forecast_paths
+        shocks = forecasts.shocks
+        assert_allclose(paths[:, :, 0], np.tile(sigma2[:, None], (1, paths.shape[1])))
+
+        # Rebuild the paths from one origin using the component recursion
+        origin = 700
+        mus = vol._ewma_smoothing_parameters()
+        w = vol._ewma_combination_weights()
+        components = np.asarray(backcast).copy()
+        for t in range(origin):
+            components = mus * components + (1 - mus) * resids[t] ** 2
+        state = np.tile(components, (paths.shape[1], 1))
+        for j in range(1, 10):
+            state = mus * state + (1 - mus) * shocks[origin, :, j - 1:j] ** 2
+            assert_allclose(paths[origin, :, j], state.dot(w))
 
     def test_rm2006_bootstrap_smoke(self):
         vol = RiskMetrics2006()
@@ -1619,3 +1710,114 @@ def test_external_rng():
     fcast_2 = res.forecast(res.params, horizon=5, method='simulation', start=900,
                            simulations=250, rng=rng)
     assert_allclose(fcast_1.residual_variance, fcast_2.residual_variance)
+
+
+@pytest.mark.parametrize('dist', [(Normal, []), (GeneralizedError, [1.2])])
+def test_egarch_analytic_multistep(dist):
+    rs = np.random.RandomState(12345)
+    resids = rs.standard_normal(500)
+    vol = EGARCH(p=2, o=1, q=2)
+    params = np.array([0.01, 0.1, 0.05, -0.05, 0.5, 0.4])
+    backcast = vol.backcast(resids)
+    var_bounds = vol.variance_bounds(resids)
+    dist, dist_params = dist
+    forecast = vol.forecast(params, resids, backcast, var_bounds, start=490, horizon=10,
+                            distribution=dist(), dist_params=dist_params)
+    assert np.all(np.isnan(forecast.forecasts[:490]))
+    rng = dist(random_state=rs).simulate(dist_params)
+    sim = vol.forecast(params, resids, backcast, var_bounds, start=490, horizon=10,
+                       method='simulation', simulations=20000, rng=rng)
+    assert_allclose(forecast.forecasts[490:], sim.forecasts[490:], rtol=0.02)
+
+
+@pytest.mark.parametrize('dist', [(StudentsT, [4.5]), (SkewStudent, [6.0, -0.2])])
+def test_egarch_analytic_heavy_tails(dist):
+    dist, dist_params = dist
+    rs = RandomState(0)
+    mod = arch_model(rs.standard_normal(300), vol='EGARCH', p=1, o=1, q=1)
+    mod.distribution = dist(random_state=rs)
+    res = mod.fix(np.r_[0.0, 0.0, 0.2, -0.05, 0.95, dist_params])
+    # E[exp(a abs(e))] is infinite, and so the analytic forecast does not exist
+    with pytest.raises(ValueError, match='finite exponential moments'):
+        res.forecast(horizon=20)
+    res.forecast(horizon=1)
+    res.forecast(horizon=20, method='simulation', simulations=10)
+
+    vol = EGARCH(p=1, o=1, q=1)
+    resids = rs.standard_normal(100)
+    backcast = vol.backcast(resids)
+    var_bounds = vol.variance_bounds(resids)
+    with pytest.raises(ValueError, match='finite exponential moments'):
+        vol.forecast(np.array([0.0, 0.2, -0.05, 0.95]), resids, backcast, var_bounds,
+                     horizon=5, distribution=dist(), dist_params=dist_params)
+
+
+def test_egarch_analytic_ged():
+    rs = RandomState(0)
+    mod = arch_model(rs.standard_normal(200), vol='EGARCH', p=1, o=1, q=1, dist='ged')
+    params = np.array([0.0, 0.0, 0.3, -0.1, 0.95, 1.1])
+    analytic = mod.fix(params).forecast(horizon=10).variance.iloc[-1]
+    mod.distribution = GeneralizedError(random_state=RandomState(1))
+    sim = mod.fix(params).forecast(horizon=10, method='simulation', simulations=20000)
+    assert_allclose(analytic, sim.variance.iloc[-1], rtol=0.03)
+
+    # E[exp(a abs(e))] is infinite for large a when the shocks are Laplace
+    vol = EGARCH(p=1, o=1, q=1)
+    resids = rs.standard_normal(100)
+    backcast = vol.backcast(resids)
+    var_bounds = vol.variance_bounds(resids)
+    with pytest.raises(ValueError, match='finite exponential moments'):
+        vol.forecast(params[1:-1], resids, backcast, var_bounds, horizon=5,
+                     distribution=GeneralizedError(), dist_params=[1.0])
+
+
+def test_bootstrap_rng_blocks(monkeypatch):
+    import arch.univariate.volatility as volatility
+
+    monkeypatch.setattr(volatility, 'SIMULATION_BLOCK_ELEMENTS', 50)
+    y = RandomState(0).standard_normal(200)
+    rs = RandomState(1)
+    rng = BootstrapRng(y, 100, random_state=rs).rng()
+    output = [rng((7, 3)) for _ in range(100, 200)]
+    rs = RandomState(1)
+    for i, shocks in zip(range(100, 200), output):
+        locs = np.floor(rs.random_sample((7, 3)) * (i + 1)).astype(np.int64)
+        assert_allclose(shocks, y[locs])
+
+    rng = BootstrapRng(y, 100, random_state=RandomState(1)).rng()
+    assert rng(5).shape == (5,)
+    shocks = rng((4, 2))
+    assert shocks.shape == (4, 2)
+    assert np.all(np.isin(shocks, y[:102]))
+
+
+def test_garch_bootstrap_origin_blocks(monkeypatch):
+    import arch.univariate.volatility as volatility
+
+    resids = RandomState(0).standard_normal(300)
+    vol = GARCH(1, 1, 1)
+    params = np.array([0.05, 0.05, 0.1, 0.85])
+    backcast = vol.backcast(resids)
+    var_bounds = vol.variance_bounds(resids)
+    expected = vol.forecast(params, resids, backcast, var_bounds, start=150, horizon=4,
+                            method='bootstrap', simulations=50, random_state=RandomState(1))
+    monkeypatch.setattr(volatility, 'SIMULATION_BLOCK_ELEMENTS', 1000)
+    blocked = vol.forecast(params, resids, backcast, var_bounds, start=150, horizon=4,
+                           method='bootstrap', simulations=50, random_state=RandomState(1))
+    assert_allclose(blocked.forecasts, expected.forecasts)
+    assert_allclose(blocked.forecast_paths, expected.forecast_paths)
+    assert_allclose(blocked.shocks, expected.shocks)
+
+
+@pytest.mark.parametrize('p,o,q', [(1, 0, 1), (1, 1, 1), (2, 1, 3), (0, 1, 1)])
+def test_garch_analytic_all_origins(p, o, q):
+    resids = RandomState(0).standard_normal(500)
+    vol = GARCH(p=p, o=o, q=q)
+    params = np.r_[0.1, [0.05] * p, [0.06] * o, [0.8 / q] * q]
+    backcast = vol.backcast(resids)
+    var_bounds = vol.variance_bounds(resids)
+    forecast = vol.forecast(params, resids, backcast, var_bounds, start=2, horizon=50)
+    expected = _simple_direct_gjrgarch_forecaster(resids, params, p, o, q, backcast,
+                                                  var_bounds, 50)
+    assert np.all(np.isnan(forecast.forecasts[:2]))
+    assert_allclose(forecast.forecasts[2:], expected[2:])
@@ -13,7 +13,7 @@ try:
 except ImportError:
     from arch.univariate import recursions_python as rec
 from arch.univariate.volatility import GARCH, ARCH, HARCH, ConstantVariance, \
-    EWMAVariance, RiskMetrics2006, EGARCH, FixedVariance, MIDASHyperbolic
+    EWMAVariance, RiskMetrics2006, EGARCH, FixedVariance, MIDASHyperbolic, FIGARCH
 from arch.univariate.distribution import Normal, StudentsT, SkewStudent
 from arch.utility.exceptions import InitialValueWarning
 
@@ -1097,6 +1097,137 @@ class TestVolatiltyProcesses(object):
             parameters = np.array([.1, 1.1, .4])
             midas.simulate(parameters, self.T, rng.simulate([]))
 
+    def test_figarch(self):
+        truncation = 300
+        for p, q, power in ((1, 1, 2.0), (0, 1, 2.0), (1, 0, 1.0), (0, 0, 1.5)):
+            figarch = FIGARCH(p=p, q=q, power=power, truncation=truncation)
+            assert_equal(figarch.num_params, 2 + p + q)
+            parameters = np.array([.1] + [.2] * p + [.4] + [.3] * q)
+            phi = .2 if p else 0.0
+            beta = .3 if q else 0.0
+            d = .4
+
+            lam = np.zeros(truncation)
+            delta = np.zeros(truncation)
+            lam[0] = phi - beta + d
+            delta[0] = d
+            for i in range(1, truncation):
+                delta[i] = (i - d) / (i + 1) * delta[i - 1]
+                lam[i] = beta * lam[i - 1] + delta[i] - phi * delta[i - 1]
+            assert_allclose(figarch._weights(parameters), lam)
+            # The cached weights do not depend on omega
+            weights = figarch._weights(parameters)
+            alt_parameters = parameters.copy()
+            alt_parameters[0] = .5
+            assert figarch._weights(alt_parameters) is weights
+            alt_parameters[-1] += .01
+            assert figarch._weights(alt_parameters) is not weights
+
+            sv = figarch.starting_values(self.resids)
+            assert_equal(sv.shape[0], figarch.num_params)
+            a, b = figarch.constraints()
+            assert_equal(a.shape, (3 + 2 * p + 2 * q, figarch.num_params))
+            assert np.all(a.dot(sv) - b >= 0)
+            assert_equal(len(figarch.bounds(self.resids)), figarch.num_params)
+
+            backcast = figarch.backcast(self.resids)
+            var_bounds = figarch.variance_bounds(self.resids)
+            figarch.compute_variance(parameters, self.resids, self.sigma2, backcast, var_bounds)
+            fresids = np.abs(self.resids) ** power
+            expected = np.zeros(self.T)
+            for t in range(self.T):
+                expected[t] = .1 / (1 - beta)
+                for i in range(truncation):
+                    shock = fresids[t - i - 1] if t - i - 1 >= 0 else backcast
+                    expected[t] += lam[i] * shock
+            assert_allclose(self.sigma2, expected ** (2.0 / power))
+
+            data, sigma2 = figarch.simulate(parameters, self.T, self.rng.standard_normal)
+            assert_equal(data.shape, (self.T,))
+            assert np.all(sigma2 > 0)
+
+        figarch = FIGARCH()
+        assert_equal(figarch.parameter_names(), ['omega', 'phi', 'd', 'beta'])
+        assert_equal(FIGARCH(p=0, q=0).parameter_names(), ['omega', 'd'])
+        assert_equal(str(figarch), 'FIGARCH(p: 1, q: 1)')
+        assert_equal(str(FIGARCH(power=1.0)), 'FIAVGARCH(p: 1, q: 1)')
+        assert 'Power FIGARCH' in str(FIGARCH(power=1.5))
+        with pytest.warns(InitialValueWarning):
+            # d = 0 so that the weights sum to (phi - beta) / (1 - beta) > 1
+            figarch.simulate(np.array([.1, 1.5, 0.0, .3]), 100, self.rng.standard_normal,
+                             burn=0)
+        with pytest.raises(ValueError):
+            FIGARCH(p=2)
+        with pytest.raises(ValueError):
+            FIGARCH(power=-1.0)
+        with pytest.raises(ValueError):
+            FIGARCH(truncation=0)
+
+    def test_midas_long_lags(self):
+        # Long lag lengths use a convolution rather than the recursion
+        resids = self.resids
+        for asym in (False, True):
+            midas = MIDASHyperbolic(m=400, asym=asym)
+            parameters = np.array([.1, .6, .4, .7]) if asym else np.array([.1, .9, .7])
+            backcast = midas.backcast(resids)
+            var_bounds = midas.variance_bounds(resids)
+            sigma2 = np.zeros_like(resids)
+            midas.compute_variance(parameters, resids, sigma2, backcast, var_bounds)
+            direct_params = np.zeros(3)
+            direct_params[:2 + asym] = parameters[:2 + asym]
+            cond_var_direct = np.zeros_like(resids)
+            rec.midas_recursion_python(direct_params, midas._weights(parameters), resids,
+                                       cond_var_direct, self.T, backcast, var_bounds)
+            assert_allclose(sigma2, cond_var_direct)
+
+    def test_filter_variances(self):
+        resids = np.column_stack([self.resids, self.resids[::-1], 2 * self.resids])
+        processes = [(GARCH(1, 1, 1), np.array([.05, .05, .1, .85])),
+                     (GARCH(2, 0, 1, power=1.0), np.array([.02, .05, .05, .88])),
+                     (ARCH(3), np.array([.3, .2, .2, .2])),
+                     (EWMAVariance(), np.empty(0)),
+                     (HARCH(lags=[1, 5, 22]), np.array([.1, .3, .3, .3])),
+                     (MIDASHyperbolic(asym=True), np.array([.1, .5, .3, .5])),
+                     (FIGARCH(), np.array([.1, .2, .4, .3])),
+                     (EGARCH(1, 1, 1), np.array([0.0, .1, -.05, .95])),
+                     (ConstantVariance(), np.array([1.0]))]
+        for vol, parameters in processes:
+            sigma2 = vol.filter_variances(parameters, resids)
+            assert sigma2.shape == resids.shape
+            for i in range(3):
+                x = resids[:, i].copy()
+                expected = np.empty(self.T)
+                vol.compute_variance(parameters, x, expected, vol.backcast(x),
+                                     vol.variance_bounds(x))
+                assert_allclose(sigma2[:, i], expected)
+
+        # Bounds that bind require the recursion
+        garch = GARCH()
+        parameters = np.array([.1, .1, .8])
+        var_bounds = np.tile([0.9, 1.1], (self.T, 1))
+        sigma2 = garch.filter_variances(parameters, resids, backcast=1.0,
+                                        var_bounds=var_bounds)
+        for i in range(3):
+            expected = np.empty(self.T)
+            garch.compute_variance(parameters, resids[:, i].copy(), expected, 1.0, var_bounds)
+            assert_allclose(sigma2[:, i], expected)
+        assert np.all(sigma2 >= 0.9)
+
+        # ARCH-type processes apply the bounds to the filtered variances
+        harch = HARCH(lags=[1, 5, 22])
+        harch_params = np.array([.1, .4, .3, .2])
+        all_bounds = np.broadcast_to(var_bounds[:, None], (self.T, 3, 2))
+        sigma2, exact = harch._filter_variances(harch_params, resids, [1.0] * 3, all_bounds)
+        assert np.all(exact)
+        for i in range(3):
+            expected = np.empty(self.T)
+            harch.compute_variance(harch_params, resids[:, i].copy(), expected, 1.0,
+                                   var_bounds)
+            assert_allclose(sigma2[:, i], expected)
+
+        with pytest.raises(ValueError):
+            garch.filter_variances(parameters, self.resids)
+
     def test_midas_asymmetric(self):
         midas = MIDASHyperbolic(33, asym=True)
 
@@ -1184,3 +1315,32 @@ class TestVolatiltyProcesses(object):
         with pytest.warns(InitialValueWarning):
             parameters = np.array([.1, .3, 1.6, .4])
             midas.simulate(parameters, self.T, rng.simulate([]))
+
+
+@pytest.mark.parametrize('vol_params', [(GARCH(1, 1, 1), [.05, .05, .1, .85]),
+                                        (GARCH(1, 1, 1, power=1.0), [.05, .05, .1, .85]),
+                                        (HARCH(lags=[1, 5, 22]), [.1, .4, .3, .2]),
+                                        (EGARCH(1, 1, 1), [0.0, .1, -.1, .95]),
+                                        (MIDASHyperbolic(asym=True), [.1, .6, .2, .4]),
+                                        (FIGARCH(), [.05, .2, .4, .5]),
+                                        (EWMAVariance(), []),
+                                        (RiskMetrics2006(), []),
+                                        (ConstantVariance(), [1.5])])
+def test_simulate_repetitions(vol_params):
+    vol, params = vol_params
+    params = np.array(params)
+    draws = []
+
+    def rng(size):
+        draws.append(RandomState(0).standard_normal(size))
+        return draws[-1]
+
+    data, sigma2 = vol.simulate(params, 100, rng, burn=50, repetitions=4)
+    assert data.shape == sigma2.shape == (4, 100)
+    assert draws[0].shape[0] == 4
+    # A path simulated with the other paths is identical to a path simulated
+    # alone from the same shocks
+    for i in range(4):
+        single = vol.simulate(params, 100, lambda n: draws[0][i], burn=50)
+        assert_allclose(data[i], single[0])
+        assert_allclose(sigma2[i], single[1])
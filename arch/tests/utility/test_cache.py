@@ -0,0 +1,34 @@
+import copy
+
+import numpy as np
+
+from arch.utility.cache import ArrayCache
+
+
+def test_array_cache():
+    cache = ArrayCache(max_bytes=3 * 800)
+    for i in range(3):
+        cache.put(i, np.zeros(100))
+    assert len(cache) == 3
+    assert cache.nbytes == 3 * 800
+    # Use 0 so that 1 is the least recently used
+    assert cache.get(0) is not None
+    cache.put(3, (np.zeros(50), np.zeros(50)))
+    assert 1 not in cache
+    assert 0 in cache
+    assert cache.nbytes == 3 * 800
+    assert cache.get(1, 'missing') == 'missing'
+
+    cache.put(4, np.zeros(1000))
+    assert 4 not in cache
+    cache.pop(0)
+    assert cache.nbytes == 2 * 800
+    cache.put(2, {'a': np.zeros(10)})
+    assert cache.nbytes == 800 + 80
+
+    copied = copy.deepcopy(cache)
+    assert len(copied) == 0
+    assert copied.max_bytes == cache.max_bytes
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from numpy.random import RandomState
+from numpy.testing import assert_equal
+
+from arch.utility.rng import (HAS_GENERATOR, check_random_state, get_state, indexed_generator,
+                              randint, random_sample, reseed, set_state, spawn_generators)
+
+if HAS_GENERATOR:
+    from numpy.random import Generator, PCG64, SeedSequence
+
+pytestmark = pytest.mark.skipif(not HAS_GENERATOR, reason='Requires NumPy Generator')
+
+
+def test_check_random_state():
+    assert isinstance(check_random_state(None), RandomState)
+    rs = RandomState(0)
+    assert check_random_state(rs) is rs
+    gen = Generator(PCG64(0))
+    assert check_random_state(gen) is gen
+    with pytest.raises(TypeError):
+        check_random_state(1234)
+
+
+@pytest.mark.parametrize('generator', [False, True])
+def test_draws_and_state(generator):
+    random_state = Generator(PCG64(0)) if generator else RandomState(0)
+    state = get_state(random_state)
+    u = random_sample(random_state, 10)
+    i = randint(random_state, 5, size=10)
+    assert u.shape == (10,)
+    assert np.all((u >= 0) & (u < 1))
+    assert np.all((i >= 0) & (i < 5))
+    set_state(random_state, state)
+    assert_equal(random_sample(random_state, 10), u)
+    assert_equal(randint(random_state, 5, size=10), i)
+
+    reseeded = reseed(random_state, 1)
+    first = random_sample(reseeded, 5)
+    reseeded = reseed(reseeded, 1)
+    assert_equal(random_sample(reseeded, 5), first)
+
+
+def test_spawn_generators():
+    gens = spawn_generators(12345, 4)
+    children = SeedSequence(12345).spawn(4)
+    for gen, child in zip(gens, children):
+        assert_equal(gen.random(5), Generator(PCG64(child)).random(5))
+
+    offset = spawn_generators(SeedSequence(12345), 2, offset=2)
+    assert_equal(offset[1].random(5), Generator(PCG64(children[3])).random(5))
+    assert_equal(indexed_generator(12345, 3).random(5),
+                 Generator(PCG64(children[3])).random(5))
+
+    # Indices are absolute and do not depend on the spawn state of the root
+    root = SeedSequence(12345)
+    root.spawn(3)
+    assert_equal(spawn_generators(root, 1)[0].random(5),
+                 Generator(PCG64(children[0])).random(5))
+    assert_equal(root.n_children_spawned, 3)
@@ -2,12 +2,13 @@ from __future__ import absolute_import
 
 from arch.univariate.mean import HARX, ConstantMean, ZeroMean, ARX, arch_model, LS
 from arch.univariate.volatility import (GARCH, ARCH, HARCH, ConstantVariance, EWMAVariance,
-                                        RiskMetrics2006, EGARCH, FixedVariance, MIDASHyperbolic)
+                                        RiskMetrics2006, EGARCH, FIGARCH, FixedVariance,
+                                        MIDASHyperbolic)
 from arch.univariate.distribution import (Distribution, Normal, StudentsT, SkewStudent,
                                           GeneralizedError)
 
 __all__ = ['HARX', 'ConstantMean', 'ZeroMean', 'ARX', 'arch_model', 'LS',
            'GARCH', 'ARCH', 'HARCH', 'ConstantVariance',
-           'EWMAVariance', 'RiskMetrics2006', 'EGARCH',
+           'EWMAVariance', 'RiskMetrics2006', 'EGARCH', 'FIGARCH',
            'Distribution', 'Normal', 'StudentsT', 'SkewStudent', 'GeneralizedError',
            'FixedVariance', 'MIDASHyperbolic']
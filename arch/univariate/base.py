@@ -19,17 +19,28 @@ from statsmodels.tools.numdiff import approx_fprime, approx_hess
 from arch.univariate.distribution import Distribution, Normal
 from arch.univariate.volatility import VolatilityProcess, ConstantVariance
 from arch.utility.array import ensure1d, AbstractDocStringInheritor
+from arch.utility.cache import ArrayCache
 from arch.utility.exceptions import ConvergenceWarning, StartingValueWarning, \
     convergence_warning, starting_value_warning
 from arch.vendor.cached_property import cached_property
 from scipy.optimize import OptimizeResult
 
-__all__ = ['implicit_constant', 'ARCHModelResult', 'ARCHModel', 'ARCHModelForecast', 'constraint']
+__all__ = ['implicit_constant', 'ARCHModelResult', 'ARCHModel', 'ARCHModelForecast',
+           'ARCHModelMultiSeriesResult', 'constraint']
 
 # Callback variables
 _callback_iter, _callback_llf = 0, 0.0,
 _callback_func_count, _callback_iter_display = 0, 1
 
+# Tolerance and maximum number of iterations when estimating the mean
+# parameters given the volatility parameters
+PROFILE_TOL = 1e-8
+PROFILE_MAX_ITER = 10
+# Tolerance and maximum number of iterations of the quasi-Newton steps used to
+# polish estimates from the concentrated likelihood
+POLISH_TOL = 1e-10
+POLISH_MAX_ITER = 20
+
 
 def _callback(*args):
     """
@@ -151,7 +162,7 @@ class ARCHModel(object):
         else:
             self._y_series = ensure1d(np.empty((0,)), 'y', series=True)
 
-        self._y = np.asarray(self._y_series)
+        self._y = np.ascontiguousarray(self._y_series)
         self._y_original = y
 
         self.hold_back = hold_back
@@ -161,6 +172,8 @@ class ARCHModel(object):
         self._distribution = None
         self._backcast = None
         self._var_bounds = None
+        # Filtered state and forecasts reused across calls to forecast
+        self._cache = ArrayCache()
 
         if volatility is not None:
             self.volatility = volatility
@@ -219,6 +232,7 @@ class ARCHModel(object):
         if not isinstance(value, VolatilityProcess):
             raise ValueError("Must subclass VolatilityProcess")
         self._volatility = value
+        self._cache.clear()
 
     @property
     def distribution(self):
@@ -233,6 +247,7 @@ class ARCHModel(object):
         if not isinstance(value, Distribution):
             raise ValueError("Must subclass Distribution")
         self._distribution = value
+        self._cache.clear()
 
     def _r2(self, params):
         """
@@ -241,6 +256,24 @@ class ARCHModel(object):
         """
         raise NotImplementedError("Subclasses optionally may provide.")
 
+    def _weighted_mean_params(self, sigma2):
+        """
+        Mean parameters estimated by weighted least squares.  Optional to
+        over-ride.  Must match signature.
+
+        Parameters
+        ----------
+        sigma2 : ndarray
+            Conditional variances used to weight the observations
+
+        Returns
+        -------
+        params : ndarray
+            Mean parameters that maximize the Gaussian likelihood when the
+            conditional variances are sigma2
+        """
+        raise NotImplementedError("Subclasses optionally may provide.")
+
     @abstractmethod
     def _fit_no_arch_normal_errors(self, cov_type='robust'):
         """
@@ -269,8 +302,9 @@ class ARCHModel(object):
         resids[first_obs:last_obs] = y
         vol = np.full_like(resids, np.nan)
         var_bounds = self.volatility.variance_bounds(resids)
-        vol[first_obs:last_obs] = self.volatility.compute_variance(params, y, vol, backcast,
-                                                                   var_bounds)
+        sigma2 = np.empty_like(y)
+        self.volatility.compute_variance(params, y, sigma2, backcast, var_bounds)
+        vol[first_obs:last_obs] = np.sqrt(sigma2)
         names = self._all_parameter_names()
         loglikelihood = self._static_gaussian_loglikelihood(y)
         r2 = self._r2(params)
@@ -315,6 +349,153 @@ class ARCHModel(object):
         _callback_llf = -1.0 * llf
         return -1.0 * llf
 
+    def _profile_mean_params(self, parameters, sigma2, backcast, var_bounds,
+                             mean_params):
+        """
+        Mean parameters that maximize the Gaussian likelihood given the
+        volatility parameters
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Volatility parameters
+        sigma2 : ndarray
+            Array used to store the conditional variances
+        backcast : float
+            Value to use when initializing the recursion
+        var_bounds : ndarray
+            Variance bounds
+        mean_params : ndarray
+            Initial mean parameters. Overwritten with the estimates so that
+            the next call starts from the previous solution.
+
+        Returns
+        -------
+        mean_params : ndarray
+            Mean parameters
+
+        Notes
+        -----
+        The mean parameters are estimated by weighted least squares using the
+        conditional variances implied by the current estimate, and the
+        process is repeated until the estimates do not change.
+        """
+        mp = mean_params
+        for _ in range(PROFILE_MAX_ITER):
+            resids = self.resids(mp)
+            self.volatility.compute_variance(parameters, resids, sigma2, backcast,
+                                             var_bounds)
+            next_mp = self._weighted_mean_params(sigma2)
+            change = np.max(np.abs(next_mp - mp))
+            mp = next_mp
+            if change <= PROFILE_TOL * (1.0 + np.max(np.abs(mp))):
+                break
+        mean_params[:] = mp
+        return mp
+
+    def _concentrated_loglikelihood(self, parameters, sigma2, backcast,
+                                    var_bounds, mean_params):
+        """
+        Computes the log-likelihood with the mean parameters concentrated out
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Volatility and distribution parameters
+        sigma2 : ndarray
+            Array used to store the conditional variances
+        backcast : float
+            Value to use when initializing the recursion
+        var_bounds : ndarray
+            Variance bounds
+        mean_params : ndarray
+            Mean parameters used to start the estimation of the mean
+            parameters. Overwritten with the estimates.
+
+        Returns
+        -------
+        neg_llf : float
+            Negative of model loglikelihood
+        """
+        kv = int(self.volatility.num_params)
+        mp = self._profile_mean_params(parameters[:kv], sigma2, backcast, var_bounds,
+                                       mean_params)
+        return self._loglikelihood(np.concatenate((mp, parameters)), sigma2,
+                                   backcast, var_bounds)
+
+    def _polish(self, params, sigma2, backcast, var_bounds, a, b, bounds):
+        """
+        Improve estimates using quasi-Newton steps on the full likelihood
+
+        Parameters
+        ----------
+        params : ndarray
+            Starting values for all parameters
+        sigma2 : ndarray
+            Array used to store the conditional variances
+        backcast : float
+            Value to use when initializing the recursion
+        var_bounds : ndarray
+            Variance bounds
+        a : ndarray
+            Constraint loadings where a.dot(params) - b >= 0
+        b : ndarray
+            Constraint values
+        bounds : list
+            List of lower and upper bounds for each parameter
+
+        Returns
+        -------
+        params : ndarray
+            Polished parameters
+        neg_llf : float
+            Negative of model loglikelihood at params
+
+        Notes
+        -----
+        The Hessian is initialized using the outer product of the scores
+        (BHHH) and updated using BFGS.  Steps are halved until the likelihood
+        improves and the parameters satisfy the constraints and bounds.
+        Iteration stops when a step improves the likelihood by less than
+        ``POLISH_TOL``.
+        """
+        lower = np.array([bound[0] for bound in bounds], dtype=np.float64)
+        upper = np.array([bound[1] for bound in bounds], dtype=np.float64)
+        args = (sigma2, backcast, var_bounds)
+        neg_llf = self._loglikelihood(params, *args)
+        scores = approx_fprime(params, self._loglikelihood, args=args,
+                               kwargs={'individual': True})
+        hessian = scores.T.dot(scores)
+        gradient = scores.sum(0)
+        for _ in range(POLISH_MAX_ITER):
+            step = -np.linalg.lstsq(hessian, gradient, rcond=None)[0]
+            scale, improved = 1.0, False
+            while scale > 1e-4 and not improved:
+                candidate = params + scale * step
+                feasible = (np.all(a.dot(candidate) - b >= 0) and
+                            np.all(candidate >= lower) and np.all(candidate <= upper))
+                if feasible:
+                    candidate_llf = self._loglikelihood(candidate, *args)
+                    improved = candidate_llf < neg_llf
+                scale /= 2.0
+            if not improved:
+                break
+            change = neg_llf - candidate_llf
+            params, neg_llf, delta = candidate, candidate_llf, candidate - params
+            if change < POLISH_TOL * (1.0 + abs(neg_llf)):
+                break
+            # BFGS update of the outer product of the scores
+            last_gradient = gradient
+            gradient = approx_fprime(params, self._loglikelihood, args=args)
+            diff = gradient - last_gradient
+            curvature = diff.dot(delta)
+            if curvature > 0:
+                hessian_delta = hessian.dot(delta)
+                hessian = (hessian + np.outer(diff, diff) / curvature -
+                           np.outer(hessian_delta, hessian_delta) / delta.dot(hessian_delta))
+
+        return params, neg_llf
+
     def _all_parameter_names(self):
         """Returns a list containing all parameter names from the mean model,
         volatility model and distribution"""
@@ -410,7 +591,8 @@ class ARCHModel(object):
 
     def fit(self, update_freq=1, disp='final', starting_values=None,
             cov_type='robust', show_warning=True, first_obs=None,
-            last_obs=None, tol=None, options=None, backcast=None):
+            last_obs=None, tol=None, options=None, backcast=None,
+            concentrate=False):
         r"""
         Fits the model given a nobs by 1 vector of sigma2 values
 
@@ -445,6 +627,11 @@ class ARCHModel(object):
             Value to use as backcast. Should be measure :math:`\sigma^2_0`
             since model-specific non-linear transformations are applied to
             value before computing the variance recusions.
+        concentrate : bool, optional
+            Flag indicating whether to concentrate the mean parameters out of
+            the likelihood when searching for the volatility and distribution
+            parameters. Only available for models with normal errors and
+            mean parameters that can be estimated by least squares.
 
         Returns
         -------
@@ -457,6 +644,16 @@ class ARCHModel(object):
         difficulty finding the optimum.
 
         Parameters are optimized using SLSQP.
+
+        When ``concentrate`` is True, the optimizer only searches over the
+        volatility and distribution parameters.  For each value of these
+        parameters, the mean parameters are estimated by weighted least
+        squares using the conditional variances implied by the current mean
+        parameters, and this is repeated until the mean parameters converge.
+        These estimates ignore the effect of the mean parameters on the
+        conditional variances, and so are refined using a small number of
+        BHHH steps on the full likelihood.  The parameter covariance is
+        computed in the usual way.
         """
         if self._y_original is None:
             raise RuntimeError('Cannot estimate model without data.')
@@ -471,17 +668,18 @@ class ARCHModel(object):
         has_closed_form = v.closed_form and d.num_params == 0 and isinstance(v, ConstantVariance)
         self._adjust_sample(first_obs, last_obs)
 
+        if has_closed_form:
+            try:
+                return self._fit_no_arch_normal_errors(cov_type=cov_type)
+            except NotImplementedError:
+                pass
+
         resids = self.resids(self.starting_values())
         if backcast is None:
             backcast = v.backcast(resids)
         else:
             backcast = v.backcast_transform(backcast)
 
-        if has_closed_form:
-            try:
-                return self._fit_no_arch_normal_errors(cov_type=cov_type)
-            except NotImplementedError:
-                pass
         if total_params == 0:
             return self._fit_parameterless_model(cov_type=cov_type, backcast=backcast)
 
@@ -556,9 +754,33 @@ class ARCHModel(object):
 
         options = {} if options is None else options
         options.setdefault('disp', disp)
-        opt = minimize(func, sv, args=args, method='SLSQP', bounds=bounds,
-                       constraints=ineq_constraints, tol=tol, callback=_callback,
-                       options=options)
+        km = int(self.num_params)
+        if concentrate and km > 0:
+            if not isinstance(d, Normal):
+                raise ValueError('concentrate requires normally distributed errors')
+            if np.any(a[:, :km] != 0):
+                raise ValueError('concentrate is not available when the mean '
+                                 'parameters are constrained')
+            mean_params = np.array(sv[:km])
+            conc_args = args + (mean_params,)
+            try:
+                self._concentrated_loglikelihood(sv[km:], *conc_args)
+            except NotImplementedError:
+                raise ValueError('concentrate is not available for this mean model')
+            conc_opt = minimize(self._concentrated_loglikelihood, sv[km:],
+                                args=conc_args, method='SLSQP', bounds=bounds[km:],
+                                constraints=constraint(a[:, km:], b), tol=tol,
+                                callback=_callback, options=options)
+            kv = int(v.num_params)
+            mp = self._profile_mean_params(conc_opt.x[:kv], sigma2, backcast, var_bounds,
+                                           mean_params)
+            opt = conc_opt
+            opt.x, opt.fun = self._polish(np.concatenate((mp, conc_opt.x)), sigma2, backcast,
+                                          var_bounds, a, b, bounds)
+        else:
+            opt = minimize(func, sv, args=args, method='SLSQP', bounds=bounds,
+                           constraints=ineq_constraints, tol=tol, callback=_callback,
+                           options=options)
 
         if show_warning:
             warnings.filterwarnings('always', '', ConvergenceWarning)
@@ -640,9 +862,62 @@ class ARCHModel(object):
 
     @abstractmethod
     def simulate(self, params, nobs, burn=500, initial_value=None, x=None,
-                 initial_value_vol=None):
+                 initial_value_vol=None, repetitions=None, dtype=np.float64, block_size=1000):
         pass
 
+    def _simulate_paths(self, vol_params, dist_params, nobs, burn, initial_value_vol,
+                        repetitions, dtype, block_size, mean):
+        """
+        Simulate many independent paths
+
+        Parameters
+        ----------
+        vol_params : ndarray
+            Parameters of the volatility process
+        dist_params : ndarray
+            Parameters of the distribution
+        nobs : int
+            Length of each path
+        burn : int
+            Number of values discarded at the start of each path
+        initial_value_vol : {ndarray, float, None}
+            Value used to initialize the volatility process
+        repetitions : int
+            Number of paths to simulate
+        dtype : dtype
+            Data type of the returned arrays
+        block_size : int
+            Number of paths generated at a time
+        mean : callable
+            Function that takes a block by nobs + burn array of errors and
+            returns the simulated data
+
+        Returns
+        -------
+        simulated_data : dict
+            Dictionary with keys data, volatility and errors containing
+            repetitions by nobs arrays
+        """
+        repetitions = int(repetitions)
+        block_size = int(block_size)
+        if repetitions < 1 or block_size < 1:
+            raise ValueError('repetitions and block_size must be positive')
+        block_size = min(block_size, repetitions)
+
+        simulator = self.distribution.simulate(dist_params)
+        out = dict((key, np.empty((repetitions, nobs), dtype=dtype))
+                   for key in ('data', 'volatility', 'errors'))
+        for first in range(0, repetitions, block_size):
+            last = min(first + block_size, repetitions)
+            # All paths in a block are simulated in a single pass
+            errors, sigma2 = self.volatility.simulate(vol_params, nobs + burn, simulator, burn,
+                                                      initial_value_vol,
+                                                      repetitions=last - first)
+            out['data'][first:last] = mean(errors)[:, burn:]
+            out['volatility'][first:last] = np.sqrt(sigma2[:, burn:])
+            out['errors'][first:last] = errors[:, burn:]
+        return out
+
     @abstractmethod
     def resids(self, params, y=None, regressors=None):
         """
@@ -706,7 +981,8 @@ class ARCHModel(object):
 
     @abstractmethod
     def forecast(self, params, horizon=1, start=None, align='origin', method='analytic',
-                 simulations=1000, rng=None):
+                 simulations=1000, rng=None, random_state=None,
+                 aggregate=False):
         """
         Construct forecasts from estimated model
 
@@ -743,6 +1019,21 @@ class ARCHModel(object):
             Custom random number generator to use in simulation-based forecasts.
             Must produce random samples using the syntax `rng(size)` where size
             the 2-element tuple (simulations, horizon).
+        random_state : {RandomState, Generator, SeedSequence}, optional
+            Source of randomness for simulation and bootstrap forecasts.  If a
+            NumPy RandomState or Generator, it is used in place of the random
+            state attached to the distribution.  If a SeedSequence, each
+            forecast origin uses an independent stream identified by its
+            index, so that forecasts are identical when the origins are
+            split across workers.  Ignored if rng is provided when using
+            simulation-based forecasts.
+        aggregate : bool, optional
+            Flag indicating whether to forecast the cumulative value of the
+            process over the horizon.  If True, the forecast in column h is
+            the forecast of y[t+1] + ... + y[t+h] and the variance is the
+            variance of this sum, which accounts for the dynamics of the mean.
+            When using simulation or bootstrap, the simulated paths are also
+            cumulative.  Default is False.
 
         Returns
         -------
@@ -784,6 +1075,47 @@ class ARCHModel(object):
         """
         pass
 
+    def evaluate(self, params, y, x=None, realized=None):
+        """
+        One-step predictive evaluation of data that follow the model's data
+
+        Parameters
+        ----------
+        params : {ndarray, Series}
+            Model parameters
+        y : {ndarray, Series}
+            Observations that follow the last observation of the model's
+            dependent variable
+        x : {ndarray, DataFrame, sparse matrix}, optional
+            Values of the exogenous regressors for the observations in y.
+            Required if the model contains exogenous regressors.
+        realized : ndarray, optional
+            Values of the realized measures for the observations in y.
+            Required if the model contains realized measures.
+
+        Returns
+        -------
+        evaluation : DataFrame
+            DataFrame with one row for each value of y and columns
+            'loglikelihood', containing the predictive log-likelihood,
+            'pit', containing the probability integral transform of the
+            standardized residual using the model's distribution, and
+            'std_resid', containing the standardized residual.  Uses the
+            index of y if y is a Series.
+
+        Notes
+        -----
+        The conditional mean and variance of each value of y use information
+        up to and including the previous observation, and so the evaluation
+        is identical to filtering the model's data followed by y using
+        params.  The model's data are filtered from the first observation used
+        in estimation using the same backcast and variance bounds as
+        forecast.  No new models or results are created, and so the
+        evaluation can be repeated for many data segments, such as in a
+        rolling out-of-sample exercise.
+        """
+        raise NotImplementedError("Subclasses optionally may provide.")
+
 
 class _SummaryRepr(object):
     """Base class for returning summary as repr and str"""
@@ -1099,7 +1431,8 @@ class ARCHModelFixedResult(_SummaryRepr):
         return fig
 
     def forecast(self, params=None, horizon=1, start=None, align='origin', method='analytic',
-                 simulations=1000, rng=None):
+                 simulations=1000, rng=None, random_state=None,
+                 aggregate=False):
         """
         Construct forecasts from estimated model
 
@@ -1136,6 +1469,21 @@ class ARCHModelFixedResult(_SummaryRepr):
             Custom random number generator to use in simulation-based forecasts.
             Must produce random samples using the syntax `rng(size)` where size
             the 2-element tuple (simulations, horizon).
+        random_state : {RandomState, Generator, SeedSequence}, optional
+            Source of randomness for simulation and bootstrap forecasts.  If a
+            NumPy RandomState or Generator, it is used in place of the random
+            state attached to the distribution.  If a SeedSequence, each
+            forecast origin uses an independent stream identified by its
+            index, so that forecasts are identical when the origins are
+            split across workers.  Ignored if rng is provided when using
+            simulation-based forecasts.
+        aggregate : bool, optional
+            Flag indicating whether to forecast the cumulative value of the
+            process over the horizon.  If True, the forecast in column h is
+            the forecast of y[t+1] + ... + y[t+h] and the variance is the
+            variance of this sum, which accounts for the dynamics of the mean.
+            When using simulation or bootstrap, the simulated paths are also
+            cumulative.  Default is False.
 
         Returns
         -------
@@ -1170,7 +1518,130 @@ class ARCHModelFixedResult(_SummaryRepr):
             if (params.size != np.array(self._params).size or
                     params.ndim != self._params.ndim):
                 raise ValueError('params have incorrect dimensions')
-        return self.model.forecast(params, horizon, start, align, method, simulations, rng)
+        return self.model.forecast(params, horizon, start, align, method, simulations, rng,
+                                   random_state, aggregate)
+
+    def evaluate(self, y, x=None, params=None, realized=None):
+        """
+        One-step predictive evaluation of data that follow the model's data
+
+        Parameters
+        ----------
+        y : {ndarray, Series}
+            Observations that follow the last observation of the model's
+            dependent variable
+        x : {ndarray, DataFrame, sparse matrix}, optional
+            Values of the exogenous regressors for the observations in y.
+            Required if the model contains exogenous regressors.
+        params : {ndarray, Series}, optional
+            Alternative parameters to use.  If not provided, the parameters
+            estimated when fitting the model are used.
+        realized : ndarray, optional
+            Values of the realized measures for the observations in y.
+            Required if the model contains realized measures.
+
+        Returns
+        -------
+        evaluation : DataFrame
+            DataFrame with columns 'loglikelihood', 'pit' and 'std_resid'
+            containing the predictive log-likelihood, the probability
+            integral transform and the standardized residual of each value
+            of y.
+
+        See Also
+        --------
+        arch.univariate.base.ARCHModel.evaluate
+        """
+        if params is None:
+            params = self._params
+        return self.model.evaluate(np.asarray(params), y, x, realized)
+
+    def value_at_risk(self, q=(0.01, 0.05), params=None, horizon=1, start=None,
+                      method=None, simulations=1000, random_state=None):
+        r"""
+        Value-at-Risk and Expected Shortfall forecasts
+
+        Parameters
+        ----------
+        q : {float, array_like}, optional
+            Tail probabilities, each in (0, 1).  Default is (0.01, 0.05).
+        params : {ndarray, Series}, optional
+            Alternative parameters to use.  If not provided, the parameters
+            estimated when fitting the model are used.
+        horizon : int, optional
+            Number of periods in the cumulative return.  Default is 1.
+        start : {int, datetime, Timestamp, str}, optional
+            First observation to produce the forecast for.  See forecast.
+        method : {'analytic', 'simulation', 'bootstrap'}, optional
+            Method used to compute the forecasts.  The default is 'analytic'
+            when horizon is 1 and 'simulation' otherwise.  'analytic' is only
+            available when horizon is 1.
+        simulations : int, optional
+            Number of simulations to use when method is 'simulation' or
+            'bootstrap'.
+        random_state : {RandomState, Generator, SeedSequence}, optional
+            Source of randomness when method is 'simulation' or 'bootstrap'.
+            See forecast.
+
+        Returns
+        -------
+        value_at_risk : ndarray
+            nobs by len(q) array of VaR forecasts
+        expected_shortfall : ndarray
+            nobs by len(q) array of ES forecasts
+
+        Notes
+        -----
+        VaR and ES are expressed as losses, so that they are positive when
+        the tail of the return distribution is negative.  Row t contains the
+        forecasts made using information up to and including t for the
+        return in t+1 (or the cumulative return from t+1 to t+horizon).
+        Rows before start are nan.
+
+        When method is 'analytic', the forecasts are
+
+        .. math::
+
+            VaR_{t+1} = -\mu_{t+1} - \sigma_{t+1} F^{-1}(q)
+
+            ES_{t+1} = -\mu_{t+1} - \sigma_{t+1} E[Z|Z < F^{-1}(q)]
+
+        where the tail mean is available in closed-form for the Normal,
+        Student's t, skewed Student's t and GED.  Other distributions
+        compute the tail mean by simulation.  Simulation-based forecasts use
+        the quantiles and tail averages of the simulated cumulative returns.
+        """
+        if params is None:
+            params = self._params
+        params = np.asarray(params)
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if np.any(q <= 0) or np.any(q >= 1):
+            raise ValueError('q must be strictly between 0 and 1')
+        if method is None:
+            method = 'analytic' if horizon == 1 else 'simulation'
+        method = method.lower()
+        if method == 'analytic':
+            if horizon != 1:
+                raise ValueError('analytic VaR and ES are only available when horizon is 1')
+            forecasts = self.forecast(params, 1, start)
+            mean = forecasts.mean.values[:, :1]
+            vol = np.sqrt(forecasts.variance.values[:, :1])
+            dist_params = self.model._parse_parameters(params)[2]
+            dist = self.model.distribution
+            quantiles = dist.ppf(q, dist_params)
+            tail_means = dist.tail_mean(q, dist_params)
+            value_at_risk = -mean - vol * quantiles[None, :]
+            expected_shortfall = -mean - vol * tail_means[None, :]
+            return value_at_risk, expected_shortfall
+
+        forecasts = self.forecast(params, horizon, start, method=method,
+                                  simulations=simulations, random_state=random_state,
+                                  aggregate=True)
+        paths = np.sort(forecasts.simulations.values[:, :, -1], axis=1)
+        value_at_risk = -np.percentile(paths, 100 * q, axis=1).T
+        count = np.maximum(np.ceil(q * simulations).astype(np.int64), 1)
+        expected_shortfall = -np.cumsum(paths, axis=1)[:, count - 1] / count
+        return value_at_risk, expected_shortfall
 
     def hedgehog_plot(self, params=None, horizon=10, step=10, start=None,
                       type='volatility', method='analytic', simulations=1000):
@@ -1619,6 +2090,30 @@ class ARCHModelForecastSimulation(object):
     def residual_variances(self):
         return self._residual_variances
 
+    def quantiles(self, q):
+        """
+        Quantiles of the simulated values
+
+        Parameters
+        ----------
+        q : {float, array_like}
+            Quantile or sequence of quantiles to compute, each in (0, 1)
+
+        Returns
+        -------
+        quantiles : ndarray
+            nobs by horizon array if q is a scalar, otherwise an array with
+            shape (len(q), nobs, horizon) containing the quantiles of the
+            simulated values for each origin and horizon
+        """
+        if self._values is None:
+            raise ValueError('quantiles are only available for simulation or bootstrap '
+                             'forecasts')
+        q = np.asarray(q)
+        if np.any(q <= 0) or np.any(q >= 1):
+            raise ValueError('q must be strictly between 0 and 1')
+        return np.percentile(self._values, 100 * q, axis=1)
+
 
 class ARCHModelForecast(object):
     """
@@ -1681,3 +2176,90 @@ class ARCHModelForecast(object):
         Detailed simulation results if using a simulation-based method
         """
         return self._sim
+
+
+class ARCHModelMultiSeriesResult(object):
+    """
+    Estimates from fitting the same model to many series at once
+
+    Parameters
+    ----------
+    params : ndarray
+        nseries by k array of estimated parameters
+    param_cov : ndarray
+        nseries by k by k array of estimated parameter covariances
+    resid : ndarray
+        nobs by nseries array of residuals, which are nan in locations not
+        used in estimation
+    volatility : ndarray
+        nobs by nseries array of conditional volatilities
+    loglikelihood : ndarray
+        nseries element array of log-likelihoods
+    names : list (str)
+        Model parameter names
+    cov_type : {str, None}
+        Name of the covariance estimator, or None if the model has no
+        parameters
+
+    Attributes
+    ----------
+    params : ndarray
+        nseries by k array of estimated parameters
+    param_cov : ndarray
+        nseries by k by k array of estimated parameter covariances
+    std_err : ndarray
+        nseries by k array of parameter standard errors
+    resid : ndarray
+        nobs by nseries array of residuals
+    conditional_volatility : ndarray
+        nobs by nseries array of conditional volatilities
+    loglikelihood : ndarray
+        nseries element array of log-likelihoods
+    names : list (str)
+        Model parameter names
+    cov_type : {str, None}
+        Name of the covariance estimator, or None if the model has no
+        parameters
+    """
+
+    def __init__(self, params, param_cov, resid, volatility, loglikelihood,
+                 names, cov_type):
+        self._params = params
+        self._param_cov = param_cov
+        self._resid = resid
+        self._volatility = volatility
+        self._loglikelihood = loglikelihood
+        self._names = names
+        self._cov_type = cov_type
+
+    @property
+    def params(self):
+        return self._params
+
+    @property
+    def param_cov(self):
+        return self._param_cov
+
+    @property
+    def std_err(self):
+        return np.sqrt(np.diagonal(self._param_cov, axis1=1, axis2=2))
+
+    @property
+    def resid(self):
+        return self._resid
+
+    @property
+    def conditional_volatility(self):
+        return self._volatility
+
+    @property
+    def loglikelihood(self):
+        return self._loglikelihood
+
+    @property
+    def names(self):
+        return self._names
+
+    @property
+    def cov_type(self):
+        return self._cov_type
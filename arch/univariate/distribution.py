@@ -6,19 +6,36 @@ Distributions to use in ARCH models.  All distributions must inherit from
 from __future__ import absolute_import, division
 
 from abc import abstractmethod
+import copy
 
 import scipy.stats as stats
 from numpy import (empty, array, sqrt, log, exp, sign, pi, sum, asarray,
-                   ones_like, abs, isscalar)
-from numpy.random import RandomState
-from scipy.special import gammaln, gamma
+                   ones_like, abs, isscalar, ceil, cumsum, maximum, sort, where, concatenate,
+                   arcsinh, sinh, cosh, log1p, square)
+from numpy.polynomial.legendre import leggauss
+from scipy.special import gammaln, gamma, gammaincc
 
 from arch.compat.python import add_metaclass
+from arch.univariate.quantile import (TABLE_MIN_SIZE, generalized_error_cdf,
+                                      generalized_error_ppf, students_t_cdf, students_t_ppf)
 from arch.utility.array import AbstractDocStringInheritor
+from arch.utility.cache import ArrayCache
+from arch.utility.rng import (check_random_state, indexed_generator, is_seed_sequence,
+                              randint, random_sample)
 
 __all__ = ['Distribution', 'Normal', 'StudentsT', 'SkewStudent',
            'GeneralizedError']
 
+# Bytes used to memoize the constants computed from the shape parameters
+CONSTANT_CACHE_BYTES = 2 ** 12
+
+
+def _t_partial_moment(x, nu):
+    """
+    First lower partial moment of a Student's t, int_{-inf}^{x} t f(t) dt
+    """
+    return -(nu + x ** 2) / (nu - 1) * stats.t.pdf(x, nu)
+
 
 @add_metaclass(AbstractDocStringInheritor)
 class Distribution(object):
@@ -30,11 +47,8 @@ class Distribution(object):
         self.name = name
         self.num_params = 0
         self._parameters = None
-        self._random_state = random_state
-        if random_state is None:
-            self._random_state = RandomState()
-        if not isinstance(self._random_state, RandomState):
-            raise TypeError('random_state must by a NumPy RandomState instance')
+        self._random_state = check_random_state(random_state)
+        self._constants = ArrayCache(CONSTANT_CACHE_BYTES)
 
     def _check_constraints(self, params):
         bounds = self.bounds(None)
@@ -49,11 +63,116 @@ class Distribution(object):
                 raise ValueError('{0} does not satisfy the bounds requirement '
                                  'of ({1}, {2})'.format(n, *b))
 
+    def _shape_constants(self, parameters):
+        """
+        Constants that only depend on the shape parameters
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Distribution parameters
+
+        Returns
+        -------
+        constants : ndarray
+            Constants used when evaluating the distribution
+
+        Notes
+        -----
+        Values are memoized by parameter value so that they are computed once
+        when the likelihood is repeatedly evaluated at the same shape
+        parameters, for example, when computing numerical derivatives with
+        respect to the parameters of the mean or volatility.
+        """
+        key = tuple(asarray(parameters, dtype=float).ravel().tolist())
+        constants = self._constants.get(key)
+        if constants is None:
+            constants = self._compute_constants(array(key))
+            self._constants.put(key, constants)
+        return constants
+
+    def _compute_constants(self, parameters):
+        """
+        Compute the constants returned by _shape_constants
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Distribution parameters
+
+        Returns
+        -------
+        constants : ndarray
+            Constants used when evaluating the distribution
+        """
+        return empty(0)
+
+    def _has_exponential_moments(self, parameters):
+        """
+        Whether E[exp(a abs(Z))] is finite for all a > 0
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Distribution parameters
+
+        Returns
+        -------
+        finite : bool
+            True if the exponential moments of abs(Z) exist
+
+        Notes
+        -----
+        Distributions are assumed to have heavy tails unless they override
+        this method.
+        """
+        return False
+
     @property
     def random_state(self):
-        """The NumPy RandomState attached to the distribution"""
+        """The NumPy RandomState or Generator attached to the distribution"""
         return self._random_state
 
+    def _stream_simulator(self, parameters, random_state, start):
+        """
+        Simulator that draws from a specific random state
+
+        Parameters
+        ----------
+        parameters : {ndarray, None}
+            Distribution parameters
+        random_state : {None, RandomState, Generator, SeedSequence}
+            Source of randomness. If None, the distribution's random state is
+            used. If a SeedSequence, an independent stream is used for each
+            origin.
+        start : int
+            Index of the first origin
+
+        Returns
+        -------
+        simulator : callable
+            Callable that produces random values using the syntax
+            ``simulator(size)``.  When random_state is a SeedSequence, call
+            ``i`` uses the stream with index ``start + i`` so that the draws
+            for an origin do not depend on the first origin forecast.
+        """
+        if random_state is None:
+            return self.simulate(parameters)
+        dist = copy.copy(self)
+        if not is_seed_sequence(random_state):
+            dist._random_state = check_random_state(random_state)
+            return dist.simulate(parameters)
+
+        simulator = dist.simulate(parameters)
+        index = [start]
+
+        def _simulator(size):
+            dist._random_state = indexed_generator(random_state, index[0])
+            index[0] += 1
+            return simulator(size)
+
+        return _simulator
+
     @abstractmethod
     def _simulator(self, size):
         """
@@ -216,6 +335,72 @@ class Distribution(object):
         """
         pass
 
+    def tail_mean(self, q, parameters=None):
+        """
+        Mean of the distribution below a quantile
+
+        Parameters
+        ----------
+        q : {float, ndarray}
+            Probabilities of the lower tail, each in (0, 1)
+        parameters : ndarray, optional
+            Distribution parameters.
+
+        Returns
+        -------
+        m : {float, ndarray}
+            Conditional means E[Z | Z <= F^{-1}(q)], which are the expected
+            shortfalls of the standardized distribution expressed as returns
+
+        Notes
+        -----
+        The default implementation uses 100,000 simulated values from the
+        distribution.  Distributions with closed-form tail means override it.
+        """
+        self._check_constraints(parameters)
+        nsim = 100000
+        draws = sort(self.simulate(parameters)(nsim))
+        k = maximum(ceil(asarray(q) * nsim).astype(int), 1)
+        return cumsum(draws)[k - 1] / k
+
+    def quadrature(self, parameters=None, points=32):
+        """
+        Quadrature rule for expectations over the standardized distribution
+
+        Parameters
+        ----------
+        parameters : ndarray, optional
+            Distribution parameters.
+        points : int, optional
+            Number of nodes on each side of 0. Default is 32.
+
+        Returns
+        -------
+        nodes : ndarray
+            Values of the standardized shock
+        weights : ndarray
+            Weights that sum to 1 so that E[f(Z)] is approximately
+            ``weights.dot(f(nodes))``
+
+        Notes
+        -----
+        Gauss-Legendre rules are applied to the density after the change of
+        variables Z = sinh(S), which shortens heavy tails, on
+        [F^{-1}(1e-12), 0] and on [0, F^{-1}(1 - 1e-12)].  Splitting at 0
+        allows functions of abs(Z), which are not smooth at 0, to be
+        integrated accurately.  The rule only covers this range, and so it
+        returns a finite value for expectations that do not exist, for
+        example E[exp(a abs(Z))] when Z has a Student's t distribution.
+        """
+        self._check_constraints(parameters)
+        x, w = leggauss(points)
+        lower, upper = arcsinh(self.ppf(array([1e-12, 1 - 1e-12]), parameters))
+        s = concatenate(((x + 1) / 2 * lower, (x + 1) / 2 * upper))
+        nodes = sinh(s)
+        weights = concatenate((-lower / 2 * w, upper / 2 * w)) * cosh(s)
+        weights *= exp(self.loglikelihood(parameters, nodes, ones_like(nodes), individual=True))
+        return nodes, weights / weights.sum()
+
     def __str__(self):
         return self._description()
 
@@ -273,7 +458,11 @@ class Normal(Distribution):
             +\frac{x^{2}}{\sigma^{2}}\right)
 
         """
-        lls = -0.5 * (log(2 * pi) + log(sigma2) + resids ** 2.0 / sigma2)
+        lls = square(resids)
+        lls /= sigma2
+        lls += log(sigma2)
+        lls += log(2 * pi)
+        lls *= -0.5
         if individual:
             return lls
         else:
@@ -282,6 +471,9 @@ class Normal(Distribution):
     def starting_values(self, std_resid):
         return empty(0)
 
+    def _has_exponential_moments(self, parameters):
+        return True
+
     def _simulator(self, size):
         return self._random_state.standard_normal(size)
 
@@ -299,6 +491,11 @@ class Normal(Distribution):
         self._check_constraints(parameters)
         return stats.norm.ppf(pits)
 
+    def tail_mean(self, q, parameters=None):
+        self._check_constraints(parameters)
+        q = asarray(q)
+        return -stats.norm.pdf(stats.norm.ppf(q)) / q
+
 
 class StudentsT(Distribution):
     """
@@ -352,10 +549,16 @@ class StudentsT(Distribution):
         where :math:`\Gamma` is the gamma function.
         """
         nu = parameters[0]
-        lls = gammaln((nu + 1) / 2) - gammaln(nu / 2) - log(pi * (nu - 2)) / 2
-        lls -= 0.5 * (log(sigma2))
-        lls -= ((nu + 1) / 2) * \
-               (log(1 + (resids ** 2.0) / (sigma2 * (nu - 2))))
+        const = self._shape_constants(parameters)[0]
+        lls = square(resids)
+        lls /= sigma2
+        lls /= nu - 2
+        log1p(lls, out=lls)
+        lls *= -(nu + 1) / 2
+        half_log_sigma2 = log(sigma2)
+        half_log_sigma2 *= 0.5
+        lls -= half_log_sigma2
+        lls += const
 
         if individual:
             return lls
@@ -399,17 +602,28 @@ class StudentsT(Distribution):
     def parameter_names(self):
         return ['nu']
 
+    def _compute_constants(self, parameters):
+        nu = parameters[0]
+        return array([gammaln((nu + 1) / 2) - gammaln(nu / 2) - log(pi * (nu - 2)) / 2])
+
     def cdf(self, resids, parameters=None):
         self._check_constraints(parameters)
         nu = parameters[0]
         var = nu / (nu - 2)
-        return stats.t(nu, scale=1.0 / sqrt(var)).cdf(resids)
+        return students_t_cdf(asarray(resids) * sqrt(var), nu)
 
     def ppf(self, pits, parameters=None):
         self._check_constraints(parameters)
         nu = parameters[0]
         var = nu / (nu - 2)
-        return stats.t(nu, scale=1.0 / sqrt(var)).ppf(pits)
+        return students_t_ppf(pits, nu) / sqrt(var)
+
+    def tail_mean(self, q, parameters=None):
+        self._check_constraints(parameters)
+        nu = parameters[0]
+        q = asarray(q)
+        scale = sqrt((nu - 2) / nu)
+        return scale * _t_partial_moment(students_t_ppf(q, nu), nu) / q
 
 
 class SkewStudent(Distribution):
@@ -492,18 +706,26 @@ class SkewStudent(Distribution):
         and :math:`\Gamma` is the gamma function.
         """
         eta, lam = parameters
+        const_a, const_b, const_c = self._shape_constants(parameters)
 
-        const_c = self.__const_c(parameters)
-        const_a = self.__const_a(parameters)
-        const_b = self.__const_b(parameters)
-
-        resids = resids / sigma2 ** .5
-        lls = log(const_b) + const_c - log(sigma2) / 2
         if abs(lam) >= 1.0:
             lam = sign(lam) * (1.0 - 1e-6)
-        llf_resid = ((const_b * resids + const_a) /
-                     (1 + sign(resids + const_a / const_b) * lam)) ** 2
-        lls -= (eta + 1) / 2 * log(1 + llf_resid / (eta - 2))
+        lls = asarray(resids / sqrt(sigma2))
+        scale = lls + const_a / const_b
+        sign(scale, out=scale)
+        scale *= lam
+        scale += 1
+        lls *= const_b
+        lls += const_a
+        lls /= scale
+        square(lls, out=lls)
+        lls /= eta - 2
+        log1p(lls, out=lls)
+        lls *= -(eta + 1) / 2
+        half_log_sigma2 = log(sigma2, out=scale)
+        half_log_sigma2 *= 0.5
+        lls -= half_log_sigma2
+        lls += log(const_b) + const_c
 
         if individual:
             return lls
@@ -533,8 +755,17 @@ class SkewStudent(Distribution):
         return array([sv, 0.])
 
     def _simulator(self, size):
-        # No need to normalize since it is already done in parameterization
-        return self.ppf(stats.uniform.rvs(size=size), self._parameters[0])
+        # Two-piece representation: the absolute value of a t random variable
+        # is scaled by 1 - lambda below the mode and by 1 + lambda above
+        eta, lam = self._parameters[0]
+        a, b, _ = self._shape_constants(self._parameters[0])
+        draws = self._random_state.standard_t(eta, size=size)
+        abs(draws, out=draws)
+        lower = random_sample(self._random_state, size) < (1 - lam) / 2
+        draws *= where(lower, lam - 1, 1 + lam)
+        draws *= sqrt((eta - 2) / eta) / b
+        draws -= a / b
+        return draws
 
     def simulate(self, parameters):
         parameters = asarray(parameters)[None]
@@ -549,6 +780,10 @@ class SkewStudent(Distribution):
     def parameter_names(self):
         return ['nu', 'lambda']
 
+    def _compute_constants(self, parameters):
+        return array([self.__const_a(parameters), self.__const_b(parameters),
+                      self.__const_c(parameters)])
+
     def __const_a(self, parameters):
         """Compute a constant.
 
@@ -609,16 +844,13 @@ class SkewStudent(Distribution):
             resids = array([resids])
 
         eta, lam = parameters
-
-        a = self.__const_a(parameters)
-        b = self.__const_b(parameters)
+        a, b, _ = self._shape_constants(parameters)
 
         var = eta / (eta - 2)
         y1 = (b * resids + a) / (1 - lam) * sqrt(var)
         y2 = (b * resids + a) / (1 + lam) * sqrt(var)
-        tcdf = stats.t(eta).cdf
-        p = (1 - lam) * tcdf(y1) * (resids < (-a / b))
-        p += (resids >= (-a / b)) * ((1 - lam) / 2 + (1 + lam) * (tcdf(y2) - 0.5))
+        p = (1 - lam) * students_t_cdf(y1, eta) * (resids < (-a / b))
+        p += (resids >= (-a / b)) * ((1 - lam) / 2 + (1 + lam) * (students_t_cdf(y2, eta) - 0.5))
         if scalar:
             p = p[0]
         return p
@@ -629,14 +861,13 @@ class SkewStudent(Distribution):
         if scalar:
             pits = array([pits])
         eta, lam = parameters
-
-        a = self.__const_a(parameters)
-        b = self.__const_b(parameters)
+        use_table = pits.size >= TABLE_MIN_SIZE
+        a, b, _ = self._shape_constants(parameters)
 
         cond = pits < (1 - lam) / 2
 
-        icdf1 = stats.t.ppf(pits[cond] / (1 - lam), eta)
-        icdf2 = stats.t.ppf(.5 + (pits[~cond] - (1 - lam) / 2) / (1 + lam), eta)
+        icdf1 = students_t_ppf(pits[cond] / (1 - lam), eta, use_table)
+        icdf2 = students_t_ppf(.5 + (pits[~cond] - (1 - lam) / 2) / (1 + lam), eta, use_table)
         icdf = -999.99 * ones_like(pits)
         icdf[cond] = icdf1
         icdf[~cond] = icdf2
@@ -649,6 +880,25 @@ class SkewStudent(Distribution):
             icdf = icdf[0]
         return icdf
 
+    def tail_mean(self, q, parameters=None):
+        self._check_constraints(parameters)
+        eta, lam = parameters
+        q = asarray(q)
+        a, b, _ = self._shape_constants(parameters)
+        scale = sqrt((eta - 2) / eta)
+
+        # Regions below and above the mode -a/b use different scales
+        lower = q < (1 - lam) / 2
+        p_lower = where(lower, q / (1 - lam), 0.5)
+        t_lower = students_t_ppf(p_lower, eta)
+        partial_lower = (1 - lam) * scale * _t_partial_moment(t_lower, eta) - a * p_lower
+        partial_lower *= (1 - lam) / b
+        p_upper = where(lower, 0.5, 0.5 + (q - (1 - lam) / 2) / (1 + lam))
+        t_upper = students_t_ppf(p_upper, eta)
+        partial_upper = (1 + lam) * scale * _t_partial_moment(t_upper, eta) + a * (1 - p_upper)
+        partial_upper *= (1 + lam) / b
+        return where(lower, partial_lower, partial_upper) / q
+
 
 class GeneralizedError(Distribution):
     """
@@ -705,11 +955,16 @@ class GeneralizedError(Distribution):
             -\ln\Gamma(\frac{3}{\nu})\right).
         """
         nu = parameters[0]
-        log_c = 0.5 * (-2 / nu * log(2) + gammaln(1 / nu) - gammaln(3 / nu))
-        c = exp(log_c)
-        lls = log(nu) - log_c - gammaln(1 / nu) - (1 + 1 / nu) * log(2)
-        lls -= 0.5 * log(sigma2)
-        lls -= 0.5 * abs(resids / (sqrt(sigma2) * c)) ** nu
+        const, c, _ = self._shape_constants(parameters)
+        lls = asarray(resids / sqrt(sigma2))
+        abs(lls, out=lls)
+        lls /= c
+        lls **= nu
+        lls *= -0.5
+        half_log_sigma2 = log(sigma2)
+        half_log_sigma2 *= 0.5
+        lls -= half_log_sigma2
+        lls += const
 
         if individual:
             return lls
@@ -738,11 +993,13 @@ class GeneralizedError(Distribution):
     def _simulator(self, size):
         parameters = self._parameters
         nu = parameters[0]
-        randoms = self._random_state.standard_gamma(1 / nu, size) ** (1.0 / nu)
-        randoms *= 2 * self._random_state.randint(0, 2, size) - 1
-        scale = sqrt(gamma(3.0 / nu) / gamma(1.0 / nu))
+        scale = self._shape_constants(parameters)[2]
+        randoms = self._random_state.standard_gamma(1 / nu, size)
+        randoms **= 1.0 / nu
+        randoms *= 2 * randint(self._random_state, 0, 2, size) - 1
+        randoms /= scale
 
-        return randoms / scale
+        return randoms
 
     def simulate(self, parameters):
         parameters = asarray(parameters)[None]
@@ -754,14 +1011,36 @@ class GeneralizedError(Distribution):
     def parameter_names(self):
         return ['nu']
 
+    def _has_exponential_moments(self, parameters):
+        # The tails decay like exp(-abs(z) ** nu), and so E[exp(a abs(Z))] is
+        # infinite for large a when nu is 1
+        return parameters[0] > 1.0
+
+    def _compute_constants(self, parameters):
+        nu = parameters[0]
+        log_c = 0.5 * (-2 / nu * log(2) + gammaln(1 / nu) - gammaln(3 / nu))
+        const = log(nu) - log_c - gammaln(1 / nu) - (1 + 1 / nu) * log(2)
+        scale = exp(0.5 * (gammaln(3 / nu) - gammaln(1 / nu)))
+        return array([const, exp(log_c), scale])
+
     def ppf(self, pits, parameters=None):
         self._check_constraints(parameters)
         nu = parameters[0]
-        var = stats.gennorm(nu).var()
-        return stats.gennorm(nu, scale=1.0 / sqrt(var)).ppf(pits)
+        var = gamma(3.0 / nu) / gamma(1.0 / nu)
+        return generalized_error_ppf(pits, nu) / sqrt(var)
+
+    def tail_mean(self, q, parameters=None):
+        self._check_constraints(parameters)
+        nu = parameters[0]
+        q = asarray(q)
+        scale = sqrt(gamma(1.0 / nu) / gamma(3.0 / nu))
+        x = abs(scale * generalized_error_ppf(q, nu))
+        partial = scale * gamma(2.0 / nu) / (2 * gamma(1.0 / nu))
+        partial *= gammaincc(2.0 / nu, (x / scale) ** nu)
+        return -partial / q
 
     def cdf(self, resids, parameters=None):
         self._check_constraints(parameters)
         nu = parameters[0]
-        var = stats.gennorm(nu).var()
-        return stats.gennorm(nu, scale=1.0 / sqrt(var)).cdf(resids)
+        var = gamma(3.0 / nu) / gamma(1.0 / nu)
+        return generalized_error_cdf(asarray(resids) * sqrt(var), nu)
@@ -0,0 +1,201 @@
+"""
+Filters used to evaluate volatility processes that are linear in lagged squared
+residuals without a recursion
+"""
+from __future__ import absolute_import, division
+
+import numpy as np
+from scipy.fftpack import next_fast_len
+from scipy.signal import lfilter
+
+from arch.compat.python import range
+
+__all__ = ['fir_filter', 'garch_filter', 'prefer_fft', 'bounds_check']
+
+# Relative cost of an FFT-based convolution to a direct convolution
+FFT_COST_FACTOR = 10.0
+
+
+def prefer_fft(m, nobs):
+    """
+    Whether an FFT is expected to be faster than a direct convolution
+
+    Parameters
+    ----------
+    m : int
+        Length of the filter
+    nobs : int
+        Length of the data filtered
+
+    Returns
+    -------
+    use_fft : bool
+        True if the FFT should be used
+    """
+    return m > FFT_COST_FACTOR * np.log2(nobs + m)
+
+
+def fir_filter(weights, x, initial=0.0, method='auto'):
+    r"""
+    Apply a finite impulse response filter to data with fixed initial values
+
+    Parameters
+    ----------
+    weights : ndarray
+        m-element array of filter weights, or m by k array containing k sets
+        of filter weights when x is 1-dimensional
+    x : ndarray
+        nobs-element array of data to filter, or nobs by k array where each
+        column is filtered
+    initial : {float, ndarray}, optional
+        Value of x in all periods before the first observation. If x is
+        2-dimensional, a k-element array can be used to set a value for each
+        column.
+    method : {'auto', 'direct', 'fft'}, optional
+        Method used to compute the convolution. 'auto' uses the FFT when the
+        filter is long relative to the data.
+
+    Returns
+    -------
+    y : ndarray
+        Filtered values with shape nobs or nobs by k
+
+    Notes
+    -----
+    The filtered values are
+
+    .. math::
+
+        y_t = \sum_{j=0}^{m-1} w_j x_{t-j}
+
+    where :math:`x_{t} =` initial when :math:`t<0`.  The direct method costs
+    O(nobs m) while the FFT costs O((nobs + m) log(nobs + m)).  Values
+    computed using the FFT have an absolute error that is proportional to
+    the largest value of x.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    if weights.ndim == 2 and x.ndim != 1:
+        raise ValueError('x must be 1-dimensional when weights is 2-dimensional')
+    method = method.lower()
+    if method not in ('auto', 'direct', 'fft'):
+        raise ValueError('method must be one of \'auto\', \'direct\' or \'fft\'')
+
+    m, nobs = weights.shape[0], x.shape[0]
+    padded = np.empty((m - 1 + nobs,) + x.shape[1:])
+    padded[:m - 1] = initial
+    padded[m - 1:] = x
+    if method == 'auto':
+        method = 'fft' if prefer_fft(m, nobs) else 'direct'
+
+    if method == 'direct':
+        if weights.ndim == 1:
+            return lfilter(weights, [1.0], padded, axis=0)[m - 1:]
+        out = np.empty((nobs, weights.shape[1]))
+        for i in range(weights.shape[1]):
+            out[:, i] = lfilter(weights[:, i], [1.0], padded)[m - 1:]
+        return out
+
+    nfft = next_fast_len(padded.shape[0] + m - 1)
+    fx = np.fft.rfft(padded, nfft, axis=0)
+    fw = np.fft.rfft(weights, nfft, axis=0)
+    if fx.ndim > fw.ndim:
+        fw = fw[:, None]
+    elif fw.ndim > fx.ndim:
+        fx = fx[:, None]
+    return np.fft.irfft(fx * fw, nfft, axis=0)[m - 1:m - 1 + nobs]
+
+
+def garch_filter(parameters, fresids, sresids, p, o, q, backcast):
+    """
+    GARCH recursion for many series without variance bounds
+
+    Parameters
+    ----------
+    parameters : ndarray
+        Model parameters ordered omega, alpha, gamma and beta
+    fresids : ndarray
+        nobs by k array of absolute residuals raised to the model power
+    sresids : ndarray
+        nobs by k array with the signs of the residuals
+    p : int
+        Number of symmetric innovations in model
+    o : int
+        Number of asymmetric innovations in model
+    q : int
+        Number of lags of the (transformed) variance in the model
+    backcast : ndarray
+        k-element array of values to use when initializing the recursion
+
+    Returns
+    -------
+    sigma2 : ndarray
+        nobs by k array of transformed conditional variances
+
+    Notes
+    -----
+    The recursion is evaluated as a linear filter of the residuals followed
+    by an autoregressive filter.  Values match the GARCH recursion only when
+    no conditional variance is outside of the variance bounds.
+    """
+    backcast = np.asarray(backcast, dtype=np.float64)
+    nobs = fresids.shape[0]
+    r = max(p, o, q)
+    b = np.zeros(r + 1)
+    b[1:p + 1] = parameters[1:p + 1]
+    a = np.zeros(r + 1)
+    a[0] = 1.0
+    a[1:q + 1] = -parameters[p + o + 1:p + o + q + 1]
+
+    # Initial states when all past residuals and variances equal backcast
+    tail = np.cumsum((b - a)[::-1])[::-1][1:]
+    sigma2 = lfilter(b, a, fresids, axis=0, zi=np.outer(tail, backcast))[0]
+    if o > 0:
+        b_neg = np.zeros(r + 1)
+        b_neg[1:o + 1] = parameters[p + 1:p + o + 1]
+        tail = np.cumsum(b_neg[::-1])[::-1][1:]
+        sigma2 += lfilter(b_neg, a, fresids * (sresids < 0), axis=0,
+                          zi=np.outer(tail, 0.5 * backcast))[0]
+    # Contribution of the intercept, which is common to all series
+    const = lfilter([1.0], a, np.full(nobs, float(parameters[0])))
+    sigma2 += const.reshape((nobs,) + (1,) * (sigma2.ndim - 1))
+
+    return sigma2
+
+
+def bounds_check(sigma2, var_bounds):
+    """
+    Apply variance bounds to an array of conditional variances
+
+    Parameters
+    ----------
+    sigma2 : ndarray
+        Conditional variances, modified in place
+    var_bounds : ndarray
+        Array with a final dimension of 2 containing the lower and upper
+        bounds for the conditional variances, either nobs by 2 or, when
+        sigma2 is nobs by k, nobs by k by 2
+
+    Returns
+    -------
+    sigma2 : ndarray
+        Conditional variances after applying the bounds
+
+    Notes
+    -----
+    Matches the treatment of variance bounds in the recursions. Values below
+    the lower bound are set to the bound and values above the upper bound
+    are dampened using the log of the ratio to the bound.
+    """
+    lower, upper = var_bounds[..., 0], var_bounds[..., 1]
+    low = sigma2 < lower
+    if np.any(low):
+        sigma2[low] = lower[low]
+    high = sigma2 > upper
+    if np.any(high):
+        with np.errstate(over='ignore'):
+            excess = upper[high] + np.log(sigma2[high] / upper[high])
+        infinite = np.isinf(sigma2[high])
+        excess[infinite] = upper[high][infinite] + 1000
+        sigma2[high] = excess
+    return sigma2
@@ -5,17 +5,22 @@ Mean models to use with ARCH processes.  All mean models must inherit from
 from __future__ import absolute_import, division
 
 import copy
+import mmap
 from collections import OrderedDict
 
 import numpy as np
-from pandas import DataFrame
+from pandas import DataFrame, Series
 from scipy.optimize import OptimizeResult
-from statsmodels.tsa.tsatools import lagmat
+from scipy.sparse import csr_matrix, issparse
+from scipy.linalg import cho_factor, cho_solve, toeplitz
+from scipy.signal import lfilter, lfiltic
 
+from arch.compat.pandas import is_sparse
 from arch.compat.python import range, iteritems
-from arch.univariate.base import ARCHModel, implicit_constant, ARCHModelResult, ARCHModelForecast
+from arch.univariate.base import ARCHModel, ARCHModelResult, ARCHModelForecast, \
+    ARCHModelMultiSeriesResult
 from arch.univariate.distribution import Normal, StudentsT, SkewStudent, GeneralizedError
-from arch.univariate.volatility import ARCH, GARCH, HARCH, ConstantVariance, EGARCH
+from arch.univariate.volatility import ARCH, GARCH, HARCH, ConstantVariance, EGARCH, FIGARCH
 from arch.utility.array import ensure1d, parse_dataframe, cutoff_to_index
 from arch.vendor.cached_property import cached_property
 
@@ -26,6 +31,9 @@ COV_TYPES = {'white': 'White\'s Heteroskedasticity Consistent Estimator',
              'robust': 'Bollerslev-Wooldridge (Robust) Estimator',
              'mle': 'ML Estimator'}
 
+# Memory used by temporary copies of rows of regressors
+REGRESSOR_CHUNK_BYTES = 2 ** 24
+
 
 def _forecast_pad(count, forecasts):
     shape = list(forecasts.shape)
@@ -70,6 +78,179 @@ def _ar_forecast(y, horizon, start_index, constant, arp, exogp=None, x=None):
     return fcasts
 
 
+def _har_regressors(y, lags):
+    """
+    HAR regressors computed from a cumulative sum
+
+    Parameters
+    ----------
+    y : ndarray
+        nobs element array of data, or nobs by m array where each column is
+        a series
+    lags : ndarray
+        2 by k array where column i contains the start and the end of the
+        (half-open) range of lag indices averaged in component i
+
+    Returns
+    -------
+    regressors : ndarray
+        nobs by k array where column i in row t contains the mean of
+        y[t - lags[1, i]:t - lags[0, i]] and values before the first
+        observation are 0.  If y is 2-dimensional, the array is nobs by k by
+        m and contains the means of each column.
+
+    Notes
+    -----
+    Uses O(nobs k) time and memory.  The data are demeaned before computing
+    the cumulative sum to limit the loss of precision in the differences.
+    """
+    nobs = y.shape[0]
+    mu = y.mean(0) if nobs > 0 else np.zeros(y.shape[1:])
+    csum = np.zeros((nobs + 1,) + y.shape[1:])
+    np.cumsum(y - mu, axis=0, out=csum[1:])
+    loc = np.arange(nobs)
+    regressors = np.empty((nobs, lags.shape[1]) + y.shape[1:])
+    trailing = (1,) * (y.ndim - 1)
+    for i, (start, end) in enumerate(lags.T):
+        lower = np.maximum(loc - end, 0)
+        upper = np.maximum(loc - start, 0)
+        count = (upper - lower).reshape((nobs,) + trailing)
+        regressors[:, i] = csum[upper] - csum[lower] + mu * count
+        regressors[:, i] /= end - start
+    return regressors
+
+
+def _realized_regressors(realized, lags):
+    """
+    HAR regressors of realized measures
+
+    Parameters
+    ----------
+    realized : ndarray
+        nobs by m array of realized measures
+    lags : ndarray
+        2 by k array of HAR lags
+
+    Returns
+    -------
+    regressors : ndarray
+        nobs by m k array containing the k HAR averages of the first measure,
+        followed by the averages of the second measure, and so on
+    """
+    nobs, m = realized.shape
+    regressors = _har_regressors(realized, lags)
+    return regressors.transpose(0, 2, 1).reshape((nobs, m * lags.shape[1]))
+
+
+def _realized_variable_names(names, lags):
+    """Names of the HAR averages of realized measures"""
+    return [name + '[' + str(lag[0]) + ':' + str(lag[1]) + ']'
+            for name in names for lag in lags.T]
+
+
+def _har_forecast(y, horizon, start_index, constant, params, lags):
+    """
+    Generate mean forecasts from a HAR model using cumulative sums
+
+    Parameters
+    ----------
+    y : ndarray
+        Data used to produce the forecasts
+    horizon : int
+        Forecast horizon
+    start_index : int
+        Index of the first origin
+    constant : float
+        Model constant
+    params : ndarray
+        k element array of HAR coefficients
+    lags : ndarray
+        2 by k array where column i contains the start and the end of the
+        (half-open) range of lag indices averaged in component i
+
+    Returns
+    -------
+    forecasts : ndarray
+        nobs by horizon array of forecasts where rows before start_index are
+        NaN
+
+    Notes
+    -----
+    Each component average is the sum of the observed values, computed from
+    a cumulative sum of y, and the forecasts already produced, computed from
+    a cumulative sum of the forecasts across horizons.  This avoids
+    constructing an array with a column for every lag, and so uses
+    O(nobs (horizon + k)) memory.  Values before the first observation are 0.
+    """
+    t = y.shape[0]
+    fcasts = np.full((t, horizon), np.nan)
+    origins = np.arange(start_index, t)
+    mu = y.mean() if t > 0 else 0.0
+    csum = np.zeros(t + 1)
+    np.cumsum(y - mu, out=csum[1:])
+    # Sums of the first h forecasts from each origin
+    fsum = np.zeros((t - start_index, horizon + 1))
+    for h in range(horizon):
+        fcast = np.full(t - start_index, constant)
+        for param, (start, end) in zip(params, lags.T):
+            # Observed values in y[i + h + 1 - end:i + h + 1 - start]
+            lower = np.clip(origins + h + 1 - end, 0, origins + 1)
+            upper = np.clip(origins + h + 1 - start, 0, origins + 1)
+            total = csum[upper] - csum[lower] + mu * (upper - lower)
+            # Forecasts for steps in [h - end, h - start)
+            total += fsum[:, max(h - start, 0)] - fsum[:, max(h - end, 0)]
+            fcast += param / (end - start) * total
+        fcasts[start_index:, h] = fcast
+        fsum[:, h + 1] = fsum[:, h] + fcast
+    return fcasts
+
+
+def _ar_forecast_paths(y, start_index, constant, arp, shocks):
+    """
+    Simulated forecast paths from an AR model for all origins
+
+    Parameters
+    ----------
+    y : ndarray
+        Data used to initialize the recursion
+    start_index : int
+        Index of the first origin
+    constant : float
+        Model constant
+    arp : ndarray
+        AR parameters ordered by lag
+    shocks : ndarray
+        Simulated residuals with shape (t - start_index, simulations, horizon)
+
+    Returns
+    -------
+    paths : ndarray
+        Simulated paths with the same shape as shocks
+
+    Notes
+    -----
+    The recursion is computed as a linear filter along the horizon axis
+    where the initial conditions for each origin are constructed from the
+    most recent values of y.
+    """
+    p = arp.shape[0]
+    paths = constant + shocks
+    if p == 0:
+        return paths
+    t = y.shape[0]
+    y_lags = np.empty((t - start_index, p))
+    for j in range(p):
+        y_lags[:, j] = y[start_index - j:t - j]
+    # Initial conditions of the transposed direct form II filter
+    zi_loadings = np.zeros((p, p))
+    for j in range(p):
+        zi_loadings[j, :p - j] = arp[j:]
+    zi = y_lags.dot(zi_loadings)[:, None, :]
+    zi = np.broadcast_to(zi, paths.shape[:2] + (p,))
+    a = np.concatenate(([1.0], -arp))
+    return lfilter([1.0], a, paths, axis=-1, zi=zi)[0]
+
+
 def _ar_to_impulse(steps, params):
     p = params.shape[0]
     impulse = np.zeros(steps)
@@ -85,6 +266,254 @@ def _ar_to_impulse(steps, params):
     return impulse
 
 
+def _impulse_variance(impulse, variances):
+    """
+    Variance of multi-step forecast errors from the variances of the shocks
+
+    Parameters
+    ----------
+    impulse : ndarray
+        horizon-element array containing the impulse response of the mean
+    variances : ndarray
+        Array with horizon as the last dimension containing the variance of
+        the shock in each future period
+
+    Returns
+    -------
+    total : ndarray
+        Array with the same shape as variances where element h is
+        sum(impulse[j] ** 2 * variances[..., h - j] for j in range(h + 1))
+
+    Notes
+    -----
+    Computed as a product with an upper triangular Toeplitz matrix since
+    short finite impulse response filters along the last axis of a large
+    array are slow when using lfilter.
+    """
+    horizon = impulse.shape[0]
+    first_col = np.zeros(horizon)
+    first_col[0] = impulse[0] ** 2
+    weights = toeplitz(first_col, impulse ** 2)
+    return variances.dot(weights)
+
+
+def _as_exog(x):
+    """
+    Exogenous regressors as a dense array or a sparse matrix
+
+    Parameters
+    ----------
+    x : {ndarray, DataFrame, sparse matrix}
+        Exogenous regressors
+
+    Returns
+    -------
+    exog : {ndarray, csr_matrix}
+        x in CSR format if x is a scipy sparse matrix or a DataFrame where
+        all columns are sparse, such as dummies from ``get_dummies`` with
+        ``sparse=True``. Otherwise x as an ndarray.
+    """
+    if issparse(x):
+        return x.tocsr()
+    if isinstance(x, DataFrame) and x.shape[1] > 0 and all(is_sparse(dt) for dt in x.dtypes):
+        coo = x.sparse.to_coo() if hasattr(x, 'sparse') else x.to_coo()
+        return csr_matrix(coo, dtype=np.float64)
+    return np.asarray(x)
+
+
+def _is_memory_mapped(value):
+    """Whether an array is backed by a memory-mapped file"""
+    while isinstance(value, np.ndarray):
+        if isinstance(value, np.memmap):
+            return True
+        value = value.base
+    return isinstance(value, mmap.mmap)
+
+
+class _RegressorBlocks(object):
+    """
+    Regressor matrix stored as blocks of columns
+
+    Parameters
+    ----------
+    blocks : list of {ndarray, csr_matrix}
+        2-d arrays or sparse matrices with the same number of rows that are
+        horizontally concatenated to form the regressors
+    start : int, optional
+        First row of the blocks included
+    stop : int, optional
+        Row after the last row of the blocks included
+
+    Notes
+    -----
+    Blocks are never concatenated except when the regressors are converted
+    to an array, and row slices refer to the original blocks.  Products that
+    require more than one block are computed over groups of rows that use at
+    most ``REGRESSOR_CHUNK_BYTES`` of memory, so that memory-mapped blocks are
+    not read into memory.  Sparse blocks remain sparse so that products
+    with a parameter vector scale with the number of non-zero values.
+    """
+
+    def __init__(self, blocks, start=0, stop=None):
+        self._blocks = [block for block in blocks if block.shape[1] > 0]
+        self._start = start
+        self._stop = blocks[0].shape[0] if stop is None else stop
+        self._ncols = int(sum(block.shape[1] for block in blocks))
+
+    @property
+    def shape(self):
+        """Number of rows and columns in the regressors"""
+        return max(self._stop - self._start, 0), self._ncols
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise IndexError('Regressor blocks only support slicing of rows')
+        start, stop, _ = key.indices(self.shape[0])
+        return _RegressorBlocks(self._blocks, self._start + start,
+                                self._start + max(stop, start))
+
+    def __array__(self, dtype=None):
+        nobs, ncols = self.shape
+        out = np.empty((nobs, ncols), dtype=np.float64 if dtype is None else dtype)
+        col = 0
+        for block in self._blocks:
+            values = block[self._start:self._stop]
+            if issparse(values):
+                values = values.toarray()
+            out[:, col:col + block.shape[1]] = values
+            col += block.shape[1]
+        return out
+
+    def chunks(self):
+        """
+        Iterate over groups of rows of the regressors
+
+        Yields
+        ------
+        first : int
+            Index of the first row in the group
+        values : ndarray
+            Regressors in the group of rows
+        """
+        nobs, ncols = self.shape
+        step = max(REGRESSOR_CHUNK_BYTES // (8 * max(ncols, 1)), 1)
+        for first in range(0, nobs, step):
+            last = min(first + step, nobs)
+            yield first, np.asarray(self[first:last])
+
+    def dot(self, params):
+        """
+        Product of the regressors and a parameter vector
+
+        Parameters
+        ----------
+        params : ndarray
+            Parameter vector with one element for each column
+
+        Returns
+        -------
+        product : ndarray
+            Regressors multiplied by params
+        """
+        params = np.asarray(params)
+        out = np.zeros(self.shape[0])
+        col = 0
+        for block in self._blocks:
+            width = block.shape[1]
+            out += block[self._start:self._stop].dot(params[col:col + width])
+            col += width
+        return out
+
+    def triangular(self, extra=None):
+        """
+        Upper triangular factor of a QR decomposition of the regressors
+
+        Parameters
+        ----------
+        extra : ndarray, optional
+            Array with the same number of rows as the regressors containing
+            columns appended to the regressors before decomposing
+
+        Returns
+        -------
+        r : ndarray
+            Triangular factor, computed by updating the factor one group of
+            rows at a time
+        """
+        r = None
+        for first, values in self.chunks():
+            if extra is not None:
+                values = np.hstack((values, extra[first:first + values.shape[0]]))
+            if r is not None:
+                values = np.vstack((r, values))
+            r = np.linalg.qr(values, mode='r')
+        return r
+
+    def weighted_gram(self, weights):
+        """
+        Weighted cross-product of the regressors
+
+        Parameters
+        ----------
+        weights : ndarray
+            Non-negative weight for each row
+
+        Returns
+        -------
+        gram : ndarray
+            The regressors transposed times the weights times the regressors
+        """
+        ncols = self.shape[1]
+        out = np.zeros((ncols, ncols))
+        root_weights = np.sqrt(weights)
+        for first, values in self.chunks():
+            # A symmetric product of the same array is faster to compute
+            weighted = values * root_weights[first:first + values.shape[0], None]
+            out += weighted.T.dot(weighted)
+        return out
+
+    def tdot(self, values):
+        """
+        Product of the transposed regressors and a vector
+
+        Parameters
+        ----------
+        values : ndarray
+            Array with one element for each row
+
+        Returns
+        -------
+        product : ndarray
+            The regressors transposed times values
+        """
+        values = np.asarray(values)
+        out = np.zeros(self.shape[1])
+        for first, chunk in self.chunks():
+            out += chunk.T.dot(values[first:first + chunk.shape[0]])
+        return out
+
+    def implicit_constant(self):
+        """
+        Test the regressors for an implicit constant
+
+        Returns
+        -------
+        constant : bool
+            Flag indicating whether the regressors have a set of columns that
+            adds to a constant value
+
+        See Also
+        --------
+        arch.univariate.base.implicit_constant
+        """
+        nobs, ncols = self.shape
+        r = self.triangular(np.ones((nobs, 1)))
+        # Same tolerance as matrix_rank applied to the regressors
+        sv = np.linalg.svd(r, compute_uv=False)
+        tol = sv.max() * max(nobs, ncols + 1) * np.finfo(sv.dtype).eps
+        return int(np.sum(sv > tol)) == ncols
+
+
 class HARX(ARCHModel):
     r"""
     Heterogeneous Autoregression (HAR), with optional exogenous regressors,
@@ -94,8 +523,9 @@ class HARX(ARCHModel):
     ----------
     y : {ndarray, Series}
         nobs element vector containing the dependent variable
-    x : {ndarray, DataFrame}, optional
-        nobs by k element array containing exogenous regressors
+    x : {ndarray, DataFrame, sparse matrix}, optional
+        nobs by k element array containing exogenous regressors.  Sparse
+        matrices and DataFrames with sparse columns are stored in CSR format.
     lags : {scalar, ndarray}, optional
         Description of lag structure of the HAR.  Scalar included all lags
         between 1 and the value.  A 1-d array includes the HAR lags 1:lags[0],
@@ -114,6 +544,13 @@ class HARX(ARCHModel):
         Volatility process to use in the model
     distribution : Distribution, optional
         Error distribution to use in the model
+    realized : {ndarray, Series, DataFrame}, optional
+        nobs element vector or nobs by m array of realized measures, such as
+        realized variances or their continuous and jump components.  HAR
+        averages of each measure are included as regressors.
+    realized_lags : {scalar, ndarray}, optional
+        HAR lags of the realized measures, in the same format as lags.  If not
+        provided, lags is used.
 
     Examples
     --------
@@ -123,6 +560,12 @@ class HARX(ARCHModel):
     >>> harx = HARX(y, lags=[1, 5, 22])
     >>> res = harx.fit()
 
+    A HAR model of returns using the daily, weekly and monthly averages of
+    a realized variance
+
+    >>> rv = np.exp(np.random.randn(100))
+    >>> harx = HARX(y, realized=rv, realized_lags=[1, 5, 22])
+
     >>> from pandas import Series, date_range
     >>> index = date_range('2000-01-01', freq='M', periods=y.shape[0])
     >>> y = Series(y, name='y', index=index)
@@ -138,12 +581,16 @@ class HARX(ARCHModel):
         + \gamma' x_t + \epsilon_t
 
     where :math:`\bar{y}_{t-L_{i,0}:L_{i,1}}` is the average value of
-    :math:`y_t` between :math:`t-L_{i,0}` and :math:`t - L_{i,1}`.
+    :math:`y_t` between :math:`t-L_{i,0}` and :math:`t - L_{i,1}`.  When
+    realized measures are included, their averages over the realized lags
+    enter the model in the same way, after the lags of y and before x.
+    Realized measures are converted to a float array without copying when
+    they are already contiguous float arrays.
     """
 
     def __init__(self, y=None, x=None, lags=None, constant=True,
                  use_rotated=False, hold_back=None, volatility=None,
-                 distribution=None):
+                 distribution=None, realized=None, realized_lags=None):
         super(HARX, self).__init__(y, hold_back=hold_back,
                                    volatility=volatility,
                                    distribution=distribution)
@@ -154,7 +601,11 @@ class HARX(ARCHModel):
         self._lags = None
         self.constant = constant
         self.use_rotated = use_rotated
-        self.regressors = None
+        self._regressors = None
+        self._realized = realized
+        self._realized_names = None
+        self.realized_lags = realized_lags
+        self._realized_lags = None
 
         self.name = 'HAR'
         if self._x is not None:
@@ -164,15 +615,22 @@ class HARX(ARCHModel):
         else:
             max_lags = 0
         self._max_lags = max_lags
+        min_hold_back = max_lags
+        if realized is not None:
+            rlags = lags if realized_lags is None else realized_lags
+            if rlags is None:
+                raise ValueError('realized_lags or lags must be provided when '
+                                 'using realized measures')
+            min_hold_back = max(max_lags, np.max(np.asarray(rlags, dtype=np.int32)))
 
-        self._hold_back = max_lags if hold_back is None else hold_back
+        self._hold_back = min_hold_back if hold_back is None else hold_back
 
-        if self._hold_back < max_lags:
+        if self._hold_back < min_hold_back:
             from warnings import warn
 
             warn('hold_back is less then the minimum number given the lags '
                  'selected', RuntimeWarning)
-            self._hold_back = max_lags
+            self._hold_back = min_hold_back
 
         self._init_model()
 
@@ -181,6 +639,37 @@ class HARX(ARCHModel):
         """Gets the value of the exogenous regressors in the model"""
         return self._x
 
+    @property
+    def realized(self):
+        """Gets the realized measures in the model"""
+        return self._realized
+
+    @property
+    def regressors(self):
+        """
+        Regressors in the model
+
+        Notes
+        -----
+        The regressors are stored as separate blocks and an array is
+        constructed each time this property is accessed
+        """
+        if self._regressors is None:
+            return None
+        return np.asarray(self._regressors)
+
+    def __deepcopy__(self, memo):
+        # Memory-mapped data are shared with the copy rather than read into memory
+        for value in (self._y, self._x):
+            if _is_memory_mapped(value):
+                memo[id(value)] = value
+        cls = self.__class__
+        copied = cls.__new__(cls)
+        memo[id(self)] = copied
+        for key, value in iteritems(self.__dict__):
+            setattr(copied, key, copy.deepcopy(value, memo))
+        return copied
+
     def parameter_names(self):
         return self._generate_variable_names()
 
@@ -251,10 +740,10 @@ class HARX(ARCHModel):
         """
         Returns the number of parameters
         """
-        return int(self.regressors.shape[1])
+        return int(self._regressors.shape[1])
 
     def simulate(self, params, nobs, burn=500, initial_value=None, x=None,
-                 initial_value_vol=None):
+                 initial_value_vol=None, repetitions=None, dtype=np.float64, block_size=1000):
         """
         Simulates data from a linear regression, AR or HAR models
 
@@ -275,18 +764,37 @@ class HARX(ARCHModel):
         initial_value : {ndarray, float}, optional
             Either a scalar value or `max(lags)` array set of initial values to
             use when initializing the model.  If omitted, 0.0 is used.
-        x : {ndarray, DataFrame}, optional
+        x : {ndarray, DataFrame, sparse matrix}, optional
             nobs + burn by k array of exogenous variables to include in the
             simulation.
         initial_value_vol : {ndarray, float}, optional
             An array or scalar to use when initializing the volatility process.
+        repetitions : int, optional
+            Number of independent paths to simulate.  If provided, the paths
+            are returned as arrays rather than a DataFrame.
+        dtype : dtype, optional
+            Data type of the arrays returned when repetitions is provided.
+            Default is float64.
+        block_size : int, optional
+            Number of paths generated at a time when repetitions is provided.
+            Smaller values reduce the memory used during the simulation.
 
         Returns
         -------
-        simulated_data : DataFrame
+        simulated_data : {DataFrame, dict}
             DataFrame with columns data containing the simulated values,
             volatility, containing the conditional volatility and errors
-            containing the errors used in the simulation
+            containing the errors used in the simulation.  If repetitions is
+            provided, a dictionary with the same keys containing repetitions
+            by nobs arrays.
+
+        Notes
+        -----
+        When repetitions is provided, the standardized shocks for each block
+        of paths are drawn in a single call with shape (block_size,
+        nobs + burn), and the volatility of all paths in the block is
+        simulated in one pass.  The paths have the same distribution as, but
+        are not identical to, paths produced by separate calls to simulate.
 
         Examples
         --------
@@ -308,6 +816,12 @@ class HARX(ARCHModel):
         >>> x_params = np.array([1.0, 2.0])
         >>> params = np.concatenate((harx_params, x_params, garch_params))
         >>> sim_data = harx.simulate(params, nobs=nobs, burn=burn, x=x)
+
+        Many independent paths can be simulated in a single call
+
+        >>> paths = harx.simulate(params, nobs=nobs, burn=burn, x=x, repetitions=1000)
+        >>> paths['data'].shape
+        (1000, 100)
         """
 
         k_x = 0
@@ -316,6 +830,9 @@ class HARX(ARCHModel):
             if x.shape[0] != nobs + burn:
                 raise ValueError('x must have nobs + burn rows')
 
+        if self._realized is not None:
+            raise NotImplementedError('Simulation is not available for models '
+                                      'that include realized measures')
         mc = int(self.constant) + self._lags.shape[1] + k_x
         vc = self.volatility.num_params
         dc = self.distribution.num_params
@@ -328,6 +845,37 @@ class HARX(ARCHModel):
 
         dist_params = [] if dc == 0 else params[-dc:]
         vol_params = params[mc:mc + vc]
+
+        max_lag = self._max_lags
+        if initial_value is None:
+            initial_value = 0.0
+        elif not np.isscalar(initial_value):
+            initial_value = ensure1d(initial_value, 'initial_value')
+            if initial_value.shape[0] != max_lag:
+                raise ValueError('initial_value has the wrong shape')
+        initial = np.zeros(max_lag)
+        initial[:] = initial_value
+
+        # The HAR is simulated as an AR(max_lag) using a single linear filter
+        arp = self._har_to_ar(params[:mc - k_x])
+        constant = arp[0] if self.constant else 0.0
+        a = np.concatenate(([1.0], -arp[int(self.constant):]))
+        zi = lfiltic([1.0], a, initial[::-1])
+        shift = np.full(nobs + burn - max_lag, constant)
+        if k_x > 0:
+            shift += _as_exog(x)[max_lag:].dot(params[mc - k_x:mc])
+
+        def mean(errors):
+            y = np.empty_like(errors)
+            y[..., :max_lag] = initial
+            _zi = np.broadcast_to(zi, errors.shape[:-1] + zi.shape)
+            y[..., max_lag:] = lfilter([1.0], a, errors[..., max_lag:] + shift, zi=_zi)[0]
+            return y
+
+        if repetitions is not None:
+            return self._simulate_paths(vol_params, dist_params, nobs, burn, initial_value_vol,
+                                        repetitions, dtype, block_size, mean)
+
         simulator = self.distribution.simulate(dist_params)
         sim_data = self.volatility.simulate(vol_params,
                                             nobs + burn,
@@ -336,28 +884,7 @@ class HARX(ARCHModel):
                                             initial_value_vol)
         errors = sim_data[0]
         vol = np.sqrt(sim_data[1])
-
-        max_lag = np.max(self._lags)
-        y = np.zeros(nobs + burn)
-        if initial_value is None:
-            initial_value = 0.0
-        elif not np.isscalar(initial_value):
-            initial_value = ensure1d(initial_value, 'initial_value')
-            if initial_value.shape[0] != max_lag:
-                raise ValueError('initial_value has the wrong shape')
-        y[:max_lag] = initial_value
-
-        for t in range(max_lag, nobs + burn):
-            ind = 0
-            if self.constant:
-                y[t] = params[ind]
-                ind += 1
-            for lag in self._lags.T:
-                y[t] += params[ind] * y[t - lag[1]:t - lag[0]].mean()
-                ind += 1
-            for i in range(k_x):
-                y[t] += params[ind] * x[t, i]
-            y[t] += errors[t]
+        y = mean(errors)
 
         df = dict(data=y[burn:], volatility=vol[burn:], errors=errors[burn:])
         df = DataFrame(df)
@@ -371,6 +898,9 @@ class HARX(ARCHModel):
             variable_names.append('Const')
         if lags is not None:
             variable_names.extend(self._generate_lag_names())
+        if self._realized is not None:
+            variable_names.extend(_realized_variable_names(self._realized_names,
+                                                           self._realized_lags))
         if self._x is not None:
             variable_names.extend(self._x_names)
         return variable_names
@@ -395,18 +925,47 @@ class HARX(ARCHModel):
                     'x must be nobs by n, where nobs is the same as '
                     'the number of elements in y')
             def_names = ['x' + str(i) for i in range(self._x.shape[1])]
-            self._x_names, self._x_index = parse_dataframe(self._x, def_names)
-            self._x = np.asarray(self._x)
+            if issparse(self._x):
+                self._x_names = def_names
+                self._x_index = np.arange(self._x.shape[0])
+            else:
+                self._x_names, self._x_index = parse_dataframe(self._x, def_names)
+            self._x = _as_exog(self._x)
+        if self._realized is not None:
+            realized = self._realized
+            names = None
+            if isinstance(realized, DataFrame):
+                names = [str(col) for col in realized.columns]
+            elif isinstance(realized, Series) and realized.name is not None:
+                names = [str(realized.name)]
+            realized = np.asarray(realized, dtype=np.float64)
+            if realized.ndim == 1:
+                realized = realized[:, None]
+            if realized.ndim != 2 or realized.shape[0] != self._y.shape[0]:
+                raise ValueError('realized must be nobs by m, where nobs is the same '
+                                 'as the number of elements in y')
+            if names is None:
+                m = realized.shape[1]
+                names = ['rv'] if m == 1 else ['rv' + str(i) for i in range(m)]
+            self._realized = realized
+            self._realized_names = names
 
     def _reformat_lags(self):
         """
         Reformat input lags to be a 2 by m array, which simplifies other
-        operations.  Output is stored in _lags
+        operations.  Output is stored in _lags and _realized_lags
+        """
+        self._lags = self._format_lags(self.lags)
+        if self._realized is not None:
+            lags = self.lags if self.realized_lags is None else self.realized_lags
+            self._realized_lags = self._format_lags(lags)
+
+    def _format_lags(self, lags):
+        """
+        Convert lags in any of the supported formats to a 2 by m array
         """
-        lags = self.lags
         if lags is None:
-            self._lags = None
-            return
+            return None
         lags = np.asarray(lags)
         if np.any(lags < 0):
             raise ValueError("Input to lags must be non-negative")
@@ -425,7 +984,7 @@ class HARX(ARCHModel):
                 temp[0, 0] = 0
             else:
                 temp[0, :] = 0
-            self._lags = temp
+            return temp
         elif lags.ndim == 2:
             if lags.shape[0] != 2:
                 raise ValueError('When using a 2-d array, lags must by k by 2')
@@ -441,12 +1000,12 @@ class HARX(ARCHModel):
             if rank != lags.shape[1]:
                 raise ValueError('lags contains redundant entries')
 
-            self._lags = lags
             if self.use_rotated:
                 from warnings import warn
 
                 warn('Rotation is not available when using the '
                      '2-d lags input format')
+            return lags
         else:
             raise ValueError('Incorrect format for lags')
 
@@ -473,28 +1032,29 @@ class HARX(ARCHModel):
             reg_constant = np.ones((nobs_orig, 0), dtype=np.float64)
 
         if self.lags is not None and nobs_orig > 0:
-            maxlag = np.max(self.lags)
-            lag_array = lagmat(self._y, maxlag)
-            reg_lags = np.empty((nobs_orig, self._lags.shape[1]),
-                                dtype=np.float64)
-            for i, lags in enumerate(self._lags.T):
-                reg_lags[:, i] = np.mean(lag_array[:, lags[0]:lags[1]], 1)
+            reg_lags = _har_regressors(self._y, self._lags)
         else:
             reg_lags = np.empty((nobs_orig, 0), dtype=np.float64)
 
+        if self._realized is not None and nobs_orig > 0:
+            reg_realized = _realized_regressors(self._realized, self._realized_lags)
+        else:
+            reg_realized = np.empty((nobs_orig, 0), dtype=np.float64)
+
         if self._x is not None:
             reg_x = self._x
         else:
             reg_x = np.empty((nobs_orig, 0), dtype=np.float64)
 
-        self.regressors = np.hstack((reg_constant, reg_lags, reg_x))
+        blocks = [reg_constant, reg_lags, reg_realized, reg_x]
+        self._regressors = _RegressorBlocks(blocks)
 
     def _r2(self, params):
         y = self._fit_y
         x = self._fit_regressors
         constant = False
         if x is not None and x.shape[1] > 0:
-            constant = self.constant or implicit_constant(x)
+            constant = self.constant or x.implicit_constant()
         e = self.resids(params)
         if constant:
             y = y - np.mean(y)
@@ -511,10 +1071,48 @@ class HARX(ARCHModel):
                              'empty array.')
         self._fit_indices = [_first_obs_index, _last_obs_index]
         self._fit_y = self._y[_first_obs_index:_last_obs_index]
-        reg = self.regressors
+        reg = self._regressors
         self._fit_regressors = reg[_first_obs_index:_last_obs_index]
         self.volatility.start, self.volatility.stop = self._fit_indices
 
+    def _ols(self):
+        """
+        Least squares estimates of the mean parameters
+
+        Returns
+        -------
+        params : ndarray
+            Estimated parameters
+        rx : ndarray
+            Triangular factor of the regressors
+        """
+        x = self._fit_regressors
+        k = x.shape[1]
+        if k == 0:
+            return np.empty(0), np.empty((0, 0))
+        # Factor of [x y] so that x is never assembled in memory
+        r = x.triangular(self._fit_y[:, None])
+        rx = r[:k, :k]
+        return np.linalg.pinv(rx).dot(r[:k, -1]), rx
+
+    def starting_values(self):
+        return self._ols()[0]
+
+    def _weighted_mean_params(self, sigma2):
+        x = self._fit_regressors
+        weights = 1.0 / sigma2
+        xpx = x.weighted_gram(weights)
+        xpy = x.tdot(weights * self._fit_y)
+        try:
+            factor = cho_factor(xpx)
+        except np.linalg.LinAlgError:
+            return np.linalg.pinv(xpx).dot(xpy)
+        # Use the pseudo-inverse when the regressors are nearly collinear
+        pivots = np.diag(factor[0]) ** 2.0
+        if pivots.min() <= pivots.max() * xpx.shape[0] * np.finfo(np.float64).eps:
+            return np.linalg.pinv(xpx).dot(xpy)
+        return cho_solve(factor, xpy)
+
     def _fit_no_arch_normal_errors(self, cov_type='robust'):
         """
         Estimates model parameters
@@ -552,8 +1150,8 @@ class HARX(ARCHModel):
         opt = OptimizeResult({'status': 0, 'message': ''})
 
         if x.shape[1] > 0:
-            regression_params = np.linalg.pinv(x).dot(y)
-            xpxi = np.linalg.inv(x.T.dot(x) / nobs)
+            regression_params, rx = self._ols()
+            xpxi = np.linalg.inv(rx.T.dot(rx) / nobs)
             fitted = x.dot(regression_params)
         else:
             regression_params = np.empty(0)
@@ -573,10 +1171,14 @@ class HARX(ARCHModel):
             param_cov /= nobs
             cov_type = COV_TYPES['classic_ols']
         elif cov_type in ('robust',):
-            scores = np.zeros((nobs, self.num_params + 1))
-            scores[:, :self.num_params] = x * e[:, None]
-            scores[:, -1] = e ** 2.0 - sigma2
-            score_cov = scores.T.dot(scores) / nobs
+            k = self.num_params
+            u = e ** 2.0 - sigma2
+            score_cov = np.empty((k + 1, k + 1))
+            if k > 0:
+                score_cov[:k, :k] = x.weighted_gram(e ** 2.0)
+                score_cov[:k, k] = score_cov[k, :k] = x.tdot(e * u)
+            score_cov[k, k] = u.dot(u)
+            score_cov /= nobs
             param_cov = hessian.dot(score_cov).dot(hessian) / nobs
             cov_type = COV_TYPES['white']
         else:
@@ -605,8 +1207,270 @@ class HARX(ARCHModel):
                                self._is_pandas, opt, fit_start, fit_stop,
                                copy.deepcopy(self))
 
+    def fit_many(self, y, cov_type='robust', realized=None):
+        """
+        Estimate the model for many series at once
+
+        Parameters
+        ----------
+        y : {ndarray, DataFrame}
+            nobs by nseries array where each column is a series
+        cov_type : str, optional
+            Covariance estimator to use when the model has a closed-form
+            estimator.  One of 'robust' (White's estimator) or 'mle'.  Ignored
+            when the model has no parameters, in which case the cov_type of
+            the results is None.
+        realized : ndarray, optional
+            nobs by nseries array containing a realized measure of each
+            series, or nobs by nseries by m array containing m realized
+            measures of each series.  HAR averages of the measures over
+            realized_lags, or lags if realized_lags was not provided, are
+            included as regressors.
+
+        Returns
+        -------
+        results : ARCHModelMultiSeriesResult
+            Parameter estimates, covariances, residuals, conditional
+            volatilities and log-likelihoods of all series
+
+        Notes
+        -----
+        Available for models without exogenous regressors or attached
+        realized measures that either have a closed-form estimator, which
+        requires a ConstantVariance process and normal errors, or have no
+        parameters, such as a ZeroMean with an EWMAVariance with a fixed
+        smoothing parameter.  The estimates are identical to those from
+        calling fit on a model for each series, and the data used in the
+        model, if any, are not used.  The first hold_back observations of
+        each series are excluded from estimation.
+
+        Examples
+        --------
+        HAR-RV-J models of the realized variances of many assets that include
+        the lagged jump component of each asset
+
+        >>> import numpy as np
+        >>> from arch.univariate import HARX
+        >>> rv = np.exp(np.random.randn(1000, 500))
+        >>> jumps = 0.1 * rv * np.random.rand(1000, 500)
+        >>> har = HARX(lags=[1, 5, 22], realized_lags=[1])
+        >>> res = har.fit_many(rv, realized=jumps)
+        """
+        y = np.asarray(y, dtype=np.float64)
+        if y.ndim != 2:
+            raise ValueError('y must be a 2-dimensional array')
+        if self._x is not None or self._realized is not None:
+            raise ValueError('fit_many is not available for models with exogenous '
+                             'regressors or realized measures')
+        first = self._hold_back
+        nobs_orig, nseries = y.shape
+        # nobs by k by nseries regressors for each series
+        blocks = [np.ones((nobs_orig, int(self.constant), nseries))]
+        if self._lags is not None:
+            blocks.append(_har_regressors(y, self._lags))
+        realized_names = []
+        if realized is not None:
+            realized = np.asarray(realized, dtype=np.float64)
+            if realized.ndim == 2:
+                realized = realized[:, :, None]
+            if realized.ndim != 3 or realized.shape[:2] != y.shape:
+                raise ValueError('realized must be nobs by nseries or nobs by nseries by m')
+            lags = self.lags if self.realized_lags is None else self.realized_lags
+            if lags is None:
+                raise ValueError('realized_lags or lags must be provided when '
+                                 'using realized measures')
+            lags = self._format_lags(lags)
+            first = max(first, int(lags.max()))
+            # Averages ordered by measure and then by lag, as in a single series
+            reg = _har_regressors(realized, lags).transpose(0, 3, 1, 2)
+            blocks.append(reg.reshape((nobs_orig, -1, nseries)))
+            m = realized.shape[2]
+            names = ['rv'] if m == 1 else ['rv' + str(i) for i in range(m)]
+            realized_names = _realized_variable_names(names, lags)
+        fit_y = y[first:]
+        nobs = fit_y.shape[0]
+        x = np.concatenate(blocks, 1)[first:]
+        k = x.shape[1]
+
+        v, d = self.volatility, self.distribution
+        closed_form = (v.closed_form and d.num_params == 0 and
+                       isinstance(v, ConstantVariance))
+        parameterless = k + v.num_params + d.num_params == 0
+        if not (closed_form or parameterless):
+            raise ValueError('fit_many requires a model with a closed-form estimator or '
+                             'without parameters')
+        if cov_type not in ('robust', 'mle'):
+            raise ValueError('Unknown cov_type')
+        if nobs < k + 1:
+            raise ValueError('Insufficient data, ' + str(k) + ' regressors, ' +
+                             str(nobs) + ' data points available')
+
+        xpx = np.einsum('tin,tjn->nij', x, x)
+        if k > 0:
+            params = np.einsum('nij,nj->ni', np.linalg.pinv(xpx),
+                               np.einsum('tin,tn->ni', x, fit_y))
+            e = fit_y - np.einsum('tin,ni->tn', x, params)
+        else:
+            params = np.empty((nseries, 0))
+            e = fit_y.copy()
+        sigma2 = (e ** 2.0).mean(0)
+        resid = np.full((nobs_orig, nseries), np.nan)
+        resid[first:] = e
+        loglikelihood = -0.5 * nobs * (np.log(2 * np.pi) + np.log(sigma2) + 1.0)
+
+        names = self._all_parameter_names()
+        loc = len(self.parameter_names())
+        names[loc:loc] = realized_names
+        if parameterless:
+            vol = np.full((nobs_orig, nseries), np.nan)
+            vol[first:] = np.sqrt(v.filter_variances(np.empty(0), e))
+            # No covariance is estimated when there are no parameters
+            return ARCHModelMultiSeriesResult(np.empty((nseries, 0)),
+                                              np.empty((nseries, 0, 0)), resid, vol,
+                                              loglikelihood, names, None)
+
+        xpxi = np.linalg.inv(xpx / nobs)
+        hessian = np.zeros((nseries, k + 1, k + 1))
+        hessian[:, :k, :k] = -xpxi
+        hessian[:, k, k] = -1
+        if cov_type == 'mle':
+            param_cov = sigma2[:, None, None] * -hessian
+            param_cov[:, k, k] = 2 * sigma2 ** 2.0
+            param_cov /= nobs
+            cov_type = COV_TYPES['classic_ols']
+        else:
+            u = e ** 2.0 - sigma2
+            score_cov = np.empty((nseries, k + 1, k + 1))
+            score_cov[:, :k, :k] = np.einsum('tin,tjn,tn->nij', x, x, e ** 2.0)
+            cross = np.einsum('tin,tn->ni', x, e * u)
+            score_cov[:, :k, k] = score_cov[:, k, :k] = cross
+            score_cov[:, k, k] = (u ** 2.0).sum(0)
+            score_cov /= nobs
+            param_cov = np.matmul(np.matmul(hessian, score_cov), hessian) / nobs
+            cov_type = COV_TYPES['white']
+
+        vol = np.full((nobs_orig, nseries), np.nan)
+        vol[first:] = np.sqrt(sigma2)
+        params = np.column_stack((params, sigma2))
+        return ARCHModelMultiSeriesResult(params, param_cov, resid, vol, loglikelihood,
+                                          names, cov_type)
+
+    def _forecast_state(self, params):
+        """
+        Residuals, backcast and variance bounds used when forecasting
+
+        Parameters
+        ----------
+        params : ndarray
+            Mean model parameters
+
+        Returns
+        -------
+        resids : ndarray
+            Residuals from the first usable observation to the end of the sample
+        backcast : float
+            Backcast value computed from the residuals in the estimation sample
+        var_bounds : ndarray
+            Variance bounds computed from resids
+
+        Notes
+        -----
+        Values are cached so that repeated forecasts using the same parameters
+        reuse the filtered state
+        """
+        key = ('state', params.tobytes(), tuple(self._fit_indices))
+        state = self._cache.get(key)
+        if state is not None:
+            return state
+        earliest = self._fit_indices[0]
+        # Back cast should use only the sample used in fitting
+        resids = self.resids(params)
+        backcast = self._volatility.backcast(resids)
+        full_resids = self.resids(params, self._y[earliest:], self._regressors[earliest:])
+        var_bounds = self._volatility.variance_bounds(full_resids, 2.0)
+        state = (full_resids, backcast, var_bounds)
+        self._cache.put(key, state)
+        return state
+
+    def _resids_after(self, params, y, x=None, realized=None):
+        """
+        Residuals of observations that follow the model's data
+
+        Parameters
+        ----------
+        params : ndarray
+            Mean model parameters
+        y : ndarray
+            Observations that follow the last observation of the model's
+            dependent variable
+        x : {ndarray, sparse matrix}, optional
+            Exogenous regressors for the observations in y
+        realized : ndarray, optional
+            Realized measures for the observations in y
+
+        Returns
+        -------
+        resids : ndarray
+            Residuals of y
+        """
+        if (x is None) != (self._x is None):
+            raise ValueError('x must be provided if and only if the model '
+                             'contains exogenous regressors')
+        if (realized is None) != (self._realized is None):
+            raise ValueError('realized must be provided if and only if the model '
+                             'contains realized measures')
+        nobs = y.shape[0]
+        blocks = [np.ones((nobs, int(self.constant)))]
+        if self._lags is not None:
+            # Only the last max_lags observations enter the HAR regressors
+            tail = self._y[max(self._y.shape[0] - self._max_lags, 0):]
+            reg_lags = _har_regressors(np.concatenate((tail, y)), self._lags)
+            blocks.append(reg_lags[tail.shape[0]:])
+        if realized is not None:
+            realized = np.asarray(realized, dtype=np.float64)
+            if realized.ndim == 1:
+                realized = realized[:, None]
+            if realized.shape != (nobs, self._realized.shape[1]):
+                raise ValueError('realized must have the same number of rows as y and '
+                                 'the same number of columns as the model\'s realized')
+            max_lags = int(self._realized_lags.max())
+            tail = self._realized[max(self._realized.shape[0] - max_lags, 0):]
+            reg_realized = _realized_regressors(np.vstack((tail, realized)),
+                                                self._realized_lags)
+            blocks.append(reg_realized[tail.shape[0]:])
+        if x is not None:
+            x = _as_exog(x)
+            if x.ndim != 2 or x.shape != (nobs, self._x.shape[1]):
+                raise ValueError('x must have the same number of rows as y and the '
+                                 'same number of columns as the model\'s x')
+            blocks.append(x)
+        return self.resids(params, y, _RegressorBlocks(blocks))
+
+    def evaluate(self, params, y, x=None, realized=None):
+        y_series = ensure1d(y, 'y', series=True)
+        index = y_series.index if isinstance(y, (Series, DataFrame)) else None
+        y = np.asarray(y_series, dtype=np.float64)
+        params = np.asarray(params)
+        mp, vp, dp = self._parse_parameters(params)
+        in_sample, backcast, _ = self._forecast_state(mp)
+        resids = np.concatenate((in_sample, self._resids_after(mp, y, x, realized)))
+        var_bounds = self._volatility.variance_bounds(resids, 2.0)
+        sigma2 = np.empty_like(resids)
+        self._volatility.compute_variance(vp, resids, sigma2, backcast, var_bounds)
+
+        nobs = y.shape[0]
+        resids, sigma2 = resids[-nobs:], sigma2[-nobs:]
+        std_resid = resids / np.sqrt(sigma2)
+        out = OrderedDict()
+        out['loglikelihood'] = self._distribution.loglikelihood(dp, resids, sigma2,
+                                                                individual=True)
+        out['pit'] = self._distribution.cdf(std_resid, dp)
+        out['std_resid'] = std_resid
+        return DataFrame(out, index=index)
+
     def forecast(self, params, horizon=1, start=None, align='origin',
-                 method='analytic', simulations=1000, rng=None):
+                 method='analytic', simulations=1000, rng=None, random_state=None,
+                 aggregate=False):
         # Check start
         earliest, default_start = self._fit_indices
         default_start = max(0, default_start - 1)
@@ -619,60 +1483,95 @@ class HARX(ARCHModel):
         # Parse params
         params = np.asarray(params)
         mp, vp, dp = self._parse_parameters(params)
+        method = method.lower()
+
+        # Analytic forecasts for an origin do not depend on the first origin, and so
+        # forecasts from an earlier start can be reused
+        key = ('forecast', params.tobytes(), horizon, aggregate, tuple(self._fit_indices))
+        cached = self._cache.get(key) if method == 'analytic' else None
+        if cached is not None and cached[0] <= start_index:
+            mean_fcast, longrun_var_fcasts, var_fcasts = [f.copy() for f in cached[1:]]
+            for fcast in (mean_fcast, longrun_var_fcasts, var_fcasts):
+                fcast[:start_index] = np.nan
+            return ARCHModelForecast(self._y_series.index, mean_fcast, longrun_var_fcasts,
+                                     var_fcasts, align=align)
 
         #####################################
         # Compute residual variance forecasts
         #####################################
-        # Back cast should use only the sample used in fitting
-        resids = self.resids(mp)
-        backcast = self._volatility.backcast(resids)
-        full_resids = self.resids(mp, self._y[earliest:], self.regressors[earliest:])
-        vb = self._volatility.variance_bounds(full_resids, 2.0)
-        if rng is None:
-            rng = self._distribution.simulate(dp)
+        full_resids, backcast, vb = self._forecast_state(mp)
         variance_start = max(0, start_index - earliest)
+        if rng is None:
+            rng = self._distribution._stream_simulator(dp, random_state, variance_start)
         vfcast = self._volatility.forecast(vp, full_resids, backcast, vb,
                                            start=variance_start,
                                            horizon=horizon, method=method,
-                                           simulations=simulations, rng=rng)
+                                           simulations=simulations, rng=rng,
+                                           random_state=random_state,
+                                           distribution=self._distribution,
+                                           dist_params=dp)
         var_fcasts = vfcast.forecasts
         var_fcasts = _forecast_pad(earliest, var_fcasts)
 
-        arp = self._har_to_ar(mp)
         nexog = 0 if self._x is None else self._x.shape[1]
-        exog_p = np.empty([]) if self._x is None else mp[-nexog:]
+        nrealized = 0
+        if self._realized is not None:
+            nrealized = self._realized.shape[1] * self._realized_lags.shape[1]
+        ndyn = mp.shape[0] - nexog - nrealized
+        arp = self._har_to_ar(mp[:ndyn])
         constant = arp[0] if self.constant else 0.0
         dynp = arp[int(self.constant):]
-        mean_fcast = _ar_forecast(self._y, horizon, start_index, constant, dynp, exog_p, self._x)
+        har_params = mp[int(self.constant):ndyn]
+        lags = self._lags if self._lags is not None else np.empty((2, 0), dtype=np.int64)
+        ar_fcast = _har_forecast(self._y, horizon, start_index, constant, har_params, lags)
+        # Contribution of the realized measures and exogenous regressors to the
+        # one-step forecast
+        one_step = np.zeros(ar_fcast.shape[0])
+        if nrealized > 0:
+            # Averages of the realized measures up to and including each origin
+            realized = np.vstack((self._realized, np.zeros((1, self._realized.shape[1]))))
+            reg_realized = _realized_regressors(realized, self._realized_lags)
+            one_step += reg_realized[1:].dot(mp[ndyn:ndyn + nrealized])
+        if self._x is not None:
+            one_step[:-1] += self._x[1:].dot(mp[-nexog:])
+            one_step[-1] = np.nan
+        mean_fcast = ar_fcast.copy()
+        if nrealized > 0 or self._x is not None:
+            mean_fcast[:, 0] += one_step
+            mean_fcast[:, 1:] = np.nan
         # Compute total variance forecasts, which depend on model
         impulse = _ar_to_impulse(horizon, dynp)
-        longrun_var_fcasts = var_fcasts.copy()
-        for i in range(horizon):
-            lrf = var_fcasts[:, :(i + 1)].dot(impulse[i::-1] ** 2)
-            longrun_var_fcasts[:, i] = lrf
+        if aggregate:
+            # Shocks enter the sum of y[t+1:t+h+1] through cumulative impulses
+            mean_fcast = np.cumsum(mean_fcast, 1)
+            impulse = np.cumsum(impulse)
+        longrun_var_fcasts = _impulse_variance(impulse, var_fcasts)
 
-        if method.lower() in ('simulation', 'bootstrap'):
-            # TODO: This is not tested, but probably right
+        if method in ('simulation', 'bootstrap'):
             variance_paths = _forecast_pad(earliest, vfcast.forecast_paths)
             long_run_variance_paths = variance_paths.copy()
             shocks = _forecast_pad(earliest, vfcast.shocks)
-            for i in range(horizon):
-                _impulses = impulse[i::-1][:, None]
-                lrvp = variance_paths[start_index:, :, :(i + 1)].dot(_impulses ** 2)
-                long_run_variance_paths[start_index:, :, i] = np.squeeze(lrvp)
-            t, m = self._y.shape[0], self._max_lags
-            mean_paths = np.full((t, simulations, m + horizon), np.nan)
-            dynp_rev = dynp[::-1]
-            for i in range(start_index, t):
-                mean_paths[i, :, :m] = self._y[i - m + 1:i + 1]
-
-                for j in range(horizon):
-                    mean_paths[i, :, m + j] = constant + \
-                                              mean_paths[i, :, j:m + j].dot(dynp_rev) + \
-                                              shocks[i, :, j]
-            mean_paths = mean_paths[:, :, m:]
+            long_run_variance_paths[start_index:] = _impulse_variance(impulse,
+                                                                      variance_paths[start_index:])
+            t = self._y.shape[0]
+            mean_paths = np.full((t, simulations, horizon), np.nan)
+            # Paths are the forecasts plus the AR response to the simulated shocks
+            # and to the realized and exogenous terms in the first step
+            mean_paths[start_index:] = shocks[start_index:]
+            mean_paths[start_index:, :, 0] += one_step[start_index:, None]
+            if dynp.shape[0] > 0:
+                a = np.concatenate(([1.0], -dynp))
+                mean_paths[start_index:] = lfilter([1.0], a, mean_paths[start_index:], axis=-1)
+            mean_paths[start_index:] += ar_fcast[start_index:, None, :]
+            if nrealized > 0 or self._x is not None:
+                # Future realized measures and regressors are not known
+                mean_paths[:, :, 1:] = np.nan
+            if aggregate:
+                np.cumsum(mean_paths, 2, out=mean_paths)
         else:
             variance_paths = mean_paths = shocks = long_run_variance_paths = None
+            self._cache.put(key, (start_index, mean_fcast.copy(), longrun_var_fcasts.copy(),
+                                  var_fcasts.copy()))
 
         index = self._y_series.index
         return ARCHModelForecast(index, mean_fcast, longrun_var_fcasts,
@@ -735,7 +1634,8 @@ class ConstantMean(HARX):
         return super(ConstantMean, self)._model_description(include_lags)
 
     def simulate(self, params, nobs, burn=500, initial_value=None,
-                 x=None, initial_value_vol=None):
+                 x=None, initial_value_vol=None, repetitions=None, dtype=np.float64,
+                 block_size=1000):
         """
         Simulated data from a constant mean model
 
@@ -756,13 +1656,24 @@ class ConstantMean(HARX):
             This value is not used.
         initial_value_vol : {ndarray, float}, optional
             An array or scalar to use when initializing the volatility process.
+        repetitions : int, optional
+            Number of independent paths to simulate.  If provided, the paths
+            are returned as arrays rather than a DataFrame.
+        dtype : dtype, optional
+            Data type of the arrays returned when repetitions is provided.
+            Default is float64.
+        block_size : int, optional
+            Number of paths generated at a time when repetitions is provided.
+            Smaller values reduce the memory used during the simulation.
 
         Returns
         -------
-        simulated_data : DataFrame
+        simulated_data : {DataFrame, dict}
             DataFrame with columns data containing the simulated values,
             volatility, containing the conditional volatility and errors
-            containing the errors used in the simulation
+            containing the errors used in the simulation.  If repetitions is
+            provided, a dictionary with the same keys containing repetitions
+            by nobs arrays.
 
         Examples
         --------
@@ -782,6 +1693,9 @@ class ConstantMean(HARX):
                              'simulating a constant mean process.')
 
         mp, vp, dp = self._parse_parameters(params)
+        if repetitions is not None:
+            return self._simulate_paths(vp, dp, nobs, burn, initial_value_vol, repetitions,
+                                        dtype, block_size, lambda errors: errors + mp)
 
         sim_values = self.volatility.simulate(vp,
                                               nobs + burn,
@@ -856,7 +1770,7 @@ class ZeroMean(HARX):
         return super(ZeroMean, self)._model_description(include_lags)
 
     def simulate(self, params, nobs, burn=500, initial_value=None, x=None,
-                 initial_value_vol=None):
+                 initial_value_vol=None, repetitions=None, dtype=np.float64, block_size=1000):
         """
         Simulated data from a zero mean model
 
@@ -876,13 +1790,24 @@ class ZeroMean(HARX):
             This value is not used.
         initial_value_vol : {ndarray, float}, optional
             An array or scalar to use when initializing the volatility process.
+        repetitions : int, optional
+            Number of independent paths to simulate.  If provided, the paths
+            are returned as arrays rather than a DataFrame.
+        dtype : dtype, optional
+            Data type of the arrays returned when repetitions is provided.
+            Default is float64.
+        block_size : int, optional
+            Number of paths generated at a time when repetitions is provided.
+            Smaller values reduce the memory used during the simulation.
 
         Returns
         -------
-        simulated_data : DataFrame
+        simulated_data : {DataFrame, dict}
             DataFrame with columns data containing the simulated values,
             volatility, containing the conditional volatility and errors
-            containing the errors used in the simulation
+            containing the errors used in the simulation.  If repetitions is
+            provided, a dictionary with the same keys containing repetitions
+            by nobs arrays.
 
         Examples
         --------
@@ -903,6 +1828,9 @@ class ZeroMean(HARX):
                              'simulating a constant mean process.')
 
         _, vp, dp = self._parse_parameters(params)
+        if repetitions is not None:
+            return self._simulate_paths(vp, dp, nobs, burn, initial_value_vol, repetitions,
+                                        dtype, block_size, lambda errors: errors)
 
         sim_values = self.volatility.simulate(vp,
                                               nobs + burn,
@@ -930,8 +1858,9 @@ class ARX(HARX):
     ----------
     y : {ndarray, Series}
         nobs element vector containing the dependent variable
-    x : {ndarray, DataFrame}, optional
-        nobs by k element array containing exogenous regressors
+    x : {ndarray, DataFrame, sparse matrix}, optional
+        nobs by k element array containing exogenous regressors.  Sparse
+        matrices and DataFrames with sparse columns are stored in CSR format.
     lags : scalar, 1-d array, optional
         Description of lag structure of the HAR.  Scalar included all lags
         between 1 and the value.  A 1-d array includes the AR lags lags[0],
@@ -1031,8 +1960,9 @@ class LS(HARX):
     ----------
     y : {ndarray, Series}
         nobs element vector containing the dependent variable
-    y : {ndarray, DataFrame}, optional
-        nobs by k element array containing exogenous regressors
+    x : {ndarray, DataFrame, sparse matrix}, optional
+        nobs by k element array containing exogenous regressors.  Sparse
+        matrices and DataFrames with sparse columns are stored in CSR format.
     constant : bool, optional
         Flag whether the model should include a constant
     hold_back : int
@@ -1088,7 +2018,7 @@ def arch_model(y, x=None, mean='Constant', lags=0, vol='Garch', p=1, o=0, q=1,
         integers specifying lag locations.
     vol : str, optional
         Name of the volatility model.  Currently supported options are:
-        'GARCH' (default),  "EGARCH', 'ARCH' and 'HARCH'
+        'GARCH' (default), 'EGARCH', 'ARCH', 'HARCH' and 'FIGARCH'
     p : int, optional
         Lag order of the symmetric innovation
     o : int, optional
@@ -1144,7 +2074,7 @@ def arch_model(y, x=None, mean='Constant', lags=0, vol='Garch', p=1, o=0, q=1,
     when `mean='zero'`, are silently ignored.
     """
     known_mean = ('zero', 'constant', 'harx', 'har', 'ar', 'arx', 'ls')
-    known_vol = ('arch', 'garch', 'harch', 'constant', 'egarch')
+    known_vol = ('arch', 'garch', 'harch', 'constant', 'egarch', 'figarch')
     known_dist = ('normal', 'gaussian', 'studentst', 't', 'skewstudent',
                   'skewt', 'ged', 'generalized error')
     mean = mean.lower()
@@ -1180,6 +2110,8 @@ def arch_model(y, x=None, mean='Constant', lags=0, vol='Garch', p=1, o=0, q=1,
         v = GARCH(p=p, o=o, q=q, power=power)
     elif vol == 'egarch':
         v = EGARCH(p=p, o=o, q=q)
+    elif vol == 'figarch':
+        v = FIGARCH(p=p, q=q, power=power)
     else:  # vol == 'harch'
         v = HARCH(lags=p)
 
@@ -0,0 +1,359 @@
+"""
+Interpolation tables used to quickly evaluate the CDF and the inverse CDF of
+the Student's t and generalized error distributions
+"""
+from __future__ import absolute_import, division
+
+import numpy as np
+from scipy.special import (expit, gammaincc, gammainccinv, gammaln, stdtr,
+                           stdtrit)
+
+from arch.utility.cache import ArrayCache
+
+__all__ = ['QuantileTable', 'students_t_cdf', 'students_t_ppf',
+           'generalized_error_cdf', 'generalized_error_ppf', 'TABLE_MIN_SIZE',
+           'TABLE_TOLERANCE']
+
+# Number of nodes in each table
+TABLE_NODES = 4097
+# Probability in each tail that is not covered by the tables
+TABLE_TAIL = 1e-12
+# Largest interpolation error accepted in an interval of a table
+TABLE_TOLERANCE = 1e-9
+# Smallest number of values for which tables are used by default
+TABLE_MIN_SIZE = 5000
+
+_TABLES = ArrayCache(16 * 2 ** 20)
+
+
+def _symmetric_cdf(lower_cdf, x):
+    """CDF of a distribution symmetric about 0 from the CDF of its lower half"""
+    lower = x <= 0
+    return np.where(lower, lower_cdf(np.where(lower, x, -x)),
+                    1.0 - lower_cdf(np.where(lower, 0.0, -x)))
+
+
+def _symmetric_ppf(lower_ppf, q):
+    """Inverse CDF of a distribution symmetric about 0 from its lower half"""
+    lower = q <= 0.5
+    return np.where(lower, lower_ppf(np.where(lower, q, 0.5)),
+                    -lower_ppf(np.where(lower, 0.5, 1.0 - q)))
+
+
+def _hermite(k, values, slopes, step):
+    """Cubic Hermite interpolation at fractional node locations k"""
+    loc = np.minimum(k.astype(np.intp), values.shape[0] - 2)
+    t = k - loc
+    t2 = t * t
+    t3 = t2 * t
+    out = (2 * t3 - 3 * t2 + 1) * values[loc]
+    out += (t3 - 2 * t2 + t) * step * slopes[loc]
+    out += (3 * t2 - 2 * t3) * values[loc + 1]
+    out += (t3 - t2) * step * slopes[loc + 1]
+    return out
+
+
+class QuantileTable(object):
+    r"""
+    Interpolation tables for a continuous distribution that is symmetric about 0
+
+    Parameters
+    ----------
+    lower_cdf : callable
+        Function returning the CDF for values less than or equal to 0.  Must
+        be accurate for small probabilities.
+    lower_ppf : callable
+        Function returning the inverse CDF for probabilities less than or
+        equal to 0.5
+    pdf : callable
+        Density function
+    nodes : int, optional
+        Number of nodes in each table
+    tail : float, optional
+        Probability in each tail that is not covered by the tables
+
+    Notes
+    -----
+    The inverse CDF is tabulated as :math:`s=\sinh^{-1}(x)` on a uniform grid
+    of :math:`y=\ln(F(x)/(1-F(x)))`, and the CDF is tabulated as :math:`y` on
+    a uniform grid of :math:`s`.  Both transformations are nearly linear in
+    the tails of the distributions, and the values are computed using cubic
+    Hermite interpolation with the slopes implied by the density.
+
+    The interpolation error is measured at the midpoint of each interval
+    when the table is constructed.  Intervals where the error in :math:`s`
+    or :math:`y` exceeds ``TABLE_TOLERANCE`` are not used, so that quantiles
+    have relative errors of about 1e-9 (absolute errors when the quantile is
+    smaller than 1 in absolute value) and tail probabilities,
+    :math:`\min(F, 1-F)`, have relative errors of about 1e-9.  Values outside
+    of the tables or in intervals that are not used are computed exactly.
+    """
+
+    def __init__(self, lower_cdf, lower_ppf, pdf, nodes=TABLE_NODES, tail=TABLE_TAIL):
+        nodes = int(nodes)
+        if nodes < 3 or nodes % 2 == 0:
+            raise ValueError('nodes must be an odd integer larger than 1')
+        self._lower_cdf = lower_cdf
+        self._lower_ppf = lower_ppf
+        self._pdf = pdf
+
+        # Inverse CDF as a function of the log odds
+        max_y = np.log((1 - tail) / tail)
+        self._y_step = 2 * max_y / (nodes - 1)
+        y = np.linspace(-max_y, max_y, 2 * nodes - 1)
+        x = lower_ppf(expit(y[:nodes]))
+        x = np.concatenate((x, -x[-2::-1]))
+        s = np.arcsinh(x)
+        slopes = expit(y) * expit(-y) / (pdf(x) * np.cosh(s))
+        self._s, self._s_slopes = s[::2], slopes[::2]
+        with np.errstate(invalid='ignore'):
+            approx = _hermite(np.arange(0.5, nodes - 1), self._s, self._s_slopes,
+                              self._y_step)
+        self._s_exact = ~(np.abs(approx - s[1::2]) <= TABLE_TOLERANCE)
+        self._min_y = -max_y
+
+        # CDF as a function of the inverse hyperbolic sine
+        max_s = s[-1]
+        self._s_step = 2 * max_s / (nodes - 1)
+        s = np.linspace(-max_s, max_s, 2 * nodes - 1)
+        x = np.sinh(s)
+        lower = lower_cdf(-np.abs(x))
+        y = np.sign(x) * (np.log1p(-lower) - np.log(lower))
+        slopes = pdf(x) * np.cosh(s) / (expit(y) * expit(-y))
+        self._y, self._y_slopes = y[::2], slopes[::2]
+        with np.errstate(invalid='ignore'):
+            approx = _hermite(np.arange(0.5, nodes - 1), self._y, self._y_slopes,
+                              self._s_step)
+        self._y_exact = ~(np.abs(approx - y[1::2]) <= TABLE_TOLERANCE)
+        self._min_s = -max_s
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by the tables"""
+        arrays = (self._s, self._s_slopes, self._s_exact, self._y, self._y_slopes,
+                  self._y_exact)
+        return sum(a.nbytes for a in arrays)
+
+    @staticmethod
+    def _locate(values, minimum, step, exact):
+        """Fractional table locations and whether the table can be used"""
+        with np.errstate(invalid='ignore'):
+            k = (values - minimum) / step
+            inside = (k >= 0) & (k <= exact.shape[0])
+        loc = np.minimum(k[inside].astype(np.intp), exact.shape[0] - 1)
+        inside[inside] = ~exact[loc]
+        return k, inside
+
+    def ppf(self, q):
+        """
+        Inverse cumulative distribution function
+
+        Parameters
+        ----------
+        q : ndarray
+            Probabilities
+
+        Returns
+        -------
+        x : ndarray
+            Quantiles with the same shape as q
+        """
+        q = np.asarray(q, dtype=np.float64)
+        shape = q.shape
+        q = q.ravel()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            y = np.log(q) - np.log1p(-q)
+        k, inside = self._locate(y, self._min_y, self._y_step, self._s_exact)
+        if inside.all():
+            out = np.sinh(_hermite(k, self._s, self._s_slopes, self._y_step))
+        else:
+            out = np.empty_like(q)
+            out[inside] = np.sinh(_hermite(k[inside], self._s, self._s_slopes,
+                                           self._y_step))
+            out[~inside] = _symmetric_ppf(self._lower_ppf, q[~inside])
+        return out.reshape(shape)
+
+    def cdf(self, x):
+        """
+        Cumulative distribution function
+
+        Parameters
+        ----------
+        x : ndarray
+            Values at which to evaluate the CDF
+
+        Returns
+        -------
+        p : ndarray
+            Probabilities with the same shape as x
+        """
+        x = np.asarray(x, dtype=np.float64)
+        shape = x.shape
+        x = x.ravel()
+        k, inside = self._locate(np.arcsinh(x), self._min_s, self._s_step, self._y_exact)
+        if inside.all():
+            out = expit(_hermite(k, self._y, self._y_slopes, self._s_step))
+        else:
+            out = np.empty_like(x)
+            out[inside] = expit(_hermite(k[inside], self._y, self._y_slopes, self._s_step))
+            out[~inside] = _symmetric_cdf(self._lower_cdf, x[~inside])
+        return out.reshape(shape)
+
+
+def _newton_step(lower_cdf, pdf, x, q):
+    """Refine a quantile using a Newton step"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        step = (lower_cdf(x) - q) / pdf(x)
+    return np.where(np.isfinite(step), x - step, x)
+
+
+def _t_functions(nu):
+    const = gammaln((nu + 1) / 2) - gammaln(nu / 2) - 0.5 * np.log(nu * np.pi)
+
+    def lower_cdf(x):
+        return stdtr(nu, x)
+
+    def lower_ppf(q):
+        x = np.where(q == 0, -np.inf, stdtrit(nu, q))
+        return _newton_step(lower_cdf, pdf, x, q)
+
+    def pdf(x):
+        return np.exp(const - (nu + 1) / 2 * np.log1p(x ** 2 / nu))
+
+    return lower_cdf, lower_ppf, pdf
+
+
+def _ged_functions(nu):
+    density_zero = nu / (2 * np.exp(gammaln(1 / nu)))
+
+    tiny = np.finfo(np.float64).tiny
+
+    # The density is constant near 0 when abs(x) ** nu underflows
+    def lower_cdf(x):
+        z = np.abs(x) ** nu
+        return np.where(z < tiny, 0.5 + x * density_zero, 0.5 * gammaincc(1 / nu, z))
+
+    def lower_ppf(q):
+        z = gammainccinv(1 / nu, 2 * q)
+        x = np.where(z < tiny, (q - 0.5) / density_zero, -z ** (1 / nu))
+        return _newton_step(lower_cdf, pdf, x, q)
+
+    def pdf(x):
+        return density_zero * np.exp(-np.abs(x) ** nu)
+
+    return lower_cdf, lower_ppf, pdf
+
+
+_FUNCTIONS = {'t': _t_functions, 'ged': _ged_functions}
+
+
+def _table(kind, shape):
+    key = (kind, float(shape))
+    table = _TABLES.get(key)
+    if table is None:
+        table = QuantileTable(*_FUNCTIONS[kind](float(shape)))
+        _TABLES.put(key, table)
+    return table
+
+
+def _evaluate(kind, shape, values, method, use_table):
+    values = np.asarray(values, dtype=np.float64)
+    if use_table is None:
+        use_table = values.size >= TABLE_MIN_SIZE
+    if use_table:
+        out = getattr(_table(kind, shape), method)(values)
+    else:
+        lower_cdf, lower_ppf, _ = _FUNCTIONS[kind](float(shape))
+        if method == 'cdf':
+            out = _symmetric_cdf(lower_cdf, values)
+        else:
+            out = _symmetric_ppf(lower_ppf, values)
+    return out[()]
+
+
+def students_t_cdf(x, nu, use_table=None):
+    """
+    CDF of a Student's t random variable with unit scale
+
+    Parameters
+    ----------
+    x : {float, ndarray}
+        Values at which to evaluate the CDF
+    nu : float
+        Degrees of freedom
+    use_table : bool, optional
+        Whether to use a cached interpolation table.  If None, a table is used
+        when x has at least ``TABLE_MIN_SIZE`` elements.
+
+    Returns
+    -------
+    p : {float, ndarray}
+        Probabilities
+    """
+    return _evaluate('t', nu, x, 'cdf', use_table)
+
+
+def students_t_ppf(q, nu, use_table=None):
+    """
+    Inverse CDF of a Student's t random variable with unit scale
+
+    Parameters
+    ----------
+    q : {float, ndarray}
+        Probabilities
+    nu : float
+        Degrees of freedom
+    use_table : bool, optional
+        Whether to use a cached interpolation table.  If None, a table is used
+        when q has at least ``TABLE_MIN_SIZE`` elements.
+
+    Returns
+    -------
+    x : {float, ndarray}
+        Quantiles
+    """
+    return _evaluate('t', nu, q, 'ppf', use_table)
+
+
+def generalized_error_cdf(x, nu, use_table=None):
+    """
+    CDF of a generalized error random variable with unit scale
+
+    Parameters
+    ----------
+    x : {float, ndarray}
+        Values at which to evaluate the CDF
+    nu : float
+        Shape parameter.  The density is proportional to exp(-abs(x) ** nu).
+    use_table : bool, optional
+        Whether to use a cached interpolation table.  If None, a table is used
+        when x has at least ``TABLE_MIN_SIZE`` elements.
+
+    Returns
+    -------
+    p : {float, ndarray}
+        Probabilities
+    """
+    return _evaluate('ged', nu, x, 'cdf', use_table)
+
+
+def generalized_error_ppf(q, nu, use_table=None):
+    """
+    Inverse CDF of a generalized error random variable with unit scale
+
+    Parameters
+    ----------
+    q : {float, ndarray}
+        Probabilities
+    nu : float
+        Shape parameter.  The density is proportional to exp(-abs(x) ** nu).
+    use_table : bool, optional
+        Whether to use a cached interpolation table.  If None, a table is used
+        when q has at least ``TABLE_MIN_SIZE`` elements.
+
+    Returns
+    -------
+    x : {float, ndarray}
+        Quantiles
+    """
+    return _evaluate('ged', nu, q, 'ppf', use_table)
@@ -4,13 +4,16 @@
 import numpy as np
 cimport numpy as np
 
-__all__ = ['harch_recursion', 'arch_recursion', 'garch_recursion', 'egarch_recursion', 'midas_recursion']
+__all__ = ['harch_recursion', 'arch_recursion', 'garch_recursion', 'egarch_recursion', 'midas_recursion',
+           'ewma_components_recursion', 'garch_simulation', 'harch_simulation', 'egarch_simulation',
+           'midas_simulation', 'figarch_simulation', 'ewma_components_simulation']
 
 cdef extern from 'math.h':
     double log(double x)
     double exp(double x)
     double sqrt(double x)
     double fabs(double x)
+    double pow(double x, double y)
 
 cdef extern from 'float.h':
     double DBL_MAX
@@ -43,20 +46,22 @@ def harch_recursion(double[::1] parameters,
         nobs by 2-element array of upper and lower bounds for conditional
         variances for each time period
     """
-    cdef Py_ssize_t t, i, num_lags
-    cdef int j
-    cdef double param
+    cdef Py_ssize_t t, i, j, num_lags
+    cdef double resid2, outgoing
+    cdef double[::1] window_sums, scaled_params
     num_lags = lags.shape[0]
 
+    # Running sums of the squared residuals in each window
+    window_sums = np.empty(num_lags, dtype=np.float64)
+    scaled_params = np.empty(num_lags, dtype=np.float64)
+    for i in range(num_lags):
+        window_sums[i] = lags[i] * backcast
+        scaled_params[i] = parameters[i + 1] / lags[i]
+
     for t in range(nobs):
         sigma2[t] = parameters[0]
         for i in range(num_lags):
-            param = parameters[i + 1] / lags[i]
-            for j in range(lags[i]):
-                if (t - j - 1) >= 0:
-                    sigma2[t] += param * resids[t - j - 1] * resids[t - j - 1]
-                else:
-                    sigma2[t] += param * backcast
+            sigma2[t] += scaled_params[i] * window_sums[i]
         if sigma2[t] < var_bounds[t, 0]:
             sigma2[t] = var_bounds[t, 0]
         elif sigma2[t] > var_bounds[t, 1]:
@@ -65,8 +70,27 @@ def harch_recursion(double[::1] parameters,
             else:
                 sigma2[t] = var_bounds[t, 1] + log(sigma2[t] / var_bounds[t, 1])
 
+        resid2 = resids[t] * resids[t]
+        for i in range(num_lags):
+            if (t - lags[i]) >= 0:
+                outgoing = resids[t - lags[i]] * resids[t - lags[i]]
+            else:
+                outgoing = backcast
+            window_sums[i] += resid2 - outgoing
+            # Recompute once per window and when removing a large or
+            # non-finite value from the running sum has lost precision
+            if ((t + 1) % lags[i] == 0 or not outgoing <= window_sums[i]
+                    or not window_sums[i] <= DBL_MAX):
+                window_sums[i] = 0.0
+                for j in range(t + 1 - lags[i], t + 1):
+                    if j >= 0:
+                        window_sums[i] += resids[j] * resids[j]
+                    else:
+                        window_sums[i] += backcast
+
     return np.asarray(sigma2)
 
+
 def arch_recursion(double[::1] parameters,
                    double[::1] resids,
                    double[::1] sigma2,
@@ -333,3 +357,394 @@ def midas_recursion(double[::1] parameters,
                 sigma2[t] = var_bounds[t, 1] + log(sigma2[t] / var_bounds[t, 1])
 
     return np.asarray(sigma2)
+
+
+def ewma_components_recursion(double[::1] mus,
+                              double[::1] weights,
+                              double[::1] resids,
+                              double[::1] sigma2,
+                              double[::1] components,
+                              int nobs,
+                              double[::1] backcast):
+    """
+    Parameters
+    ----------
+    mus : 1-d array, float64
+        Smoothing parameters of the EWMA components
+    weights : 1-d array, float64
+        Combination weights of the EWMA components
+    resids : 1-d array, float64
+        Residuals to use in the recursion
+    sigma2 : 1-d array, float64
+        Conditional variances with same shape as resids
+    components : 1-d array, float64
+        Array with one element per component.  Contains the variance of
+        each EWMA component at the final observation on exit.
+    nobs : int
+        Length of resids
+    backcast : 1-d array, float64
+        Values to use when initializing each component
+    """
+    cdef Py_ssize_t t, k, kmax
+    cdef double resid2
+
+    kmax = mus.shape[0]
+    sigma2[0] = 0.0
+    for k in range(kmax):
+        components[k] = backcast[k]
+        sigma2[0] += weights[k] * components[k]
+    for t in range(1, nobs):
+        resid2 = resids[t - 1] * resids[t - 1]
+        sigma2[t] = 0.0
+        for k in range(kmax):
+            components[k] = (1 - mus[k]) * resid2 + mus[k] * components[k]
+            sigma2[t] += weights[k] * components[k]
+
+    return np.asarray(sigma2)
+
+
+def garch_simulation(double[::1] parameters,
+                     double[:, ::1] errors,
+                     double[:, ::1] data,
+                     double[:, ::1] sigma2,
+                     double[:, ::1] fdata,
+                     double[:, ::1] fsigma,
+                     int p,
+                     int o,
+                     int q,
+                     double power,
+                     int start):
+    """
+    Simulate data from GARCH and related models
+
+    Parameters
+    ----------
+    parameters : 1-d array, float64
+        Model parameters
+    errors : 2-d array, float64
+        Standardized shocks used in the simulation where each row is an
+        independent path
+    data : 2-d array, float64
+        Simulated data with same shape as errors
+    sigma2 : 2-d array, float64
+        Conditional variances with same shape as errors
+    fdata : 2-d array, float64
+        Absolute value of data raised to the power in the model
+    fsigma : 2-d array, float64
+        Conditional variances raised to power / 2
+    p : int
+        Number of symmetric innovations in model
+    o : int
+        Number of asymmetric innovations in model
+    q : int
+        Number of lags of the (transformed) variance in the model
+    power : float64
+        Power used in the model
+    start : int
+        First observation to simulate.  Values of all arrays before start
+        must be initialized.
+    """
+    cdef Py_ssize_t i, t, npaths, nobs
+    cdef int j, loc
+
+    npaths = errors.shape[0]
+    nobs = errors.shape[1]
+    for i in range(npaths):
+        for t in range(start, nobs):
+            loc = 0
+            fsigma[i, t] = parameters[loc]
+            loc += 1
+            for j in range(p):
+                fsigma[i, t] += parameters[loc] * fdata[i, t - 1 - j]
+                loc += 1
+            for j in range(o):
+                fsigma[i, t] += parameters[loc] * fdata[i, t - 1 - j] * (data[i, t - 1 - j] < 0)
+                loc += 1
+            for j in range(q):
+                fsigma[i, t] += parameters[loc] * fsigma[i, t - 1 - j]
+                loc += 1
+            if power == 2.0:
+                sigma2[i, t] = fsigma[i, t]
+                data[i, t] = errors[i, t] * sqrt(sigma2[i, t])
+                fdata[i, t] = data[i, t] * data[i, t]
+            else:
+                sigma2[i, t] = pow(fsigma[i, t], 2.0 / power)
+                data[i, t] = errors[i, t] * sqrt(sigma2[i, t])
+                fdata[i, t] = pow(fabs(data[i, t]), power)
+
+    return np.asarray(sigma2)
+
+
+def harch_simulation(double[::1] parameters,
+                     int[::1] lags,
+                     double[:, ::1] errors,
+                     double[:, ::1] data,
+                     double[:, ::1] sigma2,
+                     int start):
+    """
+    Simulate data from HARCH models
+
+    Parameters
+    ----------
+    parameters : 1-d array, float64
+        Model parameters
+    lags : 1-d array, int32
+        Lag lengths in the HARCH
+    errors : 2-d array, float64
+        Standardized shocks used in the simulation where each row is an
+        independent path
+    data : 2-d array, float64
+        Simulated data with same shape as errors
+    sigma2 : 2-d array, float64
+        Conditional variances with same shape as errors
+    start : int
+        First observation to simulate.  Values of data and sigma2 before
+        start must be initialized.
+    """
+    cdef Py_ssize_t i, t, k, npaths, nobs, num_lags
+    cdef int j
+    cdef double data2, outgoing
+    cdef double[::1] window_sums, scaled_params
+
+    npaths = errors.shape[0]
+    nobs = errors.shape[1]
+    num_lags = lags.shape[0]
+    window_sums = np.empty(num_lags, dtype=np.float64)
+    scaled_params = np.empty(num_lags, dtype=np.float64)
+    for k in range(num_lags):
+        scaled_params[k] = parameters[1 + k] / lags[k]
+
+    for i in range(npaths):
+        for k in range(num_lags):
+            window_sums[k] = 0.0
+            for j in range(lags[k]):
+                window_sums[k] += data[i, start - 1 - j] * data[i, start - 1 - j]
+        for t in range(start, nobs):
+            sigma2[i, t] = parameters[0]
+            for k in range(num_lags):
+                sigma2[i, t] += scaled_params[k] * window_sums[k]
+            data[i, t] = errors[i, t] * sqrt(sigma2[i, t])
+
+            data2 = data[i, t] * data[i, t]
+            for k in range(num_lags):
+                outgoing = data[i, t - lags[k]] * data[i, t - lags[k]]
+                window_sums[k] += data2 - outgoing
+                # Recompute once per window and when removing a large or
+                # non-finite value from the running sum has lost precision
+                if ((t + 1 - start) % lags[k] == 0 or not outgoing <= window_sums[k]
+                        or not window_sums[k] <= DBL_MAX):
+                    window_sums[k] = 0.0
+                    for j in range(lags[k]):
+                        window_sums[k] += data[i, t - j] * data[i, t - j]
+
+    return np.asarray(sigma2)
+
+
+def egarch_simulation(double[::1] parameters,
+                      double[:, ::1] errors,
+                      double[:, ::1] lnsigma2,
+                      int p,
+                      int o,
+                      int q,
+                      int start):
+    """
+    Simulate the log variance of EGARCH models
+
+    Parameters
+    ----------
+    parameters : 1-d array, float64
+        Model parameters
+    errors : 2-d array, float64
+        Standardized shocks used in the simulation where each row is an
+        independent path
+    lnsigma2 : 2-d array, float64
+        Log of the conditional variances with same shape as errors
+    p : int
+        Number of symmetric innovations in model
+    o : int
+        Number of asymmetric innovations in model
+    q : int
+        Number of lags of the log variance in the model
+    start : int
+        First observation to simulate.  Values of lnsigma2 before start must
+        be initialized.
+    """
+    cdef Py_ssize_t i, t, npaths, nobs
+    cdef int j, loc
+    cdef double norm_const = 0.79788456080286541  # E[abs(e)], e~N(0,1)
+
+    npaths = errors.shape[0]
+    nobs = errors.shape[1]
+    for i in range(npaths):
+        for t in range(start, nobs):
+            loc = 0
+            lnsigma2[i, t] = parameters[loc]
+            loc += 1
+            for j in range(p):
+                lnsigma2[i, t] += parameters[loc] * (fabs(errors[i, t - 1 - j]) - norm_const)
+                loc += 1
+            for j in range(o):
+                lnsigma2[i, t] += parameters[loc] * errors[i, t - 1 - j]
+                loc += 1
+            for j in range(q):
+                lnsigma2[i, t] += parameters[loc] * lnsigma2[i, t - 1 - j]
+                loc += 1
+
+    return np.asarray(lnsigma2)
+
+
+def midas_simulation(double omega,
+                     double[::1] aw,
+                     double[::1] gw,
+                     double[:, ::1] errors,
+                     double[:, ::1] data,
+                     double[:, ::1] sigma2):
+    """
+    Simulate data from MIDAS Hyperbolic models
+
+    Parameters
+    ----------
+    omega : float64
+        Intercept
+    aw : 1-d array, float64
+        Weights on lagged squared data
+    gw : 1-d array, float64
+        Weights on lagged squared data when the data are negative
+    errors : 2-d array, float64
+        Standardized shocks used in the simulation where each row is an
+        independent path
+    data : 2-d array, float64
+        Simulated data with same shape as errors
+    sigma2 : 2-d array, float64
+        Conditional variances with same shape as errors
+
+    Notes
+    -----
+    The first m values of each row of data and sigma2, where m is the number
+    of weights, must be initialized.  The sign of these values is ignored.
+    """
+    cdef Py_ssize_t i, t, k, m, npaths, nobs
+    cdef double coef
+
+    npaths = errors.shape[0]
+    nobs = errors.shape[1]
+    m = aw.shape[0]
+    for i in range(npaths):
+        for t in range(m, nobs):
+            sigma2[i, t] = omega
+            for k in range(m):
+                if t - 1 - k < m:
+                    coef = aw[k] + 0.5 * gw[k]
+                else:
+                    coef = aw[k] + gw[k] * (data[i, t - 1 - k] < 0)
+                sigma2[i, t] += coef * data[i, t - 1 - k] * data[i, t - 1 - k]
+            data[i, t] = errors[i, t] * sqrt(sigma2[i, t])
+
+    return np.asarray(sigma2)
+
+
+def figarch_simulation(double omega,
+                       double[::1] lam,
+                       double[:, ::1] errors,
+                       double[:, ::1] data,
+                       double[:, ::1] sigma2,
+                       double[:, ::1] fdata,
+                       double[:, ::1] fsigma,
+                       double power):
+    """
+    Simulate data from FIGARCH models
+
+    Parameters
+    ----------
+    omega : float64
+        Intercept of the ARCH(infinity) representation
+    lam : 1-d array, float64
+        Weights of the ARCH(infinity) representation
+    errors : 2-d array, float64
+        Standardized shocks used in the simulation where each row is an
+        independent path
+    data : 2-d array, float64
+        Simulated data with same shape as errors
+    sigma2 : 2-d array, float64
+        Conditional variances with same shape as errors
+    fdata : 2-d array, float64
+        Absolute value of data raised to the power in the model
+    fsigma : 2-d array, float64
+        Conditional variances raised to power / 2
+    power : float64
+        Power used in the model
+
+    Notes
+    -----
+    The first m values of each row of all arrays, where m is the number of
+    weights, must be initialized.
+    """
+    cdef Py_ssize_t i, t, k, m, npaths, nobs
+
+    npaths = errors.shape[0]
+    nobs = errors.shape[1]
+    m = lam.shape[0]
+    for i in range(npaths):
+        for t in range(m, nobs):
+            fsigma[i, t] = omega
+            for k in range(m):
+                fsigma[i, t] += lam[k] * fdata[i, t - 1 - k]
+            if power == 2.0:
+                sigma2[i, t] = fsigma[i, t]
+                data[i, t] = errors[i, t] * sqrt(sigma2[i, t])
+                fdata[i, t] = data[i, t] * data[i, t]
+            else:
+                sigma2[i, t] = pow(fsigma[i, t], 2.0 / power)
+                data[i, t] = errors[i, t] * sqrt(sigma2[i, t])
+                fdata[i, t] = pow(fabs(data[i, t]), power)
+
+    return np.asarray(sigma2)
+
+
+def ewma_components_simulation(double[::1] mus,
+                               double[::1] weights,
+                               double[:, ::1] errors,
+                               double[:, ::1] data,
+                               double[:, ::1] sigma2,
+                               double[:, ::1] components):
+    """
+    Simulate data from a weighted average of EWMA variance components
+
+    Parameters
+    ----------
+    mus : 1-d array, float64
+        Smoothing parameters of the EWMA components
+    weights : 1-d array, float64
+        Combination weights of the EWMA components
+    errors : 2-d array, float64
+        Standardized shocks used in the simulation where each row is an
+        independent path
+    data : 2-d array, float64
+        Simulated data with same shape as errors
+    sigma2 : 2-d array, float64
+        Conditional variances with same shape as errors
+    components : 2-d array, float64
+        Number of paths by number of components array containing the
+        initial variance of each EWMA component.  Contains the final
+        variances on exit.
+
+    Notes
+    -----
+    The first value of each row of data must be initialized.
+    """
+    cdef Py_ssize_t i, t, k, kmax, npaths, nobs
+    cdef double data2
+
+    npaths = errors.shape[0]
+    nobs = errors.shape[1]
+    kmax = mus.shape[0]
+    for i in range(npaths):
+        for t in range(1, nobs):
+            data2 = data[i, t - 1] * data[i, t - 1]
+            sigma2[i, t] = 0.0
+            for k in range(kmax):
+                components[i, k] = mus[k] * components[i, k] + (1 - mus[k]) * data2
+                sigma2[i, t] += weights[k] * components[i, k]
+            data[i, t] = sqrt(sigma2[i, t]) * errors[i, t]
+
+    return np.asarray(sigma2)
@@ -11,7 +11,9 @@ from arch.compat.python import range
 import numpy as np
 
 __all__ = ['harch_recursion', 'arch_recursion', 'garch_recursion', 'egarch_recursion',
-           'midas_recursion']
+           'midas_recursion', 'ewma_components_recursion', 'garch_simulation',
+           'harch_simulation', 'egarch_simulation', 'midas_simulation', 'figarch_simulation',
+           'ewma_components_simulation']
 
 LNSIGMA_MAX = np.log(np.finfo(np.double).max) - .1
 
@@ -50,20 +52,48 @@ def harch_recursion_python(parameters, resids, sigma2, lags, nobs, backcast,
     var_bounds : ndarray
         nobs by 2-element array of upper and lower bounds for conditional
         variances for each time period
+
+    Notes
+    -----
+    The sum of the squared residuals in each window is updated as the window
+    moves so that the cost is O(nobs * number of lags). Each sum is
+    recomputed once per window length, and whenever the value leaving the
+    window is larger than the remaining sum, so that rounding errors from
+    large residuals do not persist.
     """
 
+    num_lags = lags.shape[0]
+    # Running sums of the squared residuals in each window
+    window_sums = np.empty(num_lags)
+    scaled_params = np.empty(num_lags)
+    for i in range(num_lags):
+        window_sums[i] = lags[i] * backcast
+        scaled_params[i] = parameters[i + 1] / lags[i]
+
     for t in range(nobs):
         sigma2[t] = parameters[0]
-        for i in range(lags.shape[0]):
-            param = parameters[i + 1] / lags[i]
-            for j in range(lags[i]):
-                if (t - j - 1) >= 0:
-                    sigma2[t] += param * resids[t - j - 1] * resids[t - j - 1]
-                else:
-                    sigma2[t] += param * backcast
-
+        for i in range(num_lags):
+            sigma2[t] += scaled_params[i] * window_sums[i]
         sigma2[t] = bounds_check(sigma2[t], var_bounds[t])
 
+        resid2 = resids[t] * resids[t]
+        for i in range(num_lags):
+            if (t - lags[i]) >= 0:
+                outgoing = resids[t - lags[i]] * resids[t - lags[i]]
+            else:
+                outgoing = backcast
+            window_sums[i] += resid2 - outgoing
+            # Recompute once per window and when removing a large or
+            # non-finite value from the running sum has lost precision
+            if ((t + 1) % lags[i] == 0 or not outgoing <= window_sums[i] or
+                    not np.isfinite(window_sums[i])):
+                window_sums[i] = 0.0
+                for j in range(t + 1 - lags[i], t + 1):
+                    if j >= 0:
+                        window_sums[i] += resids[j] * resids[j]
+                    else:
+                        window_sums[i] += backcast
+
     return sigma2
 
 
@@ -295,3 +325,347 @@ def midas_recursion_python(parameters, weights, resids, sigma2, nobs, backcast,
 
 
 midas_recursion = jit(midas_recursion_python, nopython=True)
+
+
+def ewma_components_recursion_python(mus, weights, resids, sigma2, components, nobs,
+                                     backcast):
+    """
+    Compute a weighted average of EWMA variance components in a single pass
+
+    Parameters
+    ----------
+    mus : ndarray
+        Smoothing parameters of the EWMA components
+    weights : ndarray
+        Combination weights of the EWMA components
+    resids : ndarray
+        Residuals to use in the recursion
+    sigma2 : ndarray
+        Conditional variances with same shape as resids
+    components : ndarray
+        Array with one element per component.  Contains the variance of
+        each EWMA component at the final observation on exit.
+    nobs : int
+        Length of resids
+    backcast : ndarray
+        Values to use when initializing each component
+    """
+    kmax = mus.shape[0]
+    sigma2[0] = 0.0
+    for k in range(kmax):
+        components[k] = backcast[k]
+        sigma2[0] += weights[k] * components[k]
+    for t in range(1, nobs):
+        resid2 = resids[t - 1] * resids[t - 1]
+        sigma2[t] = 0.0
+        for k in range(kmax):
+            components[k] = (1 - mus[k]) * resid2 + mus[k] * components[k]
+            sigma2[t] += weights[k] * components[k]
+
+    return sigma2
+
+
+ewma_components_recursion = jit(ewma_components_recursion_python, nopython=True)
+
+
+def garch_simulation_python(parameters, errors, data, sigma2, fdata, fsigma, p, o, q, power,
+                            start):
+    """
+    Simulate data from GARCH and related models
+
+    Parameters
+    ----------
+    parameters : ndarray
+        Model parameters
+    errors : ndarray
+        2-d array of standardized shocks used in the simulation where each
+        row is an independent path
+    data : ndarray
+        Simulated data with same shape as errors
+    sigma2 : ndarray
+        Conditional variances with same shape as errors
+    fdata : ndarray
+        Absolute value of data raised to the power in the model
+    fsigma : ndarray
+        Conditional variances raised to power / 2
+    p : int
+        Number of symmetric innovations in model
+    o : int
+        Number of asymmetric innovations in model
+    q : int
+        Number of lags of the (transformed) variance in the model
+    power : float
+        Power used in the model
+    start : int
+        First observation to simulate.  Values of all arrays before start
+        must be initialized.
+    """
+    for i in range(errors.shape[0]):
+        for t in range(start, errors.shape[1]):
+            loc = 0
+            fsigma[i, t] = parameters[loc]
+            loc += 1
+            for j in range(p):
+                fsigma[i, t] += parameters[loc] * fdata[i, t - 1 - j]
+                loc += 1
+            for j in range(o):
+                fsigma[i, t] += parameters[loc] * fdata[i, t - 1 - j] * (data[i, t - 1 - j] < 0)
+                loc += 1
+            for j in range(q):
+                fsigma[i, t] += parameters[loc] * fsigma[i, t - 1 - j]
+                loc += 1
+            if power == 2.0:
+                sigma2[i, t] = fsigma[i, t]
+                data[i, t] = errors[i, t] * np.sqrt(sigma2[i, t])
+                fdata[i, t] = data[i, t] * data[i, t]
+            else:
+                sigma2[i, t] = fsigma[i, t] ** (2.0 / power)
+                data[i, t] = errors[i, t] * np.sqrt(sigma2[i, t])
+                fdata[i, t] = np.abs(data[i, t]) ** power
+
+    return sigma2
+
+
+garch_simulation = jit(garch_simulation_python, nopython=True)
+
+
+def harch_simulation_python(parameters, lags, errors, data, sigma2, start):
+    """
+    Simulate data from HARCH models
+
+    Parameters
+    ----------
+    parameters : ndarray
+        Model parameters
+    lags : ndarray
+        Lag lengths in the HARCH
+    errors : ndarray
+        2-d array of standardized shocks used in the simulation where each
+        row is an independent path
+    data : ndarray
+        Simulated data with same shape as errors
+    sigma2 : ndarray
+        Conditional variances with same shape as errors
+    start : int
+        First observation to simulate.  Values of data and sigma2 before
+        start must be initialized.
+
+    Notes
+    -----
+    The sums of the squared data in each window are updated as the window
+    moves in the same way as in the HARCH recursion.
+    """
+    num_lags = lags.shape[0]
+    window_sums = np.empty(num_lags)
+    scaled_params = np.empty(num_lags)
+    for k in range(num_lags):
+        scaled_params[k] = parameters[1 + k] / lags[k]
+
+    for i in range(errors.shape[0]):
+        for k in range(num_lags):
+            window_sums[k] = 0.0
+            for j in range(lags[k]):
+                window_sums[k] += data[i, start - 1 - j] * data[i, start - 1 - j]
+        for t in range(start, errors.shape[1]):
+            sigma2[i, t] = parameters[0]
+            for k in range(num_lags):
+                sigma2[i, t] += scaled_params[k] * window_sums[k]
+            data[i, t] = errors[i, t] * np.sqrt(sigma2[i, t])
+
+            data2 = data[i, t] * data[i, t]
+            for k in range(num_lags):
+                outgoing = data[i, t - lags[k]] * data[i, t - lags[k]]
+                window_sums[k] += data2 - outgoing
+                # Recompute once per window and when removing a large or
+                # non-finite value from the running sum has lost precision
+                if ((t + 1 - start) % lags[k] == 0 or not outgoing <= window_sums[k] or
+                        not np.isfinite(window_sums[k])):
+                    window_sums[k] = 0.0
+                    for j in range(lags[k]):
+                        window_sums[k] += data[i, t - j] * data[i, t - j]
+
+    return sigma2
+
+
+harch_simulation = jit(harch_simulation_python, nopython=True)
+
+
+def egarch_simulation_python(parameters, errors, lnsigma2, p, o, q, start):
+    """
+    Simulate the log variance of EGARCH models
+
+    Parameters
+    ----------
+    parameters : ndarray
+        Model parameters
+    errors : ndarray
+        2-d array of standardized shocks used in the simulation where each
+        row is an independent path
+    lnsigma2 : ndarray
+        Log of the conditional variances with same shape as errors
+    p : int
+        Number of symmetric innovations in model
+    o : int
+        Number of asymmetric innovations in model
+    q : int
+        Number of lags of the log variance in the model
+    start : int
+        First observation to simulate.  Values of lnsigma2 before start must
+        be initialized.
+    """
+    norm_const = 0.79788456080286541  # E[abs(e)], e~N(0,1)
+
+    for i in range(errors.shape[0]):
+        for t in range(start, errors.shape[1]):
+            loc = 0
+            lnsigma2[i, t] = parameters[loc]
+            loc += 1
+            for j in range(p):
+                lnsigma2[i, t] += parameters[loc] * (np.abs(errors[i, t - 1 - j]) - norm_const)
+                loc += 1
+            for j in range(o):
+                lnsigma2[i, t] += parameters[loc] * errors[i, t - 1 - j]
+                loc += 1
+            for j in range(q):
+                lnsigma2[i, t] += parameters[loc] * lnsigma2[i, t - 1 - j]
+                loc += 1
+
+    return lnsigma2
+
+
+egarch_simulation = jit(egarch_simulation_python, nopython=True)
+
+
+def midas_simulation_python(omega, aw, gw, errors, data, sigma2):
+    """
+    Simulate data from MIDAS Hyperbolic models
+
+    Parameters
+    ----------
+    omega : float
+        Intercept
+    aw : ndarray
+        Weights on lagged squared data
+    gw : ndarray
+        Weights on lagged squared data when the data are negative
+    errors : ndarray
+        2-d array of standardized shocks used in the simulation where each
+        row is an independent path
+    data : ndarray
+        Simulated data with same shape as errors
+    sigma2 : ndarray
+        Conditional variances with same shape as errors
+
+    Notes
+    -----
+    The first m values of each row of data and sigma2, where m is the number
+    of weights, must be initialized.  The sign of these values is ignored.
+    """
+    m = aw.shape[0]
+    for i in range(errors.shape[0]):
+        for t in range(m, errors.shape[1]):
+            sigma2[i, t] = omega
+            for k in range(m):
+                if t - 1 - k < m:
+                    coef = aw[k] + 0.5 * gw[k]
+                else:
+                    coef = aw[k] + gw[k] * (data[i, t - 1 - k] < 0)
+                sigma2[i, t] += coef * data[i, t - 1 - k] * data[i, t - 1 - k]
+            data[i, t] = errors[i, t] * np.sqrt(sigma2[i, t])
+
+    return sigma2
+
+
+midas_simulation = jit(midas_simulation_python, nopython=True)
+
+
+def figarch_simulation_python(omega, lam, errors, data, sigma2, fdata, fsigma, power):
+    """
+    Simulate data from FIGARCH models
+
+    Parameters
+    ----------
+    omega : float
+        Intercept of the ARCH(infinity) representation
+    lam : ndarray
+        Weights of the ARCH(infinity) representation
+    errors : ndarray
+        2-d array of standardized shocks used in the simulation where each
+        row is an independent path
+    data : ndarray
+        Simulated data with same shape as errors
+    sigma2 : ndarray
+        Conditional variances with same shape as errors
+    fdata : ndarray
+        Absolute value of data raised to the power in the model
+    fsigma : ndarray
+        Conditional variances raised to power / 2
+    power : float
+        Power used in the model
+
+    Notes
+    -----
+    The first m values of each row of all arrays, where m is the number of
+    weights, must be initialized.
+    """
+    m = lam.shape[0]
+    for i in range(errors.shape[0]):
+        for t in range(m, errors.shape[1]):
+            fsigma[i, t] = omega
+            for k in range(m):
+                fsigma[i, t] += lam[k] * fdata[i, t - 1 - k]
+            if power == 2.0:
+                sigma2[i, t] = fsigma[i, t]
+                data[i, t] = errors[i, t] * np.sqrt(sigma2[i, t])
+                fdata[i, t] = data[i, t] * data[i, t]
+            else:
+                sigma2[i, t] = fsigma[i, t] ** (2.0 / power)
+                data[i, t] = errors[i, t] * np.sqrt(sigma2[i, t])
+                fdata[i, t] = np.abs(data[i, t]) ** power
+
+    return sigma2
+
+
+figarch_simulation = jit(figarch_simulation_python, nopython=True)
+
+
+def ewma_components_simulation_python(mus, weights, errors, data, sigma2, components):
+    """
+    Simulate data from a weighted average of EWMA variance components
+
+    Parameters
+    ----------
+    mus : ndarray
+        Smoothing parameters of the EWMA components
+    weights : ndarray
+        Combination weights of the EWMA components
+    errors : ndarray
+        2-d array of standardized shocks used in the simulation where each
+        row is an independent path
+    data : ndarray
+        Simulated data with same shape as errors
+    sigma2 : ndarray
+        Conditional variances with same shape as errors
+    components : ndarray
+        Number of paths by number of components array containing the
+        initial variance of each EWMA component.  Contains the final
+        variances on exit.
+
+    Notes
+    -----
+    The first value of each row of data must be initialized.
+    """
+    kmax = mus.shape[0]
+    for i in range(errors.shape[0]):
+        for t in range(1, errors.shape[1]):
+            data2 = data[i, t - 1] * data[i, t - 1]
+            sigma2[i, t] = 0.0
+            for k in range(kmax):
+                components[i, k] = mus[k] * components[i, k] + (1 - mus[k]) * data2
+                sigma2[i, t] += weights[k] * components[i, k]
+            data[i, t] = np.sqrt(sigma2[i, t]) * errors[i, t]
+
+    return sigma2
+
+
+ewma_components_simulation = jit(ewma_components_simulation_python, nopython=True)
@@ -10,23 +10,55 @@ import itertools
 from warnings import warn
 
 import numpy as np
-from numpy.random import RandomState
-from scipy.special import gammaln
+from scipy.signal import lfilter
+from scipy.special import gammaln, log_ndtr, logsumexp
 
 from arch.compat.python import add_metaclass, range
 from arch.univariate.distribution import Normal
+from arch.univariate.filters import bounds_check, fir_filter, garch_filter, prefer_fft
 from arch.utility.exceptions import initial_value_warning, InitialValueWarning
 from arch.utility.array import ensure1d, AbstractDocStringInheritor
+from arch.utility.rng import (check_random_state, indexed_generator, is_seed_sequence,
+                              random_sample)
 
 try:
     from arch.univariate.recursions import (garch_recursion, harch_recursion,
-                                            egarch_recursion, midas_recursion)
+                                            egarch_recursion, midas_recursion,
+                                            ewma_components_recursion, garch_simulation,
+                                            harch_simulation, egarch_simulation,
+                                            midas_simulation, figarch_simulation,
+                                            ewma_components_simulation)
 except ImportError:  # pragma: no cover
     from arch.univariate.recursions_python import (garch_recursion, harch_recursion,
-                                                   egarch_recursion, midas_recursion)
+                                                   egarch_recursion, midas_recursion,
+                                                   ewma_components_recursion,
+                                                   garch_simulation, harch_simulation,
+                                                   egarch_simulation, midas_simulation,
+                                                   figarch_simulation,
+                                                   ewma_components_simulation)
 
 __all__ = ['GARCH', 'ARCH', 'HARCH', 'ConstantVariance', 'EWMAVariance', 'RiskMetrics2006',
-           'EGARCH', 'FixedVariance', 'BootstrapRng', 'MIDASHyperbolic', 'VolatilityProcess']
+           'EGARCH', 'FIGARCH', 'FixedVariance', 'BootstrapRng', 'MIDASHyperbolic',
+           'VolatilityProcess']
+
+# Number of values generated at a time when simulating for many forecast origins
+SIMULATION_BLOCK_ELEMENTS = 2 ** 20
+
+
+def _draw_paths(rng, nobs, repetitions):
+    """Standardized shocks with one row per simulated path"""
+    if repetitions is None:
+        errors = rng(nobs)[None, :]
+    else:
+        errors = rng((int(repetitions), nobs))
+    return np.ascontiguousarray(errors, dtype=np.float64)
+
+
+def _paths_output(repetitions, *arrays):
+    """Drop the path dimension when simulating a single path"""
+    if repetitions is None:
+        return tuple(a[0] for a in arrays)
+    return arrays
 
 
 def _common_names(p, o, q):
@@ -48,8 +80,20 @@ class BootstrapRng(object):
         Array containing standardized residuals
     start : int
         Location of first forecast
-    random_state : RandomState, optional
-        NumPy RandomState instance
+    random_state : {RandomState, Generator, SeedSequence}, optional
+        NumPy RandomState or Generator instance.  If a SeedSequence, an
+        independent Generator is used for each origin so that the indices
+        drawn for an origin do not depend on ``start``.
+
+    Notes
+    -----
+    Each call to the function returned by ``rng`` samples from the
+    standardized residuals up to and including the current origin and then
+    advances the origin.  Indices for a block of consecutive origins are
+    drawn using a single call to the random number generator.  The values
+    are identical to drawing the indices one origin at a time as long as
+    the random state is not used elsewhere while the shocks are consumed
+    and the size of the requested array does not change.
     """
 
     def __init__(self, std_resid, start, random_state=None):
@@ -59,25 +103,49 @@ class BootstrapRng(object):
         self.std_resid = std_resid
         self.start = start
         self._index = start
-        if random_state is None:
-            random_state = RandomState()
-        if not isinstance(random_state, RandomState):
-            raise TypeError('random_state must be a RandomState instance')
-        self._random_state = random_state
+        self._seed = None
+        if is_seed_sequence(random_state):
+            self._seed = random_state
+            random_state = indexed_generator(random_state, start)
+        self._random_state = check_random_state(random_state)
+        self._block = None
+        self._block_size = None
+        self._block_loc = 0
 
     @property
     def random_state(self):
         return self._random_state
 
+    def _fill_block(self, size):
+        """Draw the shocks for a block of consecutive origins"""
+        count = self.std_resid.shape[0] - self._index
+        count = max(1, min(count, SIMULATION_BLOCK_ELEMENTS // max(int(np.prod(size)), 1)))
+        origins = self._index + np.arange(count)
+        if self._seed is None:
+            index = random_sample(self._random_state, (count,) + size)
+        else:
+            index = np.empty((count,) + size)
+            for i, origin in enumerate(origins):
+                self._random_state = indexed_generator(self._seed, origin)
+                index[i] = random_sample(self._random_state, size)
+        scale = (origins + 1).reshape((count,) + (1,) * len(size))
+        int_index = np.floor(scale * index).astype(np.int64)
+        self._block = self.std_resid[int_index]
+        self._block_size = size
+        self._block_loc = 0
+
     def rng(self):
         def _rng(size):
             if self._index >= self.std_resid.shape[0]:
                 raise IndexError('not enough data points.')
-            index = self._random_state.random_sample(size)
-            int_index = np.floor((self._index + 1) * index)
-            int_index = int_index.astype(np.int64)
+            size = tuple(np.atleast_1d(size).astype(np.int64).tolist())
+            if (self._block is None or size != self._block_size or
+                    self._block_loc >= self._block.shape[0]):
+                self._fill_block(size)
+            shocks = self._block[self._block_loc]
+            self._block_loc += 1
             self._index += 1
-            return self.std_resid[int_index]
+            return shocks
 
         return _rng
 
@@ -145,6 +213,8 @@ class VolatilityProcess(object):
         self._min_bootstrap_obs = 100
         self._start = 0
         self._stop = -1
+        # Analytic forecasts depend on the distribution of the shocks
+        self._uses_quadrature = False
 
     def __str__(self):
         return self.name
@@ -317,8 +387,8 @@ class VolatilityProcess(object):
         simulations : int
             Number of simulations to run when computing the forecast using
             either simulation or bootstrap.
-        random_state : {RandomState, None}
-            NumPy RandomState instance to use in the BootstrapRng
+        random_state : {RandomState, Generator, SeedSequence, None}
+            NumPy RandomState or Generator instance to use in the BootstrapRng
 
         Returns
         -------
@@ -351,24 +421,30 @@ class VolatilityProcess(object):
         -------
         var_bounds : ndarray
             Array containing columns of lower and upper bounds with the same
-            number of elements as resids
+            number of elements as resids. If resids is nobs by k, then
+            var_bounds is nobs by k by 2.
         """
         nobs = resids.shape[0]
 
         tau = min(75, nobs)
         w = 0.94 ** np.arange(tau)
         w = w / sum(w)
-        var_bound = np.zeros(nobs)
         initial_value = w.dot(resids[:tau] ** 2.0)
-        ewma_recursion(0.94, resids, var_bound, resids.shape[0], initial_value)
-
-        var_bounds = np.vstack((var_bound / 1e6, var_bound * 1e6)).T
-        var = resids.var()
-        min_upper_bound = 1 + (resids ** 2.0).max()
-        lower_bound, upper_bound = var / 1e8, 1e7 * (1 + (resids ** 2.0).max())
-        var_bounds[var_bounds[:, 0] < lower_bound, 0] = lower_bound
-        var_bounds[var_bounds[:, 1] < min_upper_bound, 1] = min_upper_bound
-        var_bounds[var_bounds[:, 1] > upper_bound, 1] = upper_bound
+        if resids.ndim == 1:
+            var_bound = np.zeros(nobs)
+            ewma_recursion(0.94, resids, var_bound, resids.shape[0], initial_value)
+        else:
+            var_bound = garch_filter(np.array([0.0, 0.06, 0.94]), resids ** 2.0, resids,
+                                     1, 0, 1, initial_value)
+
+        var = resids.var(0)
+        min_upper_bound = 1 + (resids ** 2.0).max(0)
+        lower_bound, upper_bound = var / 1e8, 1e7 * min_upper_bound
+        var_bounds = np.empty(var_bound.shape + (2,))
+        lower, upper = var_bounds[..., 0], var_bounds[..., 1]
+        np.maximum(var_bound / 1e6, lower_bound, out=lower)
+        np.maximum(var_bound * 1e6, min_upper_bound, out=upper)
+        np.minimum(upper, upper_bound, out=upper)
 
         if power != 2.0:
             var_bounds **= (power / 2.0)
@@ -466,6 +542,98 @@ class VolatilityProcess(object):
         """
         pass
 
+    def filter_variances(self, parameters, resids, backcast=None, var_bounds=None):
+        """
+        Compute the conditional variances of many series at once
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Model parameters
+        resids : ndarray
+            nobs by k array of mean zero residuals where each column is a
+            series
+        backcast : {float, ndarray}, optional
+            User-provided value to use when initializing the recursion,
+            either common to all series or one value for each series.  If not
+            provided, computed from each series.
+        var_bounds : ndarray, optional
+            nobs by 2 array of lower and upper bounds common to all series, or
+            nobs by k by 2 array of bounds for each series.  If not provided,
+            computed from each series.
+
+        Returns
+        -------
+        sigma2 : ndarray
+            nobs by k array of conditional variances
+
+        Notes
+        -----
+        Processes that are linear in lagged (transformed) squared residuals
+        are evaluated for all series at once using linear filters. Series
+        where a conditional variance falls outside of the variance bounds
+        are recomputed using compute_variance so that the bounds are applied
+        exactly as in estimation.  Other processes use compute_variance for
+        each series.
+        """
+        resids = np.asarray(resids, dtype=np.float64)
+        if resids.ndim != 2:
+            raise ValueError('resids must be a 2-dimensional array')
+        nobs, k = resids.shape
+        if backcast is None:
+            backcast = [self.backcast(resids[:, i]) for i in range(k)]
+        else:
+            if np.ndim(backcast) == 0:
+                backcast = [backcast] * k
+            backcast = [self.backcast_transform(bc) for bc in backcast]
+        if var_bounds is None:
+            var_bounds = self.variance_bounds(resids)
+        var_bounds = np.asarray(var_bounds, dtype=np.float64)
+        if var_bounds.ndim == 2:
+            var_bounds = np.broadcast_to(var_bounds[:, None, :], (nobs, k, 2))
+
+        sigma2 = self._filter_variances(parameters, resids, backcast, var_bounds)
+        if sigma2 is None:
+            sigma2 = np.empty((nobs, k))
+            recompute = np.arange(k)
+        else:
+            sigma2, exact = sigma2
+            recompute = np.flatnonzero(~exact)
+
+        for i in recompute:
+            bounds = np.array(var_bounds[:, i])
+            sigma2_i = np.empty(nobs)
+            self.compute_variance(parameters, np.ascontiguousarray(resids[:, i]), sigma2_i,
+                                  backcast[i], bounds)
+            sigma2[:, i] = sigma2_i
+
+        return sigma2
+
+    def _filter_variances(self, parameters, resids, backcast, var_bounds):
+        """
+        Compute conditional variances for many series using linear filters
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Model parameters
+        resids : ndarray
+            nobs by k array of mean zero residuals
+        backcast : list
+            Transformed backcast values for each series
+        var_bounds : ndarray
+            nobs by k by 2 array of variance bounds
+
+        Returns
+        -------
+        filtered : {None, tuple}
+            None if the process cannot be filtered. Otherwise contains
+            the nobs by k array of conditional variances and a k-element
+            boolean array indicating which series do not require the
+            variance bounds.
+        """
+        return None
+
     @abstractmethod
     def constraints(self):
         """
@@ -487,7 +655,8 @@ class VolatilityProcess(object):
         pass
 
     def forecast(self, parameters, resids, backcast, var_bounds, start=None, horizon=1,
-                 method='analytic', simulations=1000, rng=None, random_state=None):
+                 method='analytic', simulations=1000, rng=None, random_state=None,
+                 distribution=None, dist_params=None):
         """
         Forecast volatility from the model
 
@@ -516,8 +685,18 @@ class VolatilityProcess(object):
             Callable random number generator required if method is
             'simulation'. Must take a single shape input and return random
             samples numbers with that shape.
-        random_state : RandomState, optional
-            NumPy RandomState instance to use when method is 'bootstrap'
+        random_state : {RandomState, Generator, SeedSequence}, optional
+            NumPy RandomState or Generator instance to use when method is
+            'bootstrap'.  If a SeedSequence, each forecast origin uses an
+            independent stream so that forecasts for an origin are identical
+            when the sample of origins is split across workers.
+        distribution : Distribution, optional
+            Distribution of the standardized shocks. Only used by processes
+            whose analytic forecasts depend on the distribution of the
+            shocks, such as EGARCH.  If not provided, the shocks are assumed
+            to be standard normal.
+        dist_params : ndarray, optional
+            Parameters of distribution
 
         Returns
         -------
@@ -546,6 +725,9 @@ class VolatilityProcess(object):
 
         start = len(resids) - 1 if start is None else start
         if method == 'analytic':
+            if self._uses_quadrature:
+                return self._analytic_forecast(parameters, resids, backcast, var_bounds, start,
+                                               horizon, distribution, dist_params)
             return self._analytic_forecast(parameters, resids, backcast, var_bounds, start,
                                            horizon)
         elif method == 'simulation':
@@ -560,7 +742,8 @@ class VolatilityProcess(object):
                                             horizon, simulations, random_state)
 
     @abstractmethod
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
         """
         Simulate data from the model
 
@@ -572,13 +755,18 @@ class VolatilityProcess(object):
             Number of data points to simulate
         rng : callable
             Callable function that takes a single integer input and returns
-            a vector of random numbers
+            a vector of random numbers.  If repetitions is provided, it must
+            also accept a tuple containing the shape of the draws.
         burn : int, optional
             Number of additional observations to generate when initializing
             the simulation
         initial_value : {float, ndarray}, optional
             Scalar or array of initial values to use when initializing the
             simulation
+        repetitions : int, optional
+            Number of independent paths to simulate in a single pass.  If
+            provided, the simulated values are returned as repetitions by
+            nobs arrays.
 
         Returns
         -------
@@ -612,6 +800,13 @@ class VolatilityProcess(object):
         pass
 
 
+def _within_bounds(sigma2, var_bounds):
+    """Series where all values are inside the variance bounds"""
+    inside = sigma2 >= var_bounds[..., 0]
+    inside &= sigma2 <= var_bounds[..., 1]
+    return inside.all(0)
+
+
 class ConstantVariance(VolatilityProcess):
     r"""
     Constant volatility process
@@ -634,11 +829,12 @@ class ConstantVariance(VolatilityProcess):
     def starting_values(self, resids):
         return np.array([resids.var()])
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
-        errors = rng(nobs + burn)
-        sigma2 = np.ones(nobs + burn) * parameters[0]
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
+        errors = _draw_paths(rng, nobs + burn, repetitions)
+        sigma2 = np.full_like(errors, parameters[0])
         data = np.sqrt(sigma2) * errors
-        return data[burn:], sigma2[burn:]
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def constraints(self):
         return np.ones((1, 1)), np.zeros(1)
@@ -853,6 +1049,15 @@ class GARCH(VolatilityProcess):
 
         return sigma2
 
+    def _filter_variances(self, parameters, resids, backcast, var_bounds):
+        fresids = np.abs(resids) ** self.power
+        sigma2 = garch_filter(parameters, fresids, np.sign(resids), self.p, self.o, self.q,
+                              np.array(backcast))
+        exact = _within_bounds(sigma2, var_bounds)
+        sigma2 **= 2.0 / self.power
+
+        return sigma2, exact
+
     def backcast_transform(self, backcast):
         backcast = super(GARCH, self).backcast_transform(backcast)
         return np.sqrt(backcast) ** self.power
@@ -869,9 +1074,10 @@ class GARCH(VolatilityProcess):
 
         return backcast
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
         p, o, q, power = self.p, self.o, self.q, self.power
-        errors = rng(nobs + burn)
+        errors = _draw_paths(rng, nobs + burn, repetitions)
 
         if initial_value is None:
             scale = np.ones_like(parameters)
@@ -884,37 +1090,21 @@ class GARCH(VolatilityProcess):
                 warn(initial_value_warning, InitialValueWarning)
                 initial_value = parameters[0]
 
-        sigma2 = np.zeros(nobs + burn)
-        data = np.zeros(nobs + burn)
-        fsigma = np.zeros(nobs + burn)
-        fdata = np.zeros(nobs + burn)
+        sigma2 = np.zeros_like(errors)
+        data = np.zeros_like(errors)
+        fsigma = np.zeros_like(errors)
+        fdata = np.zeros_like(errors)
 
         max_lag = np.max([p, o, q])
-        fsigma[:max_lag] = initial_value
-        sigma2[:max_lag] = initial_value ** (2.0 / power)
-        data[:max_lag] = np.sqrt(sigma2[:max_lag]) * errors[:max_lag]
-        fdata[:max_lag] = abs(data[:max_lag]) ** power
-
-        for t in range(max_lag, nobs + burn):
-            loc = 0
-            fsigma[t] = parameters[loc]
-            loc += 1
-            for j in range(p):
-                fsigma[t] += parameters[loc] * fdata[t - 1 - j]
-                loc += 1
-            for j in range(o):
-                fsigma[t] += parameters[loc] * \
-                             fdata[t - 1 - j] * (data[t - 1 - j] < 0)
-                loc += 1
-            for j in range(q):
-                fsigma[t] += parameters[loc] * fsigma[t - 1 - j]
-                loc += 1
+        fsigma[:, :max_lag] = initial_value
+        sigma2[:, :max_lag] = initial_value ** (2.0 / power)
+        data[:, :max_lag] = np.sqrt(sigma2[:, :max_lag]) * errors[:, :max_lag]
+        fdata[:, :max_lag] = abs(data[:, :max_lag]) ** power
 
-            sigma2[t] = fsigma[t] ** (2.0 / power)
-            data[t] = errors[t] * np.sqrt(sigma2[t])
-            fdata[t] = abs(data[t]) ** power
+        garch_simulation(np.asarray(parameters, dtype=np.float64), errors, data, sigma2, fdata,
+                         fsigma, p, o, q, float(power), max_lag)
 
-        return data[burn:], sigma2[burn:]
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def starting_values(self, resids):
         p, o, q = self.p, self.o, self.q
@@ -977,39 +1167,43 @@ class GARCH(VolatilityProcess):
         beta = parameters[p + o + 1:]
 
         m = np.max([p, o, q])
-        _resids = np.zeros(m + horizon)
-        _asym_resids = np.zeros(m + horizon)
-        _sigma2 = np.zeros(m + horizon)
+        # Lagged values for all origins, padded with the backcast for
+        # periods before the first observation
+        resids2 = np.empty(m + t)
+        resids2[:m] = backcast
+        resids2[m:] = resids ** 2
+        asym_resids2 = np.empty(m + t)
+        asym_resids2[:m] = 0.5 * backcast
+        asym_resids2[m:] = resids2[m:] * (resids < 0)
+        padded_sigma2 = np.empty(m + t)
+        padded_sigma2[:m] = backcast
+        padded_sigma2[m:] = sigma2[:t]
+
+        locs = np.arange(start + 1, t + 1)[:, None] + np.arange(m)
+        _resids2 = np.empty((t - start, m + horizon))
+        _resids2[:, :m] = resids2[locs]
+        _asym_resids2 = np.empty((t - start, m + horizon))
+        _asym_resids2[:, :m] = asym_resids2[locs]
+        _sigma2 = np.empty((t - start, m + horizon))
+        _sigma2[:, :m] = padded_sigma2[locs]
+
+        for h in range(0, horizon):
+            fcast = np.full(t - start, omega)
+            start_loc = h + m - 1
 
-        for i in range(start, t):
-            if i - m + 1 >= 0:
-                _resids[:m] = resids[i - m + 1:i + 1]
-                _asym_resids[:m] = _resids[:m] * (_resids[:m] < 0)
-                _sigma2[:m] = sigma2[i - m + 1:i + 1]
-            else:  # Back-casting needed
-                _resids[:m - i - 1] = np.sqrt(backcast)
-                _resids[m - i - 1: m] = resids[0:i + 1]
-                _asym_resids = _resids * (_resids < 0)
-                _asym_resids[:m - i - 1] = np.sqrt(0.5 * backcast)
-                _sigma2[:m] = backcast
-                _sigma2[m - i - 1: m] = sigma2[0:i + 1]
-
-            for h in range(0, horizon):
-                forecasts[i, h] = omega
-                start_loc = h + m - 1
-
-                for j in range(p):
-                    forecasts[i, h] += alpha[j] * _resids[start_loc - j] ** 2
-
-                for j in range(o):
-                    forecasts[i, h] += gamma[j] * _asym_resids[start_loc - j] ** 2
-
-                for j in range(q):
-                    forecasts[i, h] += beta[j] * _sigma2[start_loc - j]
-
-                _resids[h + m] = np.sqrt(forecasts[i, h])
-                _asym_resids[h + m] = np.sqrt(0.5 * forecasts[i, h])
-                _sigma2[h + m] = forecasts[i, h]
+            for j in range(p):
+                fcast += alpha[j] * _resids2[:, start_loc - j]
+
+            for j in range(o):
+                fcast += gamma[j] * _asym_resids2[:, start_loc - j]
+
+            for j in range(q):
+                fcast += beta[j] * _sigma2[:, start_loc - j]
+
+            forecasts[start:, h] = fcast
+            _resids2[:, h + m] = fcast
+            _asym_resids2[:, h + m] = 0.5 * fcast
+            _sigma2[:, h + m] = fcast
 
         forecasts[:start] = np.nan
         return VarianceForecast(forecasts)
@@ -1058,30 +1252,37 @@ class GARCH(VolatilityProcess):
 
         power = self.power
         m = np.max([self.p, self.o, self.q])
-        scaled_forecast_paths = np.zeros((simulations, m + horizon))
-        scaled_shock = np.zeros((simulations, m + horizon))
-        asym_scaled_shock = np.zeros((simulations, m + horizon))
-
-        for i in range(start, t):
-            std_shocks = rng((simulations, horizon))
-            if i - m < 0:
-                scaled_forecast_paths[:, :m] = backcast ** (power / 2.0)
-                scaled_shock[:, :m] = backcast ** (power / 2.0)
-                asym_scaled_shock[:, :m] = (0.5 * backcast) ** (power / 2.0)
-
-                count = i + 1
-                scaled_forecast_paths[:, m - count:m] = sigma2[:count] ** (power / 2.0)
-                scaled_shock[:, m - count:m] = np.abs(resids[:count]) ** power
-                asym = np.abs(resids[:count]) ** power * (resids[:count] < 0)
-                asym_scaled_shock[:, m - count:m] = asym
-            else:
-                scaled_forecast_paths[:, :m] = sigma2[i - m + 1:i + 1] ** (power / 2.0)
-                scaled_shock[:, :m] = np.abs(resids[i - m + 1:i + 1]) ** power
-                asym_scaled_shock[:, :m] = scaled_shock[:, :m] * (resids[i - m + 1:i + 1] < 0)
-
-            f, p, s = self._simulate_paths(m, parameters, horizon, std_shocks,
+        # Lagged values for each origin, padded with the backcast, so that
+        # the values used by origin i are in rows i + 1, ..., i + m
+        abs_resids = np.abs(resids) ** power
+        pad = np.full(m, backcast ** (power / 2.0))
+        scaled_sigma2 = np.concatenate((pad, sigma2 ** (power / 2.0)))
+        scaled_resids = np.concatenate((pad, abs_resids))
+        asym_pad = np.full(m, (0.5 * backcast) ** (power / 2.0))
+        asym_scaled_resids = np.concatenate((asym_pad, abs_resids * (resids < 0)))
+
+        # Simulate paths for blocks of origins at once
+        block = max(1, SIMULATION_BLOCK_ELEMENTS // (simulations * (m + horizon)))
+        for first in range(start, t, block):
+            origins = np.arange(first, min(first + block, t))
+            count = origins.shape[0]
+            std_shocks = np.concatenate([rng((simulations, horizon)) for _ in range(count)])
+            std_shocks = np.asfortranarray(std_shocks)
+            locs = np.repeat(origins + 1, simulations)[:, None] + np.arange(m)
+            # Paths are updated one column at a time
+            shape = (count * simulations, m + horizon)
+            scaled_forecast_paths = np.zeros(shape, order='F')
+            scaled_shock = np.zeros(shape, order='F')
+            asym_scaled_shock = np.zeros(shape, order='F')
+            scaled_forecast_paths[:, :m] = scaled_sigma2[locs]
+            scaled_shock[:, :m] = scaled_resids[locs]
+            asym_scaled_shock[:, :m] = asym_scaled_resids[locs]
+
+            _, p, s = self._simulate_paths(m, parameters, horizon, std_shocks,
                                            scaled_forecast_paths, scaled_shock, asym_scaled_shock)
-            forecasts[i, :], paths[i], shocks[i] = f, p, s
+            paths[origins] = p.reshape((count, simulations, horizon))
+            shocks[origins] = s.reshape((count, simulations, horizon))
+            forecasts[origins] = paths[origins].mean(1)
 
         forecasts[:start] = np.nan
         return VarianceForecast(forecasts, paths, shocks)
@@ -1178,9 +1379,24 @@ class HARCH(VolatilityProcess):
         harch_recursion(parameters, resids, sigma2, lags, nobs, backcast, var_bounds)
         return sigma2
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
+    def _filter_variances(self, parameters, resids, backcast, var_bounds):
+        backcast = np.array(backcast)
+        resids2 = np.empty_like(resids)
+        resids2[0] = backcast
+        resids2[1:] = resids[:-1] ** 2.0
+        # The direct filter sums each window so that large residuals do not
+        # affect the precision of later variances
+        weights = self._harch_to_arch(parameters)[1:]
+        sigma2 = parameters[0] + fir_filter(weights, resids2, backcast, 'direct')
+        # Bounded variances do not enter later variances in an ARCH process
+        bounds_check(sigma2, var_bounds)
+
+        return sigma2, np.ones(resids.shape[1], dtype=bool)
+
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
         lags = self.lags
-        errors = rng(nobs + burn)
+        errors = _draw_paths(rng, nobs + burn, repetitions)
 
         if initial_value is None:
             if (1.0 - np.sum(parameters[1:])) > 0:
@@ -1189,20 +1405,15 @@ class HARCH(VolatilityProcess):
                 warn(initial_value_warning, InitialValueWarning)
                 initial_value = parameters[0]
 
-        sigma2 = np.empty(nobs + burn)
-        data = np.empty(nobs + burn)
+        sigma2 = np.empty_like(errors)
+        data = np.empty_like(errors)
         max_lag = np.max(lags)
-        sigma2[:max_lag] = initial_value
-        data[:max_lag] = np.sqrt(initial_value)
-        for t in range(max_lag, nobs + burn):
-            sigma2[t] = parameters[0]
-            for i in range(lags.shape[0]):
-                param = parameters[1 + i] / lags[i]
-                for j in range(lags[i]):
-                    sigma2[t] += param * data[t - 1 - j] ** 2.0
-            data[t] = errors[t] * np.sqrt(sigma2[t])
-
-        return data[burn:], sigma2[burn:]
+        sigma2[:, :max_lag] = initial_value
+        data[:, :max_lag] = np.sqrt(initial_value)
+        harch_simulation(np.asarray(parameters, dtype=np.float64), lags, errors, data, sigma2,
+                         max_lag)
+
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def starting_values(self, resids):
         k_arch = self._num_lags
@@ -1227,52 +1438,87 @@ class HARCH(VolatilityProcess):
 
         return arch_params
 
-    def _common_forecast_components(self, parameters, resids, backcast, horizon):
-        arch_params = self._harch_to_arch(parameters)
-        t = resids.shape[0]
-        m = self.lags.max()
-        resids2 = np.empty((t, m + horizon))
-        resids2[:m, :m] = backcast
-        sq_resids = resids ** 2.0
-        for i in range(m):
-            resids2[m - i - 1:, i] = sq_resids[:(t - (m - i - 1))]
-        const = arch_params[0]
-        arch = arch_params[1:]
+    def _common_forecast_components(self, parameters, resids, backcast):
+        """
+        Components used to forecast using running sums over the HARCH windows
 
-        return const, arch, resids2
+        Returns
+        -------
+        const : float
+            Model intercept
+        scaled_params : ndarray
+            ARCH parameters divided by their lag lengths
+        lagged : ndarray
+            t by max(lags) array where row i contains the squared residuals
+            in the longest window ending with resids[i], using the backcast
+            for values before the first observation
+        """
+        lags = self.lags
+        t, m = resids.shape[0], lags.max()
+        resids2 = np.empty(m + t)
+        resids2[:m] = backcast
+        resids2[m:] = resids ** 2.0
+        lagged = resids2[np.arange(1, t + 1)[:, None] + np.arange(m)]
+        scaled_params = parameters[1:] / lags
+
+        return parameters[0], scaled_params, lagged
+
+    def _window_sums(self, values, end):
+        """Sums of values in each window that ends in column end - 1"""
+        return np.column_stack([values[:, end - lag:end].sum(1) for lag in self.lags])
+
+    def _update_window_sums(self, window_sums, values, loc):
+        """
+        Move the window sums to end with the values in column loc
+
+        Sums are recomputed when the value that leaves a window is larger
+        than the remaining sum since the update has lost precision.
+        """
+        for j, lag in enumerate(self.lags):
+            dropped = values[:, loc - lag]
+            window_sums[:, j] += values[:, loc] - dropped
+            inexact = ~(window_sums[:, j] >= dropped)
+            if np.any(inexact):
+                window_sums[inexact, j] = values[inexact, loc - lag + 1:loc + 1].sum(1)
 
     def _check_forecasting_method(self, method, horizon):
         return
 
     def _analytic_forecast(self, parameters, resids, backcast, var_bounds, start, horizon):
-        const, arch, resids2 = self._common_forecast_components(parameters, resids, backcast,
-                                                                horizon)
-        m = self.lags.max()
-        resids2[:start] = np.nan
-        arch_rev = arch[::-1]
+        const, scaled_params, lagged = \
+            self._common_forecast_components(parameters, resids, backcast)
+        t, m = resids.shape[0], self.lags.max()
+        forecasts = np.full((t, horizon), np.nan)
+        # Observed squared residuals followed by the forecasts
+        values = np.empty((t - start, m + horizon))
+        values[:, :m] = lagged[start:]
+        window_sums = self._window_sums(values, m)
         for i in range(horizon):
-            resids2[:, m + i] = const + resids2[:, i:(m + i)].dot(arch_rev)
+            forecasts[start:, i] = const + window_sums.dot(scaled_params)
+            values[:, m + i] = forecasts[start:, i]
+            self._update_window_sums(window_sums, values, m + i)
 
-        return VarianceForecast(resids2[:, m:].copy())
+        return VarianceForecast(forecasts)
 
     def _simulation_forecast(self, parameters, resids, backcast, var_bounds, start, horizon,
                              simulations, rng):
-        const, arch, resids2 = self._common_forecast_components(parameters, resids, backcast,
-                                                                horizon)
+        const, scaled_params, lagged = \
+            self._common_forecast_components(parameters, resids, backcast)
         t, m = resids.shape[0], self.lags.max()
 
         shocks = np.full((t, simulations, horizon), np.nan)
         paths = np.full((t, simulations, horizon), np.nan)
 
-        temp_resids2 = np.empty((simulations, m + horizon))
-        arch_rev = arch[::-1]
+        values = np.empty((simulations, m + horizon))
         for i in range(start, t):
             std_shocks = rng((simulations, horizon))
-            temp_resids2[:, :] = resids2[i:(i + 1)]
+            values[:, :m] = lagged[i]
+            path_sums = self._window_sums(values, m)
             for j in range(horizon):
-                paths[i, :, j] = const + temp_resids2[:, j:(m + j)].dot(arch_rev)
+                paths[i, :, j] = const + path_sums.dot(scaled_params)
                 shocks[i, :, j] = std_shocks[:, j] * np.sqrt(paths[i, :, j])
-                temp_resids2[:, m + j] = shocks[i, :, j] ** 2.0
+                values[:, m + j] = shocks[i, :, j] ** 2.0
+                self._update_window_sums(path_sums, values, m + j)
 
         return VarianceForecast(paths.mean(1), paths, shocks)
 
@@ -1405,10 +1651,38 @@ class MIDASHyperbolic(VolatilityProcess):
         else:
             params = parameters[:3]
 
-        midas_recursion(params, weights, resids, sigma2, nobs, backcast, var_bounds)
-        return sigma2
+        if not prefer_fft(self.m, nobs):
+            midas_recursion(params, weights, resids, sigma2, nobs, backcast, var_bounds)
+            return sigma2
+
+        # Long lag lengths evaluate the weighted sum as a convolution
+        resids2 = np.empty(nobs)
+        resids2[0] = backcast
+        resids2[1:] = resids[:-1] ** 2.0
+        sigma2[:] = params[0] + fir_filter(params[1] * weights, resids2, backcast, 'fft')
+        if self._asym:
+            resids2[1:] *= resids[:-1] < 0
+            resids2[0] = 0.5 * backcast
+            sigma2 += fir_filter(params[2] * weights, resids2, 0.5 * backcast, 'fft')
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
+        return bounds_check(sigma2, var_bounds)
+
+    def _filter_variances(self, parameters, resids, backcast, var_bounds):
+        weights = self._weights(parameters)
+        backcast = np.array(backcast)
+        resids2 = np.empty_like(resids)
+        resids2[0] = backcast
+        resids2[1:] = resids[:-1] ** 2.0
+        sigma2 = parameters[0] + fir_filter(parameters[1] * weights, resids2, backcast)
+        if self._asym:
+            resids2[0] = 0.5 * backcast
+            resids2[1:] *= resids[:-1] < 0
+            sigma2 += fir_filter(parameters[2] * weights, resids2, 0.5 * backcast)
+
+        return sigma2, _within_bounds(sigma2, var_bounds)
+
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
         if self._asym:
             omega, alpha, gamma = parameters[:3]
         else:
@@ -1417,8 +1691,10 @@ class MIDASHyperbolic(VolatilityProcess):
         weights = self._weights(parameters)
         aw = weights * alpha
         gw = weights * gamma
+        m = weights.shape[0]
+        burn = max(burn, m)
 
-        errors = rng(nobs + burn)
+        errors = _draw_paths(rng, nobs + burn, repetitions)
 
         if initial_value is None:
             if (1.0 - alpha - 0.5 * gamma) > 0:
@@ -1427,24 +1703,14 @@ class MIDASHyperbolic(VolatilityProcess):
                 warn(initial_value_warning, InitialValueWarning)
                 initial_value = parameters[0]
 
-        m = weights.shape[0]
-        burn = max(burn, m)
-        sigma2 = np.empty(nobs + burn)
-        data = np.empty(nobs + burn)
-
-        sigma2[:m] = initial_value
-        data[:m] = np.sqrt(initial_value)
-        for t in range(m, nobs + burn):
-            sigma2[t] = omega
-            for i in range(m):
-                if t - 1 - i < m:
-                    coef = aw[i] + 0.5 * gw[i]
-                else:
-                    coef = aw[i] + gw[i] * (data[t - 1 - i] < 0)
-                sigma2[t] += coef * data[t - 1 - i] ** 2.0
-            data[t] = errors[t] * np.sqrt(sigma2[t])
+        sigma2 = np.empty_like(errors)
+        data = np.empty_like(errors)
+
+        sigma2[:, :m] = initial_value
+        data[:, :m] = np.sqrt(initial_value)
+        midas_simulation(float(omega), aw, gw, errors, data, sigma2)
 
-        return data[burn:], sigma2[burn:]
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def starting_values(self, resids):
         theta = [.1, .5, .8, .9]
@@ -1492,6 +1758,21 @@ class MIDASHyperbolic(VolatilityProcess):
         return w / w.sum()
 
     def _common_forecast_components(self, parameters, resids, backcast, horizon):
+        """
+        Components used to forecast
+
+        Returns
+        -------
+        omega : float
+            Model intercept
+        aw : ndarray
+            Weights on the lagged squared residuals
+        gw : ndarray
+            Weights on the lagged squared negative residuals
+        observed : ndarray
+            t by horizon array containing the contribution of the observed
+            squared residuals to the forecast at each horizon
+        """
         if self._asym:
             omega, alpha, gamma = parameters[:3]
         else:
@@ -1501,66 +1782,458 @@ class MIDASHyperbolic(VolatilityProcess):
         aw = weights * alpha
         gw = weights * gamma
 
-        t = resids.shape[0]
         m = self.m
-        resids2 = np.empty((t, m + horizon))
-        resids2[:m, :m] = backcast
-        indicator = np.empty((t, m + horizon))
-        indicator[:m, :m] = 0.5
-        sq_resids = resids ** 2.0
-        for i in range(m):
-            resids2[m - i - 1:, i] = sq_resids[:(t - (m - i - 1))]
-            indicator[m - i - 1:, i] = resids[:(t - (m - i - 1))] < 0
+        # Column h contains the weights on resids2[t - j] in the forecast of
+        # sigma2[t + h + 1], which are the weights on lags h + 1 and above
+        steps = min(m, horizon)
+        filter_weights = np.zeros((m, steps))
+        neg_filter_weights = np.zeros((m, steps))
+        for h in range(steps):
+            filter_weights[:m - h, h] = aw[h:]
+            neg_filter_weights[:m - h, h] = gw[h:]
+        resids2 = resids ** 2.0
+        observed = np.zeros((resids.shape[0], horizon))
+        observed[:, :steps] = fir_filter(filter_weights, resids2, backcast)
+        if self._asym:
+            neg_resids2 = resids2 * (resids < 0)
+            observed[:, :steps] += fir_filter(neg_filter_weights, neg_resids2, 0.5 * backcast)
 
-        return omega, aw, gw, resids2, indicator
+        return omega, aw, gw, observed
 
     def _check_forecasting_method(self, method, horizon):
         return
 
     def _analytic_forecast(self, parameters, resids, backcast, var_bounds, start, horizon):
-        omega, aw, gw, resids2, indicator = self._common_forecast_components(parameters, resids,
-                                                                             backcast, horizon)
+        omega, aw, gw, observed = self._common_forecast_components(parameters, resids,
+                                                                   backcast, horizon)
         m = self.m
-        resids2[:start] = np.nan
-        aw_rev = aw[::-1]
-        gw_rev = gw[::-1]
-
+        coef = aw + 0.5 * gw
+        forecasts = np.empty_like(observed)
         for i in range(horizon):
-            resids2[:, m + i] = omega + resids2[:, i:(m + i)].dot(aw_rev)
-            if self._asym:
-                resids2_ind = resids2[:, i:(m + i)] * indicator[:, i:(m + i)]
-                resids2[:, m + i] += resids2_ind.dot(gw_rev)
-                indicator[:, m + i] = 0.5
+            forecasts[:, i] = omega + observed[:, i]
+            k = min(i, m)
+            if k > 0:
+                forecasts[:, i] += forecasts[:, i - 1::-1][:, :k].dot(coef[:k])
+        forecasts[:start] = np.nan
 
-        return VarianceForecast(resids2[:, m:].copy())
+        return VarianceForecast(forecasts)
 
     def _simulation_forecast(self, parameters, resids, backcast, var_bounds, start, horizon,
                              simulations, rng):
-        omega, aw, gw, resids2, indicator = self._common_forecast_components(parameters, resids,
-                                                                             backcast, horizon)
+        omega, aw, gw, observed = self._common_forecast_components(parameters, resids,
+                                                                   backcast, horizon)
         t = resids.shape[0]
         m = self.m
 
         shocks = np.full((t, simulations, horizon), np.nan)
         paths = np.full((t, simulations, horizon), np.nan)
 
-        temp_resids2 = np.empty((simulations, m + horizon))
-        temp_indicator = np.empty((simulations, m + horizon))
-        aw_rev = aw[::-1]
-        gw_rev = gw[::-1]
         for i in range(start, t):
             std_shocks = rng((simulations, horizon))
-            temp_resids2[:, :] = resids2[i:(i + 1)]
-            temp_indicator[:, :] = indicator[i:(i + 1)]
+            shocks2 = np.empty((simulations, horizon))
             for j in range(horizon):
-                paths[i, :, j] = omega + temp_resids2[:, j:(m + j)].dot(aw_rev)
-                if self._asym:
-                    temp_resids2_ind = temp_resids2[:, j:(m + j)] * temp_indicator[:, j:(m + j)]
-                    paths[i, :, j] += temp_resids2_ind.dot(gw_rev)
+                paths[i, :, j] = omega + observed[i, j]
+                k = min(j, m)
+                if k > 0:
+                    lagged_shocks2 = shocks2[:, j - 1::-1][:, :k]
+                    paths[i, :, j] += lagged_shocks2.dot(aw[:k])
+                    if self._asym:
+                        negative = shocks[i, :, j - 1::-1][:, :k] < 0
+                        paths[i, :, j] += (lagged_shocks2 * negative).dot(gw[:k])
 
                 shocks[i, :, j] = std_shocks[:, j] * np.sqrt(paths[i, :, j])
-                temp_resids2[:, m + j] = shocks[i, :, j] ** 2.0
-                temp_indicator[:, m + j] = (shocks[i, :, j] < 0).astype(np.double)
+                shocks2[:, j] = shocks[i, :, j] ** 2.0
+
+        return VarianceForecast(paths.mean(1), paths, shocks)
+
+
+class FIGARCH(VolatilityProcess):
+    r"""
+    FIGARCH model
+
+    Parameters
+    ----------
+    p : {0, 1}
+        Order of the symmetric innovation
+    q : {0, 1}
+        Order of the lagged (transformed) conditional variance
+    power : float, optional
+        Power to use with the innovations, abs(e) ** power.  Default is 2.0,
+        which produces FIGARCH and related models. Using 1.0 produces
+        FIAVARCH and related models.  Other powers can be specified, although
+        these should be strictly positive, and usually larger than 0.25.
+    truncation : int, optional
+        Truncation point to use in ARCH(:math:`\infty`) representation.
+        Default is 1000.
+
+    Attributes
+    ----------
+    num_params : int
+        The number of parameters in the model
+
+    Examples
+    --------
+    >>> from arch.univariate import FIGARCH
+
+    Standard FIGARCH
+
+    >>> figarch = FIGARCH()
+
+    FIARCH
+
+    >>> fiarch = FIGARCH(p=0)
+
+    FIAVGARCH process
+
+    >>> fiavarch = FIGARCH(power=1.0)
+
+    Notes
+    -----
+    In this class of processes, the variance dynamics are
+
+    .. math::
+
+        h_t = \omega + [1-\beta L - \phi L  (1-L)^d] \epsilon_t^2 + \beta h_{t-1}
+
+    where ``L`` is the lag operator and ``d`` is the fractional differencing
+    parameter. The model is estimated using the ARCH(:math:`\infty`)
+    representation,
+
+    .. math::
+
+        h_t = (1-\beta)^{-1}  \omega + \sum_{i=1}^\infty \lambda_i \epsilon_{t-i}^2
+
+    The weights are constructed using
+
+    .. math::
+
+        \delta_1 = d \\
+        \lambda_1 = d - \beta + \phi
+
+    and the recursive equations
+
+    .. math::
+
+        \delta_j = \frac{j - 1 - d}{j}  \delta_{j-1} \\
+        \lambda_j = \beta \lambda_{j-1} + \delta_j - \phi \delta_{j-1}.
+
+    When power is not 2, the ARCH(:math:`\infty`) representation is still
+    used where :math:`\epsilon_t^2` is replaced by :math:`|\epsilon_t|^p` and
+    ``p`` is the power.
+
+    The weights are computed once for each parameter value and the infinite
+    sum is evaluated as a convolution, so the cost of computing the variance
+    grows with the log of the truncation rather than linearly.
+    """
+
+    def __init__(self, p=1, q=1, power=2.0, truncation=1000):
+        super(FIGARCH, self).__init__()
+        if p not in (0, 1) or q not in (0, 1):
+            raise ValueError('p and q must be either 0 or 1.')
+        if power <= 0.0:
+            raise ValueError('power must be strictly positive, usually larger than 0.25')
+        truncation = int(truncation)
+        if truncation <= 0:
+            raise ValueError('truncation must be a positive integer')
+        self.p = int(p)
+        self.q = int(q)
+        self.power = power
+        self.truncation = truncation
+        self.num_params = 2 + self.p + self.q
+        self._weight_cache = None
+        if power == 2.0:
+            self.name = 'FIGARCH'
+        elif power == 1.0:
+            self.name = 'FIAVGARCH'
+        else:
+            self.name = 'Power FIGARCH (power: {0:0.1f})'.format(self.power)
+
+    def __str__(self):
+        descr = self.name
+        if self.power != 1.0 and self.power != 2.0:
+            descr = descr[:-1] + ', '
+        else:
+            descr += '('
+        for k, v in (('p', self.p), ('q', self.q)):
+            descr += k + ': ' + str(v) + ', '
+        descr = descr[:-2] + ')'
+        return descr
+
+    def variance_bounds(self, resids, power=2.0):
+        return super(FIGARCH, self).variance_bounds(resids, self.power)
+
+    def bounds(self, resids):
+        eps_half = np.sqrt(np.finfo(np.float64).eps)
+        v = np.mean(abs(resids) ** self.power)
+
+        bounds = [(0.0, 10.0 * v)]
+        bounds.extend([(0.0, 0.5)] * self.p)  # phi
+        bounds.extend([(0.0, 1.0 - eps_half)])  # d
+        bounds.extend([(0.0, 1.0 - eps_half)] * self.q)  # beta
+
+        return bounds
+
+    def constraints(self):
+        """
+        Constraints
+
+        Notes
+        -----
+        Parameters are (omega, phi, d, beta)
+
+        A.dot(parameters) - b >= 0
+
+        1. omega > 0
+        2. 0 <= phi <= (1 - d) / 2
+        3. 0 <= d <= 1
+        4. 0 <= beta <= d + phi
+        """
+        a = np.array([[1, 0, 0, 0],
+                      [0, 1, 0, 0],
+                      [0, -2, -1, 0],
+                      [0, 0, 1, 0],
+                      [0, 0, -1, 0],
+                      [0, 0, 0, 1],
+                      [0, 1, 1, -1]], dtype=np.float64)
+        b = np.array([0, 0, -1, 0, -1, 0, 0], dtype=np.float64)
+        if not self.q:
+            a = a[:-2, :-1]
+            b = b[:-2]
+        if not self.p:
+            a = np.delete(a, (1,), axis=1)
+            a = np.delete(a, (1, 2), axis=0)
+            b = np.delete(b, (1, 2))
+
+        return a, b
+
+    def _unpack(self, parameters):
+        p, q = self.p, self.q
+        phi = parameters[1] if p else 0.0
+        d = parameters[1 + p]
+        beta = parameters[1 + p + q] if q else 0.0
+        return parameters[0], phi, d, beta
+
+    def _weights(self, parameters):
+        """
+        Weights of the ARCH(inf) representation
+
+        Parameters
+        ----------
+        parameters : ndarray
+            Model parameters
+
+        Returns
+        -------
+        lam : ndarray
+            truncation-element array of weights on lags 1, 2, ...
+
+        Notes
+        -----
+        The most recently used weights are retained so that repeated calls
+        with the same phi, d and beta do not recompute them.  The weights do
+        not depend on omega, so steps that only change omega reuse them.
+        """
+        parameters = np.asarray(parameters, dtype=np.float64)
+        _, phi, d, beta = self._unpack(parameters)
+        key = (float(phi), float(d), float(beta))
+        if self._weight_cache is not None and self._weight_cache[0] == key:
+            return self._weight_cache[1]
+
+        j = np.arange(1.0, self.truncation)
+        delta = np.empty(self.truncation)
+        delta[0] = d
+        delta[1:] = d * np.cumprod((j - d) / (j + 1))
+        innov = np.empty(self.truncation)
+        innov[0] = phi - beta + d
+        innov[1:] = delta[1:] - phi * delta[:-1]
+        lam = lfilter([1.0], [1.0, -beta], innov)
+        self._weight_cache = (key, lam)
+
+        return lam
+
+    def _omega_tilde(self, parameters):
+        omega, _, _, beta = self._unpack(parameters)
+        return omega / (1.0 - beta)
+
+    def compute_variance(self, parameters, resids, sigma2, backcast,
+                         var_bounds):
+        lam = self._weights(parameters)
+        fresids = np.abs(resids) ** self.power
+        sigma2[:] = self._omega_tilde(parameters)
+        sigma2 += fir_filter(np.r_[0.0, lam], fresids, backcast)
+        bounds_check(sigma2, var_bounds)
+        sigma2 **= 2.0 / self.power
+
+        return sigma2
+
+    def _filter_variances(self, parameters, resids, backcast, var_bounds):
+        lam = self._weights(parameters)
+        fresids = np.abs(resids) ** self.power
+        sigma2 = fir_filter(np.r_[0.0, lam], fresids, np.array(backcast))
+        sigma2 += self._omega_tilde(parameters)
+        exact = _within_bounds(sigma2, var_bounds)
+        sigma2 **= 2.0 / self.power
+
+        return sigma2, exact
+
+    def backcast_transform(self, backcast):
+        backcast = super(FIGARCH, self).backcast_transform(backcast)
+        return np.sqrt(backcast) ** self.power
+
+    def backcast(self, resids):
+        """
+        Construct values for backcasting to start the recursion
+        """
+        power = self.power
+        tau = min(75, resids.shape[0])
+        w = (0.94 ** np.arange(tau))
+        w = w / sum(w)
+        backcast = np.sum((abs(resids[:tau]) ** power) * w)
+
+        return backcast
+
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
+        truncation = self.truncation
+        power = self.power
+        lam = self._weights(parameters)
+        errors = _draw_paths(rng, truncation + nobs + burn, repetitions)
+
+        if initial_value is None:
+            persistence = np.sum(lam)
+            _, _, _, beta = self._unpack(parameters)
+            initial_value = parameters[0]
+            if beta < 1:
+                initial_value /= (1 - beta)
+            if persistence < 1:
+                initial_value /= (1 - persistence)
+            if persistence >= 1.0 or beta >= 1.0:
+                warn(initial_value_warning, InitialValueWarning)
+
+        sigma2 = np.empty_like(errors)
+        data = np.empty_like(errors)
+        fsigma = np.empty_like(errors)
+        fdata = np.empty_like(errors)
+
+        fsigma[:, :truncation] = initial_value
+        sigma2[:, :truncation] = initial_value ** (2.0 / power)
+        data[:, :truncation] = np.sqrt(sigma2[:, :truncation]) * errors[:, :truncation]
+        fdata[:, :truncation] = abs(data[:, :truncation]) ** power
+        omega_tilde = self._omega_tilde(parameters)
+        figarch_simulation(float(omega_tilde), np.ascontiguousarray(lam), errors, data, sigma2,
+                           fdata, fsigma, float(power))
+
+        return _paths_output(repetitions, data[:, truncation + burn:],
+                             sigma2[:, truncation + burn:])
+
+    def starting_values(self, resids):
+        ds = [.2, .5, .7]
+        phi_ratio = [.2, .5, .8] if self.p else [0]
+        beta_ratio = [.1, .5, .9] if self.q else [0]
+
+        power = self.power
+        target = np.mean(abs(resids) ** power)
+        scale = np.mean(resids ** 2) / (target ** (2.0 / power))
+        target *= (scale ** (power / 2))
+
+        svs = []
+        for d, pr, br in itertools.product(ds, phi_ratio, beta_ratio):
+            phi = (1 - d) / 2 * pr
+            beta = (d + phi) * br
+            sv = [0.0] + [phi] * self.p + [d] + [beta] * self.q
+            sv = np.array(sv)
+            lam = self._weights(sv)
+            sv[0] = (1 - beta) * target * (1 - np.sum(lam))
+            svs.append(sv)
+
+        var_bounds = self.variance_bounds(resids)
+        backcast = self.backcast(resids)
+        llfs = np.zeros(len(svs))
+        for i, sv in enumerate(svs):
+            llfs[i] = self._gaussian_loglikelihood(sv, resids, backcast, var_bounds)
+        loc = np.argmax(llfs)
+
+        return svs[int(loc)]
+
+    def parameter_names(self):
+        names = ['omega']
+        if self.p:
+            names += ['phi']
+        names += ['d']
+        if self.q:
+            names += ['beta']
+        return names
+
+    def _check_forecasting_method(self, method, horizon):
+        if horizon == 1:
+            return
+
+        if method == 'analytic' and self.power != 2.0:
+            raise ValueError('Analytic forecasts not available for horizon > 1 when power != 2')
+        return
+
+    def _common_forecast_components(self, parameters, resids, backcast, horizon):
+        """
+        Components used to forecast
+
+        Returns
+        -------
+        omega_tilde : float
+            Intercept of the ARCH(inf) representation
+        lam : ndarray
+            Weights of the ARCH(inf) representation
+        observed : ndarray
+            t by horizon array containing the contribution of the observed
+            transformed residuals to the forecast at each horizon
+        """
+        lam = self._weights(parameters)
+        truncation = self.truncation
+        # Column h contains the weights on lags h + 1 and above
+        steps = min(truncation, horizon)
+        filter_weights = np.zeros((truncation, steps))
+        for h in range(steps):
+            filter_weights[:truncation - h, h] = lam[h:]
+        fresids = np.abs(resids) ** self.power
+        observed = np.zeros((resids.shape[0], horizon))
+        observed[:, :steps] = fir_filter(filter_weights, fresids, backcast)
+
+        return self._omega_tilde(parameters), lam, observed
+
+    def _analytic_forecast(self, parameters, resids, backcast, var_bounds, start, horizon):
+        omega_tilde, lam, observed = self._common_forecast_components(parameters, resids,
+                                                                      backcast, horizon)
+        forecasts = np.empty_like(observed)
+        for i in range(horizon):
+            forecasts[:, i] = omega_tilde + observed[:, i]
+            k = min(i, self.truncation)
+            if k > 0:
+                forecasts[:, i] += forecasts[:, i - 1::-1][:, :k].dot(lam[:k])
+        forecasts **= 2.0 / self.power
+        forecasts[:start] = np.nan
+
+        return VarianceForecast(forecasts)
+
+    def _simulation_forecast(self, parameters, resids, backcast, var_bounds, start, horizon,
+                             simulations, rng):
+        omega_tilde, lam, observed = self._common_forecast_components(parameters, resids,
+                                                                      backcast, horizon)
+        t = resids.shape[0]
+        power = self.power
+
+        shocks = np.full((t, simulations, horizon), np.nan)
+        paths = np.full((t, simulations, horizon), np.nan)
+
+        fshocks = np.empty((simulations, horizon))
+        for i in range(start, t):
+            std_shocks = rng((simulations, horizon))
+            for j in range(horizon):
+                fpath = omega_tilde + observed[i, j]
+                k = min(j, self.truncation)
+                if k > 0:
+                    fpath = fpath + fshocks[:, j - 1::-1][:, :k].dot(lam[:k])
+                paths[i, :, j] = fpath ** (2.0 / power)
+                shocks[i, :, j] = std_shocks[:, j] * np.sqrt(paths[i, :, j])
+                fshocks[:, j] = np.abs(shocks[i, :, j]) ** power
 
         return VarianceForecast(paths.mean(1), paths, shocks)
 
@@ -1691,6 +2364,13 @@ class EWMAVariance(VolatilityProcess):
         lam = parameters[0] if self._estimate_lam else self.lam
         return ewma_recursion(lam, resids, sigma2, resids.shape[0], backcast)
 
+    def _filter_variances(self, parameters, resids, backcast, var_bounds):
+        lam = parameters[0] if self._estimate_lam else self.lam
+        sigma2 = garch_filter(np.array([0.0, 1.0 - lam, lam]), resids ** 2.0, resids, 1, 0, 1,
+                              np.array(backcast))
+        # The EWMA recursion does not use variance bounds
+        return sigma2, np.ones(resids.shape[1], dtype=bool)
+
     def constraints(self):
         if self._estimate_lam:
             a = np.ones((1, 1))
@@ -1698,27 +2378,28 @@ class EWMAVariance(VolatilityProcess):
             return a, b
         return np.empty((0, 0)), np.empty((0,))
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
-        errors = rng(nobs + burn)
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
+        errors = _draw_paths(rng, nobs + burn, repetitions)
 
         if initial_value is None:
             initial_value = 1.0
 
-        sigma2 = np.zeros(nobs + burn)
-        data = np.zeros(nobs + burn)
+        sigma2 = np.zeros_like(errors)
+        data = np.zeros_like(errors)
 
-        sigma2[0] = initial_value
-        data[0] = np.sqrt(sigma2[0])
+        sigma2[:, 0] = initial_value
+        data[:, 0] = np.sqrt(sigma2[:, 0])
         if self._estimate_lam:
             lam = parameters[0]
         else:
             lam = self.lam
-        one_m_lam = 1.0 - lam
-        for t in range(1, nobs + burn):
-            sigma2[t] = lam * sigma2[t - 1] + one_m_lam * data[t - 1] ** 2.0
-            data[t] = np.sqrt(sigma2[t]) * errors[t]
+        # A single EWMA component with unit weight
+        components = sigma2[:, :1].copy()
+        ewma_components_simulation(np.array([lam], dtype=np.float64), np.ones(1), errors, data,
+                                   sigma2, components)
 
-        return data[burn:], sigma2[burn:]
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def _check_forecasting_method(self, method, horizon):
         return
@@ -1857,16 +2538,16 @@ class RiskMetrics2006(VolatilityProcess):
         nobs = resids.shape[0]
         mus = self._ewma_smoothing_parameters()
 
-        resids2 = resids ** 2.0
-        backcast = np.zeros(mus.shape[0])
-        for k in range(int(self.kmax)):
-            mu = mus[k]
-            end_point = int(max(min(np.floor(np.log(.01) / np.log(mu)), nobs), k))
-            weights = mu ** np.arange(end_point)
-            weights = weights / weights.sum()
-            backcast[k] = weights.dot(resids2[:end_point])
+        end_points = np.floor(np.log(.01) / np.log(mus))
+        end_points = np.maximum(np.minimum(end_points, nobs), np.arange(self.kmax))
+        end_points = end_points.astype(np.int64)
+        lags = np.arange(end_points.max())
+        # Row k contains the normalized weights of component k
+        weights = mus[:, None] ** lags
+        weights[lags >= end_points[:, None]] = 0.0
+        weights /= weights.sum(1)[:, None]
 
-        return backcast
+        return weights.dot(resids[:lags.shape[0]] ** 2.0)
 
     def backcast_transform(self, backcast):
         backcast = super(RiskMetrics2006, self).backcast_transform(backcast)
@@ -1898,23 +2579,17 @@ class RiskMetrics2006(VolatilityProcess):
     def compute_variance(self, parameters, resids, sigma2, backcast,
                          var_bounds):
         nobs = resids.shape[0]
-        kmax = self.kmax
         w = self._ewma_combination_weights()
         mus = self._ewma_smoothing_parameters()
-
-        sigma2_temp = np.zeros_like(sigma2)
-        for k in range(kmax):
-            mu = mus[k]
-            ewma_recursion(mu, resids, sigma2_temp, nobs, backcast[k])
-            if k == 0:
-                sigma2[:] = w[k] * sigma2_temp
-            else:
-                sigma2 += w[k] * sigma2_temp
+        backcast = np.ascontiguousarray(backcast, dtype=np.float64)
+        components = np.empty(self.kmax)
+        ewma_components_recursion(mus, w, resids, sigma2, components, nobs, backcast)
 
         return sigma2
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
-        errors = rng(nobs + burn)
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
+        errors = _draw_paths(rng, nobs + burn, repetitions)
 
         kmax = self.kmax
         w = self._ewma_combination_weights()
@@ -1922,18 +2597,15 @@ class RiskMetrics2006(VolatilityProcess):
 
         if initial_value is None:
             initial_value = 1.0
-        sigma2s = np.zeros((nobs + burn, kmax))
-        sigma2s[0, :] = initial_value
-        sigma2 = np.zeros(nobs + burn)
-        data = np.zeros(nobs + burn)
-        data[0] = np.sqrt(initial_value)
-        sigma2[0] = w.dot(sigma2s[0])
-        for t in range(1, nobs + burn):
-            sigma2s[t] = mus * sigma2s[t - 1] + (1 - mus) * data[t - 1] ** 2.0
-            sigma2[t] = w.dot(sigma2s[t])
-            data[t] = np.sqrt(sigma2[t]) * errors[t]
-
-        return data[burn:], sigma2[burn:]
+        sigma2s = np.empty((errors.shape[0], kmax))
+        sigma2s[:] = initial_value
+        sigma2 = np.zeros_like(errors)
+        data = np.zeros_like(errors)
+        data[:, 0] = np.sqrt(initial_value)
+        sigma2[:, 0] = sigma2s.dot(w)
+        ewma_components_simulation(mus, w, errors, data, sigma2, sigma2s)
+
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def _check_forecasting_method(self, method, horizon):
         return
@@ -1956,36 +2628,29 @@ class RiskMetrics2006(VolatilityProcess):
         kmax = self.kmax
         w = self._ewma_combination_weights()
         mus = self._ewma_smoothing_parameters()
-        backcast = np.asarray(backcast)
 
         t = resids.shape[0]
         paths = np.full((t, simulations, horizon), np.nan)
         shocks = np.full((t, simulations, horizon), np.nan)
 
-        temp_paths = np.empty((kmax, simulations, horizon))
-        # We use the transpose here to get C-contiguous arrays
-        component_one_step = np.empty((kmax, t + 1))
-        _resids = np.empty((t + 1))
-        _resids[:-1] = resids
-        for k in range(kmax):
-            mu = mus[k]
-            ewma_recursion(mu, _resids, component_one_step[k, :], t + 1, backcast[k])
-        # Transpose to be (t+1, kmax)
-        component_one_step = component_one_step.T
+        # Component variances for the one-step forecast from the first origin
+        components = np.empty(kmax)
+        _resids = np.empty(start + 1)
+        _resids[:-1] = resids[:start]
+        _sigma2 = np.empty(start + 1)
+        backcast = np.ascontiguousarray(backcast, dtype=np.float64)
+        ewma_components_recursion(mus, w, _resids, _sigma2, components, start + 1, backcast)
 
         for i in range(start, t):
-            std_shocks = rng((simulations, horizon))
-            for k in range(kmax):
-                temp_paths[k, :, 0] = component_one_step[i, k]
-            paths[i, :, 0] = w.dot(temp_paths[:, :, 0])
+            std_shocks = np.ascontiguousarray(rng((simulations, horizon)), dtype=np.float64)
+            # simulations by kmax array holding the state of each path
+            state = np.tile(components, (simulations, 1))
+            paths[i, :, 0] = state.dot(w)
             shocks[i, :, 0] = std_shocks[:, 0] * np.sqrt(paths[i, :, 0])
-            for j in range(1, horizon):
-                for k in range(kmax):
-                    mu = mus[k]
-                    temp_paths[k, :, j] = (mu * temp_paths[k, :, j - 1] +
-                                           (1 - mu) * shocks[i, :, j - 1] ** 2.0)
-                paths[i, :, j] = w.dot(temp_paths[:, :, j])
-                shocks[i, :, j] = std_shocks[:, j] * np.sqrt(paths[i, :, j])
+            ewma_components_simulation(mus, w, std_shocks, shocks[i], paths[i], state)
+            # Advance the components to the next origin
+            components *= mus
+            components += (1 - mus) * resids[i] ** 2.0
 
         return VarianceForecast(paths.mean(1), paths, shocks)
 
@@ -2051,6 +2716,7 @@ class EGARCH(VolatilityProcess):
             raise ValueError('One of p or o must be strictly positive')
         self.name = 'EGARCH' if q > 0 else 'EARCH'
         self._arrays = None  # Helpers for fitting variance
+        self._uses_quadrature = True
 
     def __str__(self):
         descr = self.name + '('
@@ -2109,9 +2775,10 @@ class EGARCH(VolatilityProcess):
         """
         return np.log(super(EGARCH, self).backcast(resids))
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
         p, o, q = self.p, self.o, self.q
-        errors = rng(nobs + burn)
+        errors = _draw_paths(rng, nobs + burn, repetitions)
 
         if initial_value is None:
             if q > 0:
@@ -2125,35 +2792,16 @@ class EGARCH(VolatilityProcess):
                 warn(initial_value_warning, InitialValueWarning)
                 initial_value = parameters[0]
 
-        sigma2 = np.zeros(nobs + burn)
-        data = np.zeros(nobs + burn)
-        lnsigma2 = np.zeros(nobs + burn)
-        abserrors = np.abs(errors)
-
-        norm_const = np.sqrt(2 / np.pi)
+        lnsigma2 = np.zeros_like(errors)
         max_lag = np.max([p, o, q])
-        lnsigma2[:max_lag] = initial_value
-        sigma2[:max_lag] = np.exp(initial_value)
-        data[:max_lag] = errors[:max_lag] * np.sqrt(sigma2[:max_lag])
-
-        for t in range(max_lag, nobs + burn):
-            loc = 0
-            lnsigma2[t] = parameters[loc]
-            loc += 1
-            for j in range(p):
-                lnsigma2[t] += parameters[loc] * (abserrors[t - 1 - j] - norm_const)
-                loc += 1
-            for j in range(o):
-                lnsigma2[t] += parameters[loc] * errors[t - 1 - j]
-                loc += 1
-            for j in range(q):
-                lnsigma2[t] += parameters[loc] * lnsigma2[t - 1 - j]
-                loc += 1
+        lnsigma2[:, :max_lag] = initial_value
+        egarch_simulation(np.asarray(parameters, dtype=np.float64), errors, lnsigma2, p, o, q,
+                          max_lag)
 
         sigma2 = np.exp(lnsigma2)
         data = errors * np.sqrt(sigma2)
 
-        return data[burn:], sigma2[burn:]
+        return _paths_output(repetitions, data[:, burn:], sigma2[:, burn:])
 
     def starting_values(self, resids):
         p, o, q = self.p, self.o, self.q
@@ -2187,13 +2835,90 @@ class EGARCH(VolatilityProcess):
         return _common_names(self.p, self.o, self.q)
 
     def _check_forecasting_method(self, method, horizon):
-        if method == 'analytic' and horizon > 1:
-            raise ValueError('Analytic forecasts not available for horizon > 1')
         return
 
-    def _analytic_forecast(self, parameters, resids, backcast, var_bounds, start, horizon):
+    def _analytic_forecast(self, parameters, resids, backcast, var_bounds, start, horizon,
+                           distribution=None, dist_params=None):
+        r"""
+        Notes
+        -----
+        The log variance is linear in the future shocks, and so
+
+        .. math::
+
+            E_t[\sigma^2_{t+h}] = \exp(\mu_{t+h}) \prod_{j=1}^{h-1}
+            E[\exp(\psi_j (|e| - \sqrt{2/\pi}) + \xi_j e)]
+
+        where :math:`\mu_{t+h}` is the forecast of the log variance when all
+        future values of :math:`|e_{t}|-\sqrt{2/\pi}` and :math:`e_t` are
+        0, and :math:`\psi_j` and :math:`\xi_j` are the impulse responses
+        of the log variance to these terms. The expectations do not depend on
+        the forecast origin. They have a closed form when the shocks are
+        normal and are otherwise computed using quadrature. The expectations
+        are infinite unless :math:`E[\exp(a|e|)]` is finite for all a, and so
+        multi-step forecasts are not available for shocks with polynomial
+        tails such as the Student's t.
+        """
+        sigma2, forecasts = self._one_step_forecast(parameters, resids, backcast, var_bounds,
+                                                    horizon)
+        if horizon == 1:
+            forecasts[:start] = np.nan
+            return VarianceForecast(forecasts)
+
+        quadrature = None
+        if distribution is not None and not isinstance(distribution, Normal):
+            if not distribution._has_exponential_moments(dist_params):
+                raise ValueError('Analytic forecasts for horizon > 1 require shocks with '
+                                 'finite exponential moments, which {0} does not have. Use '
+                                 'simulation or bootstrap forecasts '
+                                 'instead.'.format(distribution.name))
+            quadrature = distribution.quadrature(dist_params)
+
+        t = resids.shape[0]
+        p, o, q = self.p, self.o, self.q
+        m = np.max([p, o, q])
+        alpha = parameters[1:p + 1]
+        gamma = parameters[p + 1:p + o + 1]
+        beta = parameters[p + o + 1:]
+        sqrt2pi = np.sqrt(2 / np.pi)
+
+        lnsigma2 = np.log(sigma2)
+        e = resids / np.sqrt(sigma2)
+        # Future values of abs(e) - sqrt(2/pi) and e are set to their means
+        _lnsigma2 = np.full((t, m + horizon), backcast)
+        _abs_e = np.zeros((t, m + horizon))
+        _e = np.zeros((t, m + horizon))
+        for i in range(m):
+            _lnsigma2[m - i - 1:, i] = lnsigma2[:(t - (m - 1) + i)]
+            _e[m - i - 1:, i] = e[:(t - (m - 1) + i)]
+            _abs_e[m - i - 1:, i] = np.abs(_e[m - i - 1:, i]) - sqrt2pi
+        _lnsigma2[:, m] = np.log(forecasts[:, 0])
+        for j in range(1, horizon):
+            loc = m + j
+            _lnsigma2[:, loc] = parameters[0]
+            for k in range(p):
+                _lnsigma2[:, loc] += alpha[k] * _abs_e[:, loc - 1 - k]
+            for k in range(o):
+                _lnsigma2[:, loc] += gamma[k] * _e[:, loc - 1 - k]
+            for k in range(q):
+                _lnsigma2[:, loc] += beta[k] * _lnsigma2[:, loc - 1 - k]
+
+        # Impulse responses of the log variance to the future shocks
+        impulse = np.zeros(horizon)
+        impulse[0] = 1.0
+        ar = np.r_[1.0, -beta]
+        psi = lfilter(np.r_[0.0, alpha], ar, impulse)[1:]
+        xi = lfilter(np.r_[0.0, gamma], ar, impulse)[1:]
+        if quadrature is None:
+            log_mgf = np.logaddexp((psi + xi) ** 2 / 2 + log_ndtr(psi + xi),
+                                   (psi - xi) ** 2 / 2 + log_ndtr(psi - xi))
+        else:
+            nodes, weights = quadrature
+            exponent = psi[:, None] * np.abs(nodes) + xi[:, None] * nodes
+            log_mgf = logsumexp(exponent, axis=1, b=weights)
+        adjustment = np.r_[0.0, np.cumsum(log_mgf - sqrt2pi * psi)]
 
-        _, forecasts = self._one_step_forecast(parameters, resids, backcast, var_bounds, horizon)
+        forecasts = np.exp(_lnsigma2[:, m:] + adjustment)
         forecasts[:start] = np.nan
 
         return VarianceForecast(forecasts)
@@ -2209,7 +2934,7 @@ class EGARCH(VolatilityProcess):
         lnsigma2 = np.log(sigma2)
         e = resids / np.sqrt(sigma2)
 
-        lnsigma2_mat = np.full((t, m), np.log(backcast))
+        lnsigma2_mat = np.full((t, m), backcast)
         e_mat = np.zeros((t, m))
         abs_e_mat = np.full((t, m), np.sqrt(2 / np.pi))
 
@@ -2296,7 +3021,8 @@ class FixedVariance(VolatilityProcess):
             return np.array([_resids.var()])
         return np.empty(0)
 
-    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None):
+    def simulate(self, parameters, nobs, rng, burn=500, initial_value=None,
+                 repetitions=None):
         raise NotImplementedError('Fixed Variance processes do not support simulation')
 
     def constraints(self):
@@ -0,0 +1,128 @@
+"""
+Bounded cache used to reuse intermediate results
+"""
+from __future__ import absolute_import, division
+
+from collections import OrderedDict
+
+import numpy as np
+
+from arch.compat.python import itervalues
+
+__all__ = ['ArrayCache', 'DEFAULT_CACHE_BYTES']
+
+DEFAULT_CACHE_BYTES = 64 * 2 ** 20
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in itervalues(value))
+    return 0
+
+
+class ArrayCache(object):
+    """
+    Least-recently-used cache with a bound on the memory used by its values
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum number of bytes used by the arrays held in the cache.  The
+        least recently used values are removed when a new value would exceed
+        the limit.  Default is 64MiB.
+
+    Notes
+    -----
+    The size of a value is the total size of the NumPy arrays it contains,
+    including arrays in tuples, lists and dictionaries.  Values larger than
+    max_bytes are not stored.
+
+    Deep copies of a cache are empty so that copies of an object holding a
+    cache do not share or duplicate its contents.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._values = OrderedDict()
+        self._sizes = {}
+        self._nbytes = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __deepcopy__(self, memo):
+        return type(self)(self.max_bytes)
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by the arrays in the cache"""
+        return self._nbytes
+
+    def get(self, key, default=None):
+        """
+        Retrieve a value and mark it as the most recently used
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the value
+        default : object, optional
+            Value returned if key is not in the cache
+
+        Returns
+        -------
+        value : object
+            Cached value or default
+        """
+        if key not in self._values:
+            return default
+        value = self._values.pop(key)
+        self._values[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value, removing the least recently used values if needed
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the value
+        value : object
+            Value to store
+        """
+        self.pop(key)
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        while self._values and self._nbytes + size > self.max_bytes:
+            self.pop(next(iter(self._values)))
+        self._values[key] = value
+        self._sizes[key] = size
+        self._nbytes += size
+
+    def pop(self, key):
+        """
+        Remove a value if present
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the value to remove
+        """
+        if key in self._values:
+            del self._values[key]
+            self._nbytes -= self._sizes.pop(key)
+
+    def clear(self):
+        """Remove all values"""
+        self._values.clear()
+        self._sizes.clear()
+        self._nbytes = 0
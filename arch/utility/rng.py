@@ -0,0 +1,268 @@
+"""
+Helpers for working with both legacy NumPy RandomState instances and the
+Generator/SeedSequence interface available in NumPy 1.17 and later
+"""
+from __future__ import absolute_import, division
+
+from numpy.random import RandomState
+
+try:
+    from numpy.random import Generator, PCG64, SeedSequence
+
+    HAS_GENERATOR = True
+except ImportError:  # pragma: no cover
+    Generator = PCG64 = SeedSequence = None
+    HAS_GENERATOR = False
+
+__all__ = ['check_random_state', 'is_generator', 'is_seed_sequence', 'random_sample',
+           'randint', 'reseed', 'get_state', 'set_state', 'spawn_generators',
+           'indexed_generator', 'HAS_GENERATOR']
+
+
+def is_generator(random_state):
+    """
+    Test whether an object is a NumPy Generator
+
+    Parameters
+    ----------
+    random_state : object
+        Object to test
+
+    Returns
+    -------
+    is_gen : bool
+        True if random_state is a NumPy Generator
+    """
+    return HAS_GENERATOR and isinstance(random_state, Generator)
+
+
+def is_seed_sequence(seed):
+    """
+    Test whether an object is a NumPy SeedSequence
+
+    Parameters
+    ----------
+    seed : object
+        Object to test
+
+    Returns
+    -------
+    is_seq : bool
+        True if seed is a NumPy SeedSequence
+    """
+    return HAS_GENERATOR and isinstance(seed, SeedSequence)
+
+
+def check_random_state(random_state, name='random_state'):
+    """
+    Validate a random state input, constructing a RandomState if needed
+
+    Parameters
+    ----------
+    random_state : {None, RandomState, Generator}
+        Input to validate. If None, a new RandomState is returned.
+    name : str, optional
+        Name of the input to use in error messages
+
+    Returns
+    -------
+    random_state : {RandomState, Generator}
+        Validated random state
+
+    Raises
+    ------
+    TypeError
+        If random_state is not a RandomState or Generator
+    """
+    if random_state is None:
+        return RandomState()
+    if isinstance(random_state, RandomState) or is_generator(random_state):
+        return random_state
+    raise TypeError('{0} must be a NumPy RandomState or Generator '
+                    'instance'.format(name))
+
+
+def random_sample(random_state, size=None):
+    """
+    Standard uniform draws from either a RandomState or a Generator
+
+    Parameters
+    ----------
+    random_state : {RandomState, Generator}
+        Source of randomness
+    size : {int, tuple}, optional
+        Shape of the output
+
+    Returns
+    -------
+    u : ndarray
+        Standard uniform random values
+    """
+    if is_generator(random_state):
+        return random_state.random(size)
+    return random_state.random_sample(size)
+
+
+def randint(random_state, low, high=None, size=None):
+    """
+    Integer draws from [low, high) from either a RandomState or a Generator
+
+    Parameters
+    ----------
+    random_state : {RandomState, Generator}
+        Source of randomness
+    low : int
+        Lowest integer to draw, or if high is None, one above the largest
+    high : int, optional
+        One above the largest integer to draw
+    size : {int, tuple}, optional
+        Shape of the output
+
+    Returns
+    -------
+    ints : ndarray
+        Random integers
+    """
+    if is_generator(random_state):
+        return random_state.integers(low, high, size=size)
+    return random_state.randint(low, high, size=size)
+
+
+def reseed(random_state, seed):
+    """
+    Reset a random state using a seed
+
+    Parameters
+    ----------
+    random_state : {RandomState, Generator}
+        Random state to reseed
+    seed : {int, SeedSequence}
+        Seed value
+
+    Returns
+    -------
+    random_state : {RandomState, Generator}
+        The reseeded random state.  RandomStates are reseeded in place while
+        Generators are replaced by a new Generator using the same bit
+        generator type.
+    """
+    if is_generator(random_state):
+        return Generator(type(random_state.bit_generator)(seed))
+    random_state.seed(seed)
+    return random_state
+
+
+def get_state(random_state):
+    """
+    Get the state of either a RandomState or a Generator
+
+    Parameters
+    ----------
+    random_state : {RandomState, Generator}
+        Random state
+
+    Returns
+    -------
+    state : {tuple, dict}
+        RandomState state tuple or Generator bit generator state dictionary
+    """
+    if is_generator(random_state):
+        return random_state.bit_generator.state
+    return random_state.get_state()
+
+
+def set_state(random_state, state):
+    """
+    Set the state of either a RandomState or a Generator
+
+    Parameters
+    ----------
+    random_state : {RandomState, Generator}
+        Random state
+    state : {tuple, dict}
+        State previously returned by get_state
+    """
+    if is_generator(random_state):
+        random_state.bit_generator.state = state
+    else:
+        random_state.set_state(state)
+
+
+def _as_seed_sequence(seed):
+    if not HAS_GENERATOR:  # pragma: no cover
+        raise NotImplementedError('spawning random streams requires NumPy 1.17 or later')
+    if is_seed_sequence(seed):
+        return seed
+    return SeedSequence(seed)
+
+
+def spawn_generators(seed, count, offset=0):
+    """
+    Independent, reproducible Generators for a set of workers or blocks
+
+    Parameters
+    ----------
+    seed : {int, array_like, SeedSequence}
+        Root seed shared by all workers
+    count : int
+        Number of generators to produce
+    offset : int, optional
+        Index of the first stream.  Streams are identified by their index so
+        that stream ``offset + i`` is always the same, irrespective of how
+        work is split across processes.
+
+    Returns
+    -------
+    generators : list (Generator)
+        Generators for streams offset, offset + 1, ..., offset + count - 1
+
+    Examples
+    --------
+    Bootstrap 1,000 replications in 10 blocks of 100.  Each block uses its own
+    stream so that the results do not depend on the number of workers.
+
+    >>> from arch.utility.rng import spawn_generators
+    >>> gens = spawn_generators(12345, 10)
+
+    A worker that only processes blocks 4 and 5 can construct identical
+    streams directly
+
+    >>> worker_gens = spawn_generators(12345, 2, offset=4)
+
+    Notes
+    -----
+    Stream indices are absolute.  Stream i always uses spawn key
+    ``seed.spawn_key + (i,)``, irrespective of how many children have
+    already been spawned from a SeedSequence passed as ``seed``, and
+    ``seed`` is not modified.  When ``seed`` is a fresh root, stream i is
+    identical to ``SeedSequence(seed).spawn(i + 1)[i]``.  When ``seed`` has
+    already spawned children, stream i matches the i-th child that a fresh
+    copy would produce rather than the next child from ``seed.spawn``.
+    """
+    root = _as_seed_sequence(seed)
+    gens = []
+    for i in range(offset, offset + count):
+        child = SeedSequence(root.entropy, spawn_key=tuple(root.spawn_key) + (i,),
+                             pool_size=root.pool_size)
+        gens.append(Generator(PCG64(child)))
+    return gens
+
+
+def indexed_generator(seed, index):
+    """
+    Generator for a single stream identified by an integer index
+
+    Parameters
+    ----------
+    seed : {int, array_like, SeedSequence}
+        Root seed
+    index : int
+        Stream index
+
+    Returns
+    -------
+    gen : Generator
+        Generator for stream ``index``. Identical to
+        ``spawn_generators(seed, 1, offset=index)[0]``.
+    """
+    return spawn_generators(seed, 1, offset=index)[0]